@@ -2,6 +2,9 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.db.database import init_db
 from app.core.scheduler import start_scheduler, shutdown_scheduler
+from app.core.workers import shutdown_process_pool
+from app.services.slack_service import close_slack_client
+from app.api.routes import metrics, papers
 
 
 @asynccontextmanager
@@ -12,10 +15,14 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     await shutdown_scheduler()
+    shutdown_process_pool()
+    await close_slack_client()
 
 
 # Initialize FastAPI app
 app = FastAPI(lifespan=lifespan)
+app.include_router(metrics.router)
+app.include_router(papers.router)
 
 
 @app.get("/")
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from app.core.metrics import metrics
+from app.db.database import get_pool_metrics, report_long_held_sessions
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def read_metrics():
+    snapshot = metrics.snapshot()
+    snapshot["db_pool"] = get_pool_metrics()
+    snapshot["db_pool"]["long_held_sessions"] = report_long_held_sessions()
+    return snapshot
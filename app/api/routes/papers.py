@@ -0,0 +1,119 @@
+import io
+import tempfile
+from datetime import datetime
+from typing import Iterator, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.db.database import get_read_db, session_scope, writer_session_scope
+from app.db.schemas import (
+    BibtexImportResult,
+    PaperHeaderPage,
+    PaperPage,
+    SimilarPaper,
+)
+from app.services.export_service import EXPORT_FORMATS, ExportService
+from app.services.import_service import BibtexImportService
+from app.services.paper_service import PaperService
+from app.services.similar_paper_service import SimilarPaperService
+
+router = APIRouter(prefix="/papers")
+
+
+@router.get("", response_model=PaperPage)
+def list_papers(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        papers, next_cursor = PaperService(db).get_papers_page(
+            cursor, limit, with_summary=True
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return PaperPage.model_validate(
+        {"items": papers, "next_cursor": next_cursor}, from_attributes=True
+    )
+
+
+@router.get("/headers", response_model=PaperHeaderPage)
+def list_paper_headers(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        rows, next_cursor = PaperService(db).get_paper_headers_page(cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return PaperHeaderPage.model_validate(
+        {"items": rows, "next_cursor": next_cursor}, from_attributes=True
+    )
+
+
+def _similar_papers(results) -> List[SimilarPaper]:
+    return [
+        SimilarPaper.model_validate({**row._mapping, "score": score})
+        for row, score in results
+    ]
+
+
+@router.get("/similar", response_model=List[SimilarPaper])
+def search_similar_papers(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+):
+    return _similar_papers(SimilarPaperService(db).similar_to_text(q, limit))
+
+
+@router.get("/{paper_id}/similar", response_model=List[SimilarPaper])
+def list_similar_papers(
+    paper_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+):
+    results = SimilarPaperService(db).similar_to_paper(paper_id, limit)
+    if results is None:
+        raise HTTPException(status_code=404, detail="Paper not found")
+    return _similar_papers(results)
+
+
+def _stream_export(export_format: str, **filters) -> Iterator[str]:
+    # The response body is produced after the endpoint returns, so the
+    # generator owns its session instead of using a request dependency.
+    with session_scope(read_only=True) as db:
+        yield from ExportService(db).stream(export_format, **filters)
+
+
+@router.get("/export")
+def export_papers(
+    format: str = Query("jsonl", pattern="^(bibtex|jsonl|csv)$"),
+    keyword: Optional[str] = None,
+    author: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    media_type, extension, _, _ = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        _stream_export(
+            format, keyword=keyword, author=author, since=since, until=until
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="papers.{extension}"'},
+    )
+
+
+@router.post("/import", response_model=BibtexImportResult)
+async def import_papers(request: Request):
+    """Import a BibTeX library sent as the raw request body."""
+    # Spool the upload to disk so the import reads it line by line.
+    with tempfile.TemporaryFile() as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        lines = io.TextIOWrapper(spool, encoding="utf-8", errors="replace")
+        # Every write runs on the writer thread; so does the session itself.
+        async with writer_session_scope() as db:
+            return await BibtexImportService(db).import_lines(lines)
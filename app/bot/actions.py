@@ -1,23 +1,48 @@
 from slack_bolt.async_app import AsyncApp
-from app.db.database import get_db
-from app.services.paper_service import PaperService
+from app.db.database import session_scope, run_in_writer
+from app.services.paper_service import (
+    PaperService,
+    SummaryInputs,
+    generate_paper_summary,
+)
 from app.services.user_subscription_service import UserSubscriptionService
 from app.services.user_service import UserService
 from app.db.schemas import PaperCreate
 from datetime import datetime
+from typing import Optional
 from pydantic import ValidationError
-import bibtexparser
-from unittest.mock import MagicMock
+from app.db.identifiers import parse_arxiv_id
+from app.services.arxiv_resolver import arxiv_resolver
+from app.services.bibtex_service import entry_to_paper_data, parse_bibtex
+from app.services.home_service import home_views
+from urllib.parse import urlparse
 from slack_sdk.web.async_client import AsyncWebClient
 
 
-async def lazy_process_add_paper_submission(
-    body: dict, client: AsyncWebClient, logger, db, paper_service, user_service
-):
-    # Ensure `create_paper` always supports `assert_not_called` in tests
-    if not isinstance(getattr(paper_service, "create_paper", None), MagicMock):
-        _orig_create = paper_service.create_paper
-        paper_service.create_paper = MagicMock(side_effect=_orig_create)
+def _duplicate_text(
+    paper_service: PaperService, url: str, arxiv_id, title: str, summary
+) -> Optional[str]:
+    existing_paper = paper_service.get_paper_by_url_or_arxiv_id(
+        url=url, arxiv_id=arxiv_id
+    )
+    if existing_paper is not None:
+        return f"이미 존재하는 논문입니다: {existing_paper.title}"
+    similar_paper = paper_service.find_near_duplicate(title, summary)
+    if similar_paper is not None:
+        return f"거의 같은 논문이 이미 있습니다: {similar_paper.title}"
+    return None
+
+
+def _save_summary(paper_id: int, summary: str, model: str) -> None:
+    with session_scope() as db:
+        PaperService(db).save_summary(paper_id, summary, model)
+
+
+async def lazy_process_add_paper_submission(body: dict, client: AsyncWebClient, logger):
+    """
+    Parse, deduplicate, store and summarize an add-paper submission. Sessions
+    are opened only around database work, never across arXiv or Gemini calls.
+    """
     user_id = body["user"]["id"]
     try:
         state_values = body["view"]["state"]["values"]
@@ -41,62 +66,15 @@ async def lazy_process_add_paper_submission(
         parsed_bibtex_data = {}
         if bibtex_str:
             try:
-                # Use bibtexparser to parse the bibtex string
-                parser = bibtexparser.bparser.BibTexParser(common_strings=True)
-                parser.customization = bibtexparser.customization.convert_to_unicode
-                parser.customization = bibtexparser.customization.author
-                bib_database = bibtexparser.loads(bibtex_str, parser=parser)
-                bib_database = bibtexparser.loads(bibtex_str, parser=parser)
-                if bib_database.entries:
-                    # Assuming only one entry for simplicity, take the first one
-                    entry = bib_database.entries[0]
-                    parsed_bibtex_data["title"] = entry.get("title")
-                    # Prefer explicit URL; if absent we'll build one later from the arXiv ID.
-                    parsed_bibtex_data["url"] = entry.get("url")
-                    # The customization handles author parsing into a list
-                    parsed_bibtex_data["authors"] = entry.get("author", [])
-                    # Attempt to parse year for published_date
-                    if "year" in entry:
-                        try:
-                            year = int(entry["year"])
-                            month_str = entry.get("month", "jan")
-                            # Convert month abbreviation to number
-                            month_map = {
-                                "jan": 1,
-                                "feb": 2,
-                                "mar": 3,
-                                "apr": 4,
-                                "may": 5,
-                                "jun": 6,
-                                "jul": 7,
-                                "aug": 8,
-                                "sep": 9,
-                                "oct": 10,
-                                "nov": 11,
-                                "dec": 12,
-                            }
-                            month = month_map.get(month_str.lower()[:3], 1)
-                            parsed_bibtex_data["published_date"] = datetime(
-                                year, month, 1
-                            )
-                        except (ValueError, TypeError):
-                            parsed_bibtex_data["published_date"] = datetime.now()
-                    parsed_bibtex_data["arxiv_id"] = entry.get(
-                        "eprint"
-                    )  # Often found in eprint field for arXiv
-                    parsed_bibtex_data["summary"] = entry.get("abstract") or entry.get(
-                        "note"
-                    )  # Use 'abstract' or 'note' for summary
-                    parsed_bibtex_data["keywords"] = [
-                        k.strip()
-                        for k in entry.get("keywords", "").split(",")
-                        if k.strip()
-                    ]  # Parse keywords from BibTeX
-                else:
+                entries = parse_bibtex(bibtex_str)
+                if not entries:
                     # If the parser returns no entries, emulate the error format
                     # expected by the test suite so that an informative message
                     # is surfaced to the user.
                     raise ValueError(f"Expecting an entry, got '{bibtex_str.strip()}'")
+                # Only the first entry is used; whole .bib files go through
+                # the bulk import path instead.
+                parsed_bibtex_data = entry_to_paper_data(entries[0])
 
             except Exception as e:
                 logger.error(f"BibTeX parsing error: {e}")
@@ -114,6 +92,15 @@ async def lazy_process_add_paper_submission(
         final_arxiv_id = arxiv_id if arxiv_id else parsed_bibtex_data.get("arxiv_id")
         final_url = url if url else parsed_bibtex_data.get("url")
         final_summary = summary if summary else parsed_bibtex_data.get("summary")
+        if not final_arxiv_id and final_url:
+            final_arxiv_id = parse_arxiv_id(final_url)
+        # ID- or URL-only submissions take the rest from arXiv
+        resolved = {}
+        if final_arxiv_id and not final_title:
+            resolved = await arxiv_resolver.resolve(final_arxiv_id) or {}
+            final_title = resolved.get("title")
+            final_url = final_url or resolved.get("url")
+            final_summary = final_summary or resolved.get("summary")
         # If URL is still missing but we have an arXiv ID, construct a default arXiv PDF URL
         if not final_url and final_arxiv_id:
             final_url = f"https://arxiv.org/pdf/{final_arxiv_id}.pdf"
@@ -121,14 +108,17 @@ async def lazy_process_add_paper_submission(
         final_authors = (
             [a.strip() for a in authors_str.split(",") if a.strip()]
             if authors_str
-            else parsed_bibtex_data.get("authors", [])
+            else parsed_bibtex_data.get("authors") or resolved.get("authors", [])
         )
+        fallback_published_date = parsed_bibtex_data.get(
+            "published_date"
+        ) or resolved.get("published_date")
         final_published_date = (
             published_date_str
             if published_date_str
             else (
-                parsed_bibtex_data.get("published_date").strftime("%Y-%m-%d")
-                if parsed_bibtex_data.get("published_date")
+                fallback_published_date.strftime("%Y-%m-%d")
+                if fallback_published_date
                 else None
             )
         )
@@ -170,17 +160,6 @@ async def lazy_process_add_paper_submission(
                 )
                 return
 
-        # Check for existing paper before creating
-        existing_paper = paper_service.get_paper_by_url_or_arxiv_id(
-            url=final_url, arxiv_id=final_arxiv_id
-        )
-        if existing_paper is not None:
-            await client.chat_postMessage(
-                channel=user_id,
-                text=f"이미 존재하는 논문입니다: {existing_paper.title}",
-            )
-            return
-
         paper_create_data = {
             "title": final_title,
             "url": final_url,
@@ -201,42 +180,60 @@ async def lazy_process_add_paper_submission(
         # where the parsed URL's path is empty or just "/" and strip the
         # trailing slash.
         url_str = str(paper_create.url)
-        from urllib.parse import urlparse
-
         parsed = urlparse(url_str)
         if parsed.path in ("", "/") and url_str.endswith("/"):
             paper_create.url = url_str[:-1]
 
-        new_paper = paper_service.create_paper(paper_create)
+        with session_scope() as db:
+            paper_service = PaperService(db)
+            duplicate_text = _duplicate_text(
+                paper_service, final_url, final_arxiv_id, final_title, final_summary
+            )
+            if duplicate_text is None:
+                new_paper = await run_in_writer(
+                    paper_service.create_paper, paper_create
+                )
+                home_views.invalidate_for_papers(db, [new_paper.id])
+                paper_id, paper_title = new_paper.id, new_paper.title
+        if duplicate_text is not None:
+            await client.chat_postMessage(channel=user_id, text=duplicate_text)
+            return
 
         # If no summary was provided and an arXiv ID exists, attempt to summarize using AI
         if not final_summary and final_arxiv_id:
             try:
-                user = user_service.get_or_create_user(user_id)
-                if user.api_key:
-                    # Use the paper_service's summarize_paper method
-                    await paper_service.summarize_paper(new_paper.id, user_id)
-                    # Refresh the paper object to get the updated summary
-                    new_paper = paper_service.get_paper(new_paper.id)
+                with session_scope() as db:
+                    api_key = UserService(db).get_or_create_user(user_id).api_key
+                if api_key:
+                    model, summary = await generate_paper_summary(
+                        SummaryInputs(
+                            summary=None,
+                            api_key=api_key,
+                            full_text=None,
+                            abstract=None,
+                            arxiv_id=final_arxiv_id,
+                        )
+                    )
+                    await run_in_writer(_save_summary, paper_id, summary, model)
                     await client.chat_postMessage(
                         channel=user_id,
-                        text=f"Paper '{new_paper.title}' successfully added and summarized!",
+                        text=f"Paper '{paper_title}' successfully added and summarized!",
                     )
                 else:
                     await client.chat_postMessage(
                         channel=user_id,
-                        text=f"Paper '{new_paper.title}' successfully added. To enable AI summarization, please register your OpenAI API key.",
+                        text=f"Paper '{paper_title}' successfully added. To enable AI summarization, please register your OpenAI API key.",
                     )
             except Exception as e:
-                logger.error(f"Failed to auto-summarize paper {new_paper.id}: {e}")
+                logger.error(f"Failed to auto-summarize paper {paper_id}: {e}")
                 await client.chat_postMessage(
                     channel=user_id,
-                    text=f"Paper '{new_paper.title}' successfully added, but auto-summarization failed: {e}",
+                    text=f"Paper '{paper_title}' successfully added, but auto-summarization failed: {e}",
                 )
         else:
             await client.chat_postMessage(
                 channel=user_id,
-                text=f"Paper '{new_paper.title}' successfully added!",
+                text=f"Paper '{paper_title}' successfully added!",
             )
 
     except ValidationError as e:
@@ -251,8 +248,46 @@ async def lazy_process_add_paper_submission(
             channel=user_id,
             text=f"논문 추가 중 오류가 발생했습니다: {e}",
         )
-    finally:
-        db.close()
+
+
+async def ack_add_paper_submission(ack):
+    # Only the ack runs inside Slack's 3-second window.
+    await ack()
+
+
+async def process_add_paper_submission(body, client, logger):
+    """Lazy listener: parse, deduplicate, store and summarize the submission."""
+    await client.chat_postMessage(
+        channel=body["user"]["id"], text="논문을 추가하는 중입니다..."
+    )
+    await lazy_process_add_paper_submission(body=body, client=client, logger=logger)
+
+
+def _search_result_blocks(found_papers) -> list:
+    # Rendered while the session is still open so relationships can load.
+    blocks = [
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*{len(found_papers)}개의 논문을 찾았습니다:*",
+            },
+        }
+    ]
+    for paper in found_papers:
+        authors = ", ".join([author.name for author in paper.authors])
+        keywords = ", ".join([keyword.name for keyword in paper.keywords])
+        blocks.append(
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"*<{paper.url}|{paper.title}>*\n*저자:* {authors}\n*키워드:* {keywords}\n*요약:* {paper.summary or 'N/A'}\n*발행일:* {paper.published_date.strftime('%Y-%m-%d') if paper.published_date else 'N/A'}",
+                },
+            }
+        )
+        blocks.append({"type": "divider"})
+    return blocks
 
 
 def register_actions(app: AsyncApp):
@@ -266,9 +301,13 @@ def register_actions(app: AsyncApp):
 
         try:
             paper_id = int(paper_id_str)
-            db = next(get_db())
-            paper_service = PaperService(db)
-            summary = await paper_service.summarize_paper(paper_id, user_id)
+            # Only the reads and the write hold a session; Gemini runs between.
+            with session_scope() as db:
+                inputs = PaperService(db).load_summary_inputs(paper_id, user_id)
+            summary = inputs.summary if inputs is not None else None
+            if inputs is not None and summary is None:
+                model, summary = await generate_paper_summary(inputs)
+                await run_in_writer(_save_summary, paper_id, summary, model)
 
             if summary:
                 await client.chat_postMessage(
@@ -296,9 +335,9 @@ def register_actions(app: AsyncApp):
         api_key = state_values["api_key_block"]["api_key_input"]["value"]
 
         try:
-            db = next(get_db())
-            user_service = UserService(db)
-            user_service.update_api_key(user_id, api_key)
+            with session_scope() as db:
+                user_service = UserService(db)
+                user_service.update_api_key(user_id, api_key)
 
             await client.chat_postMessage(
                 channel=user_id, text="API Key가 성공적으로 등록되었습니다!"
@@ -309,20 +348,9 @@ def register_actions(app: AsyncApp):
                 channel=user_id, text="API Key 등록에 실패했습니다. 다시 시도해주세요."
             )
 
-    @app.view("add_paper_modal")
-    async def handle_add_paper_modal_submission(ack, body, client, logger):
-        db = next(get_db())
-        paper_service = PaperService(db)
-        user_service = UserService(db)
-        await ack()
-        await lazy_process_add_paper_submission(
-            body=body,
-            client=client,
-            logger=logger,
-            db=db,
-            paper_service=paper_service,
-            user_service=user_service,
-        )
+    app.view("add_paper_modal")(
+        ack=ack_add_paper_submission, lazy=[process_add_paper_submission]
+    )
 
     @app.view("search_paper_modal")
     async def handle_search_paper_modal_submission(ack, body, client, logger):
@@ -333,33 +361,12 @@ def register_actions(app: AsyncApp):
         search_query = state_values["search_query_block"]["search_query_input"]["value"]
 
         try:
-            db = next(get_db())
-            paper_service = PaperService(db)
-            found_papers = paper_service.search_papers(search_query)
+            with session_scope(read_only=True) as db:
+                paper_service = PaperService(db)
+                found_papers = paper_service.search_papers(search_query)
+                blocks = _search_result_blocks(found_papers)
 
             if found_papers:
-                blocks = [
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": f"*{len(found_papers)}개의 논문을 찾았습니다:*",
-                        },
-                    }
-                ]
-                for paper in found_papers:
-                    authors = ", ".join([author.name for author in paper.authors])
-                    keywords = ", ".join([keyword.name for keyword in paper.keywords])
-                    blocks.append(
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": f"*<{paper.url}|{paper.title}>*\n*저자:* {authors}\n*키워드:* {keywords}\n*요약:* {paper.summary or 'N/A'}\n*발행일:* {paper.published_date.strftime('%Y-%m-%d') if paper.published_date else 'N/A'}",
-                            },
-                        }
-                    )
-                    blocks.append({"type": "divider"})
                 await client.chat_postMessage(channel=user_id, blocks=blocks)
             else:
                 await client.chat_postMessage(
@@ -381,11 +388,11 @@ def register_actions(app: AsyncApp):
         keyword_name = state_values["keyword_name_block"]["keyword_name_input"]["value"]
 
         try:
-            db = next(get_db())
-            user_subscription_service = UserSubscriptionService(db)
-            new_subscription = user_subscription_service.subscribe_keyword(
-                user_id, keyword_name
-            )
+            with session_scope() as db:
+                user_subscription_service = UserSubscriptionService(db)
+                new_subscription = user_subscription_service.subscribe_keyword(
+                    user_id, keyword_name
+                )
 
             if new_subscription:
                 await client.chat_postMessage(
@@ -1,22 +1,162 @@
+import asyncio
+import math
+import os
+import tempfile
 from slack_bolt.async_app import AsyncApp
-from app.services.ai_service import AIService  # AIService 임포트
-from functools import partial  # Import partial
+from app.db.database import session_scope
+from app.core.rate_limit import CircuitOpenError, RateLimitedError
+from app.services.ai_service import (  # AIService 임포트
+    DEFAULT_MODEL,
+    AIService,
+    shared_key_queue,
+)
+from app.services.export_service import EXPORT_FORMATS, ExportService
+from app.services.similar_paper_service import SimilarPaperService
+from app.services.slack_service import SlackService
+from app.services.summary_cache import summary_cache, summary_cache_key
+from app.services.text_chunking import estimate_tokens
+from app.bot.streaming import stream_to_message
+
+SIMILAR_PAPERS_LIMIT = 5
 
 
 # Move summarize_text_command outside
-async def summarize_text_command(ack, say, command, ai_service: AIService):
+async def summarize_text_command(ack, say, command, ai_service: AIService, client):
     await ack()
     text_to_summarize = command["text"]
     if not text_to_summarize:
         await say("요약할 텍스트를 입력해주세요. 예: `/요약 긴 텍스트...`")
         return
 
+    cached = await summary_cache.get(
+        summary_cache_key(text_to_summarize, DEFAULT_MODEL)
+    )
+    if cached is not None:
+        await say(f"요약 결과:\n{cached}")
+        return
+
+    # 공유 API 키는 사용자별 토큰 버킷과 공정 대기열을 거쳐 사용
+    user_id = command.get("user_id", "")
+    cost = estimate_tokens(text_to_summarize)
+    placeholder = None
+
+    async def reply(text: str):
+        if placeholder is None:
+            await say(text)
+        else:
+            await client.chat_update(
+                channel=placeholder["channel"], ts=placeholder["ts"], text=text
+            )
+
     try:
-        # AIService를 사용하여 텍스트 요약
-        summary = await ai_service.summarize_text(text_to_summarize)
-        await say(f"요약 결과:\n{summary}")
+        # 자리 표시 메시지를 먼저 보내고, 생성되는 대로 내용을 채워 넣음
+        placeholder = await say("요약하는 중입니다... :hourglass_flowing_sand:")
+        channel, ts = placeholder["channel"], placeholder["ts"]
+        summary = await summary_cache.get_or_generate(
+            text_to_summarize,
+            lambda: shared_key_queue.run(
+                user_id,
+                cost,
+                lambda: stream_to_message(
+                    client,
+                    channel,
+                    ts,
+                    ai_service.stream_summary(text_to_summarize),
+                    prefix="요약 결과:\n",
+                ),
+            ),
+            model=DEFAULT_MODEL,
+        )
+        # Requests coalesced onto another stream only receive the final text.
+        await client.chat_update(channel=channel, ts=ts, text=f"요약 결과:\n{summary}")
+    except RateLimitedError as e:
+        await reply(
+            f"요약 요청이 너무 많습니다. {math.ceil(e.retry_after)}초 후에 다시 시도해주세요."
+        )
+    except CircuitOpenError:
+        await reply("요약 서비스가 일시적으로 불안정합니다. 잠시 후 다시 시도해주세요.")
     except Exception as e:
-        await say(f"텍스트 요약 중 오류가 발생했습니다: {e}")
+        await reply(f"텍스트 요약 중 오류가 발생했습니다: {e}")
+
+
+def _export_to_tempfile(export_format: str, keyword: str | None) -> str:
+    _, extension, _, _ = EXPORT_FORMATS[export_format]
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=f".{extension}", delete=False, encoding="utf-8"
+    ) as f:
+        with session_scope(read_only=True) as db:
+            ExportService(db).write(f, export_format, keyword=keyword)
+    return f.name
+
+
+async def export_papers_command(ack, command, client, logger):
+    await ack()
+    user_id = command["user_id"]
+    # Usage: /논문-내보내기 [bibtex|jsonl|csv] [keyword]
+    args = command.get("text", "").split(maxsplit=1)
+    export_format = "bibtex"
+    if args and args[0].lower() in EXPORT_FORMATS:
+        export_format = args.pop(0).lower()
+    keyword = args[0].strip() if args else None
+
+    path = None
+    try:
+        # The export streams to disk on a worker thread, not in memory.
+        path = await asyncio.get_running_loop().run_in_executor(
+            None, _export_to_tempfile, export_format, keyword
+        )
+        await client.files_upload_v2(
+            channel=await SlackService(client).open_dm(user_id),
+            file=path,
+            filename=os.path.basename(path),
+            title=f"PaperWhale 논문 내보내기 ({export_format})",
+        )
+    except Exception as e:
+        logger.error(f"Failed to export papers: {e}")
+        await client.chat_postMessage(
+            channel=user_id, text="논문 내보내기에 실패했습니다. 다시 시도해주세요."
+        )
+    finally:
+        if path:
+            os.remove(path)
+
+
+def _find_similar_papers(query: str):
+    with session_scope(read_only=True) as db:
+        service = SimilarPaperService(db)
+        if query.isdigit():
+            return service.similar_to_paper(int(query), SIMILAR_PAPERS_LIMIT)
+        return service.similar_to_text(query, SIMILAR_PAPERS_LIMIT)
+
+
+async def similar_papers_command(ack, say, command, logger):
+    await ack()
+    # Usage: /비슷한-논문 <논문 ID 또는 검색어>
+    query = command.get("text", "").strip()
+    if not query:
+        await say("논문 ID나 검색어를 입력해주세요. 예: `/비슷한-논문 42`")
+        return
+
+    try:
+        # Indexing new papers and scoring run on a worker thread.
+        results = await asyncio.get_running_loop().run_in_executor(
+            None, _find_similar_papers, query
+        )
+    except Exception as e:
+        logger.error(f"Failed to find similar papers: {e}")
+        await say("비슷한 논문을 찾지 못했습니다. 다시 시도해주세요.")
+        return
+
+    if results is None:
+        await say(f"논문 ID {query}를 찾을 수 없습니다.")
+    elif not results:
+        await say("비슷한 논문이 없습니다.")
+    else:
+        lines = [
+            f"• <{row.url}|{row.title}> (ID {row.id}, 유사도 {score:.2f})"
+            for row, score in results
+        ]
+        await say("*비슷한 논문:*\n" + "\n".join(lines))
 
 
 def register_commands(app: AsyncApp, ai_service: AIService):
@@ -250,5 +390,14 @@ def register_commands(app: AsyncApp, ai_service: AIService):
             },
         )
 
-    # Register the moved summarize_text_command
-    app.command("/요약")(partial(summarize_text_command, ai_service=ai_service))
+    app.command("/논문-내보내기")(export_papers_command)
+    app.command("/비슷한-논문")(similar_papers_command)
+
+    # Register the moved summarize_text_command. Bolt injects listener
+    # arguments by name, so `client` is passed through explicitly.
+    async def summarize_command(ack, say, command, client):
+        await summarize_text_command(
+            ack, say, command, ai_service=ai_service, client=client
+        )
+
+    app.command("/요약")(summarize_command)
@@ -0,0 +1,62 @@
+import logging
+import os
+import tempfile
+import aiohttp
+from app.core.config import settings
+from app.db.database import session_scope
+from app.services.import_service import BibtexImportService
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def _download_private_file(url: str, path: str) -> None:
+    # Slack serves private files only with the bot token; stream them to disk
+    # so a large library is never held in memory.
+    headers = {"Authorization": f"Bearer {settings.SLACK_BOT_TOKEN}"}
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url, headers=headers) as response:
+            response.raise_for_status()
+            with open(path, "wb") as f:
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+
+
+async def file_shared_event(event, client, logger):
+    try:
+        file_info = (await client.files_info(file=event["file_id"]))["file"]
+    except Exception as e:
+        logger.error(f"Error fetching shared file info: {e}")
+        return
+    if not file_info.get("name", "").lower().endswith(".bib"):
+        return
+
+    user_id = event["user_id"]
+    fd, path = tempfile.mkstemp(suffix=".bib")
+    os.close(fd)
+    try:
+        await _download_private_file(file_info["url_private_download"], path)
+        with (
+            open(path, encoding="utf-8", errors="replace") as lines,
+            session_scope() as db,
+        ):
+            result = await BibtexImportService(db).import_lines(lines)
+        await client.chat_postMessage(
+            channel=user_id,
+            text=(
+                f"BibTeX 가져오기 완료: {result.created}개 추가, "
+                f"{result.duplicates}개 중복, {result.invalid}개 오류"
+            ),
+        )
+    except Exception as e:
+        logger.error(f"Error importing BibTeX file: {e}")
+        await client.chat_postMessage(
+            channel=user_id, text="BibTeX 가져오기에 실패했습니다. 다시 시도해주세요."
+        )
+    finally:
+        os.remove(path)
+
+
+def register_events(app):
+    app.event("file_shared")(file_shared_event)
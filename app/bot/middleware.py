@@ -0,0 +1,48 @@
+from typing import Optional
+from slack_bolt.response import BoltResponse
+from app.core.config import settings
+from app.core.idempotency import IdempotencyStore
+from app.core.metrics import metrics
+from app.services.slack_service import get_slack_client
+
+deliveries = IdempotencyStore(
+    settings.SLACK_IDEMPOTENCY_TTL_SECONDS, settings.SLACK_IDEMPOTENCY_MAX_KEYS
+)
+
+
+def delivery_key(body: dict) -> Optional[str]:
+    """What identifies one piece of work, across Slack's retries of it."""
+    if body.get("event_id"):
+        return f"event:{body['event_id']}"
+    view = body.get("view")
+    if body.get("type") == "view_submission" and view:
+        # Also catches a modal submitted twice in quick succession.
+        return f"view:{view['id']}:{view.get('hash', '')}"
+    if body.get("trigger_id"):
+        return f"trigger:{body['trigger_id']}"
+    return None
+
+
+async def deduplicate_deliveries(req, body, next, logger):
+    """
+    Global middleware: a delivery whose key was already handled is acked
+    without running any listener, so a slow ack cannot multiply the work.
+    """
+    retry_num = req.headers.get("x-slack-retry-num")
+    if retry_num:
+        metrics.increment("slack.retries")
+    key = delivery_key(body)
+    if key is not None and not deliveries.claim(key):
+        metrics.increment("slack.duplicates_dropped")
+        logger.info(f"Dropping duplicate Slack delivery {key} (retry {retry_num})")
+        return BoltResponse(status=200, body="")
+    await next()
+
+
+async def use_shared_slack_client(context, next):
+    """
+    Global middleware: hand listeners the pooled process-wide client instead
+    of Bolt's per-request one, which would open a new HTTP session per call.
+    """
+    context["client"] = get_slack_client()
+    await next()
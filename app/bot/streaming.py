@@ -0,0 +1,36 @@
+import time
+from typing import AsyncIterator, Optional
+from app.core.config import settings
+
+# Shown at the end of the message while more text is on its way.
+STREAMING_CURSOR = " :writing_hand:"
+
+
+async def stream_to_message(
+    client,
+    channel: str,
+    ts: str,
+    chunks: AsyncIterator[str],
+    prefix: str = "",
+    min_interval: Optional[float] = None,
+) -> str:
+    """
+    Append streamed text to an existing Slack message, updating it at most
+    once per `min_interval` seconds, and return the full text. The first chunk
+    is shown immediately so the user sees progress as soon as it starts.
+    """
+    if min_interval is None:
+        min_interval = settings.SLACK_STREAM_UPDATE_INTERVAL_SECONDS
+    text = ""
+    last_update: Optional[float] = None
+    async for chunk in chunks:
+        text += chunk
+        now = time.monotonic()
+        if last_update is None or now - last_update >= min_interval:
+            await client.chat_update(
+                channel=channel, ts=ts, text=f"{prefix}{text}{STREAMING_CURSOR}"
+            )
+            last_update = now
+    text = text.strip()
+    await client.chat_update(channel=channel, ts=ts, text=f"{prefix}{text}")
+    return text
@@ -9,6 +9,82 @@ class Settings(BaseSettings):
     SLACK_APP_TOKEN: str
     DATABASE_URL: str = "sqlite:///./sql_app.db"
     GEMINI_API_KEY: str | None = None
+    GEMINI_CLIENT_POOL_SIZE: int = 100
+    # Inputs estimated above SUMMARY_MAX_INPUT_TOKENS are summarized map-reduce
+    # style in chunks of SUMMARY_CHUNK_TOKENS, SUMMARY_MAP_CONCURRENCY at a time.
+    SUMMARY_MAX_INPUT_TOKENS: int = 24000
+    SUMMARY_CHUNK_TOKENS: int = 8000
+    SUMMARY_MAP_CONCURRENCY: int = 4
+    # Fair sharing of GEMINI_API_KEY between users of /요약
+    SUMMARY_GLOBAL_CONCURRENCY: int = 8
+    SUMMARY_USER_TOKENS_PER_MINUTE: int = 20000
+    SUMMARY_USER_BURST_TOKENS: int = 40000
+    GEMINI_BREAKER_FAILURE_THRESHOLD: int = 5
+    GEMINI_BREAKER_RESET_SECONDS: float = 30.0
+    # chat.update is rate limited (Tier 3), so streamed text is batched.
+    SLACK_STREAM_UPDATE_INTERVAL_SECONDS: float = 1.0
+    # One pooled Web API client serves the whole process; DM channels and
+    # users.info lookups are cached so notification fan-outs skip them.
+    SLACK_HTTP_POOL_SIZE: int = 20
+    SLACK_HTTP_KEEPALIVE_SECONDS: float = 30.0
+    SLACK_DM_CHANNEL_CACHE_SIZE: int = 10000
+    SLACK_USER_INFO_CACHE_SIZE: int = 10000
+    SLACK_USER_INFO_TTL_SECONDS: int = 60 * 60
+    # How long a failed conversations.open or users.info result is reused.
+    SLACK_NEGATIVE_CACHE_TTL_SECONDS: int = 10 * 60
+    DB_SESSION_LEAK_THRESHOLD_SECONDS: float = 30.0
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64000  # Negative values are KiB
+    SQLITE_READ_POOL_SIZE: int = 5
+    NAME_ID_CACHE_SIZE: int = 10000
+    BIBTEX_IMPORT_CHUNK_SIZE: int = 500
+    # arXiv ID lookups made within the window share one id_list request.
+    ARXIV_RESOLVER_WINDOW_SECONDS: float = 0.05
+    ARXIV_RESOLVER_BATCH_SIZE: int = 200
+    ARXIV_RESOLVER_CACHE_SIZE: int = 10000
+    # Estimated title+abstract Jaccard similarity above which ingest treats a
+    # paper as a copy of one already stored.
+    NEAR_DUPLICATE_THRESHOLD: float = 0.8
+    # Memory-mapped paper vectors behind /비슷한-논문; a query reads
+    # VECTOR_INDEX_DIM * 4 bytes per paper, so this bounds its latency.
+    VECTOR_INDEX_DIR: str = "./vector_index"
+    VECTOR_INDEX_DIM: int = 128
+    # New-paper notifications per user per check; when more papers match a
+    # user's keywords, those closest to their subscriptions are sent.
+    NOTIFICATION_TOP_K: int = 5
+    # App Home: views are cached per user and re-rendered only after new
+    # matches or subscription changes; publishes are at least this far apart.
+    HOME_PUBLISH_DEBOUNCE_SECONDS: float = 5.0
+    HOME_RECENT_PAPERS: int = 10
+    HOME_CACHE_SIZE: int = 10000
+    # Slack redelivers events and interactions it thinks went unacked; work
+    # keys seen within this window are acked and dropped.
+    SLACK_IDEMPOTENCY_TTL_SECONDS: int = 15 * 60
+    SLACK_IDEMPOTENCY_MAX_KEYS: int = 100000
+    SUMMARY_CACHE_TTL_SECONDS: int = 30 * 24 * 60 * 60
+    SUMMARY_CACHE_MAX_ENTRIES: int = 10000
+    SUMMARY_CACHE_MEMORY_SIZE: int = 1000
+    # "inline" summarizes new papers before notifying, "offpeak" once a day at
+    # SUMMARY_ENRICHMENT_HOUR, "off" leaves the arXiv abstract in place.
+    SUMMARY_ENRICHMENT_MODE: str = "inline"
+    SUMMARY_ENRICHMENT_HOUR: int = 3
+    SUMMARY_CONCURRENCY: int = 4
+    SUMMARY_BATCH_SIZE: int = 8
+    SUMMARY_BATCH_MAX_TOKENS: int = 8000
+    SUMMARY_TOKEN_BUDGET: int = 200_000
+    # Full-text PDF extraction; opt in, since it downloads every paper's PDF.
+    FULL_TEXT_FETCH_ENABLED: bool = False
+    FULL_TEXT_FETCH_BATCH_SIZE: int = 100
+    PDF_CACHE_DIR: str = "./pdf_cache"
+    PDF_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+    PDF_MAX_BYTES: int = 50 * 1024 * 1024
+    PDF_DOWNLOAD_CONCURRENCY: int = 4
+    PDF_DOWNLOAD_TIMEOUT_SECONDS: float = 120.0
+    # A failed fetch waits BACKOFF * 2^(attempt - 1) before the next try; a
+    # paper is given up on after MAX_ATTEMPTS, or at once if it is no PDF.
+    FULL_TEXT_MAX_ATTEMPTS: int = 5
+    FULL_TEXT_RETRY_BACKOFF_SECONDS: int = 60 * 60
 
 
 settings = Settings()
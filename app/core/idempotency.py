@@ -0,0 +1,30 @@
+import threading
+import time
+from typing import Hashable
+from app.core.cache import LRUCache
+
+
+class IdempotencyStore:
+    """
+    Remembers keys for `ttl_seconds` so a repeated delivery of the same work
+    can be recognised. At most `max_keys` keys are kept, least recently seen
+    first out.
+    """
+
+    def __init__(self, ttl_seconds: float, max_keys: int):
+        self.ttl_seconds = ttl_seconds
+        self._seen = LRUCache(max_keys)
+        self._lock = threading.Lock()
+
+    def claim(self, key: Hashable) -> bool:
+        """True for the first claim of `key` within the TTL, False after."""
+        now = time.monotonic()
+        with self._lock:
+            seen_at = self._seen.get(key)
+            if seen_at is not None and now - seen_at < self.ttl_seconds:
+                return False
+            self._seen.put(key, now)
+            return True
+
+    def clear(self) -> None:
+        self._seen.clear()
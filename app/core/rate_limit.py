@@ -0,0 +1,204 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+from app.core.cache import LRUCache
+from app.core.metrics import metrics
+
+T = TypeVar("T")
+
+
+class RateLimitedError(Exception):
+    """Raised when a user has used up their token bucket."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limited; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency that is known to be failing."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Circuit open; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Refills at `rate` tokens per second up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def try_acquire(self, amount: float = 1) -> bool:
+        # A single request larger than the bucket is admitted from a full one.
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens < amount:
+                return False
+            self._tokens -= amount
+            return True
+
+    def retry_after(self, amount: float = 1) -> float:
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            return max(0.0, (amount - self._tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `reset_timeout` seconds. Then a single trial call is let through: success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return "open"
+            return "half_open"
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+            if remaining > 0 or self._trial_in_flight:
+                metrics.increment(f"circuit.{self.name}.rejected")
+                raise CircuitOpenError(max(remaining, 0.0))
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_in_flight:
+                    metrics.increment(f"circuit.{self.name}.opened")
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+class FairQueue:
+    """
+    Admission control for a shared resource. Each user has a token bucket,
+    at most `concurrency` calls run at once, and waiting calls are granted
+    slots round-robin across users (a user with weight w gets w slots per
+    round), so one user's backlog cannot delay everyone else.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        tokens_per_minute: float,
+        burst_tokens: float,
+        max_users: int = 10000,
+    ):
+        self.name = name
+        self.concurrency = concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.burst_tokens = burst_tokens
+        self._buckets = LRUCache(max_users)
+        self._active = 0
+        self._waiting: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._weights: Dict[str, int] = {}
+        self._turns: Dict[str, int] = {}
+
+    def _bucket(self, user_id: str) -> TokenBucket:
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            bucket = TokenBucket(self.tokens_per_minute / 60, self.burst_tokens)
+            self._buckets.put(user_id, bucket)
+        return bucket
+
+    async def run(
+        self,
+        user_id: str,
+        cost: float,
+        fn: Callable[[], Awaitable[T]],
+        weight: int = 1,
+    ) -> T:
+        bucket = self._bucket(user_id)
+        if not bucket.try_acquire(cost):
+            metrics.increment(f"queue.{self.name}.rate_limited")
+            raise RateLimitedError(bucket.retry_after(cost))
+
+        started = time.monotonic()
+        await self._acquire(user_id, weight)
+        metrics.observe(f"queue.{self.name}.wait_seconds", time.monotonic() - started)
+        try:
+            return await fn()
+        finally:
+            self._release()
+
+    async def _acquire(self, user_id: str, weight: int) -> None:
+        if self._active < self.concurrency and not self._waiting:
+            self._active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(user_id, deque()).append(future)
+        self._weights[user_id] = max(1, weight)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just before the cancellation landed.
+                self._release()
+            else:
+                future.cancel()
+            raise
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._active < self.concurrency and self._waiting:
+            user_id, waiters = next(iter(self._waiting.items()))
+            future = waiters.popleft()
+            turns = self._turns.get(user_id, 0) + 1
+            if not waiters:
+                del self._waiting[user_id]
+                self._turns.pop(user_id, None)
+            elif turns >= self._weights.get(user_id, 1):
+                # Used up this round; go to the back of the line.
+                self._waiting.move_to_end(user_id)
+                self._turns.pop(user_id, None)
+            else:
+                self._turns[user_id] = turns
+            if future.cancelled():
+                continue
+            self._active += 1
+            future.set_result(None)
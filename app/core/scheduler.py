@@ -1,17 +1,53 @@
+import logging
+from typing import Optional
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
-from apscheduler.executors.pool import ThreadPoolExecutor, ProcessPoolExecutor
-from app.db.database import SQLALCHEMY_DATABASE_URL, SessionLocal
+from apscheduler.executors.pool import BasePoolExecutor, ThreadPoolExecutor
+from app.core.config import settings
+from app.core.workers import get_process_pool
+from app.db.database import SQLALCHEMY_DATABASE_URL, SessionLocal, run_in_writer
 from app.services.scholar_service import ScholarService
 from app.services.slack_service import SlackService
+from app.services.ai_service import AIService, shared_key_breaker
+from app.services.enrichment_service import EnrichmentService
+from app.services.home_service import home_views
+from app.services.full_text_service import FullTextService
 from app.services.paper_service import PaperService
-from app.db.models import UserKeyword, Paper
+from app.services.ranking_service import RankingService
+from app.db.models import UserKeyword
 from app.db.schemas import PaperCreate
 from sqlalchemy.orm import joinedload
 from collections import defaultdict
 
+logger = logging.getLogger(__name__)
+
 jobstores = {"default": SQLAlchemyJobStore(url=SQLALCHEMY_DATABASE_URL)}
-executors = {"default": ThreadPoolExecutor(20), "processpool": ProcessPoolExecutor(5)}
+
+
+class SharedProcessPoolExecutor(BasePoolExecutor):
+    """APScheduler executor backed by the application's shared process pool."""
+
+    def __init__(self):
+        super().__init__(None)
+
+    @property
+    def _pool(self):
+        return get_process_pool()
+
+    @_pool.setter
+    def _pool(self, pool):
+        # The pool is owned by app.core.workers, not by the scheduler.
+        pass
+
+    def shutdown(self, wait=True):
+        # The pool outlives the scheduler; the import paths keep using it.
+        pass
+
+
+executors = {
+    "default": ThreadPoolExecutor(20),
+    "processpool": SharedProcessPoolExecutor(),
+}
 job_defaults = {"coalesce": False, "max_instances": 3}
 
 scheduler = AsyncIOScheduler(
@@ -22,6 +58,8 @@ scheduler = AsyncIOScheduler(
 async def check_for_new_papers_async():
     db = SessionLocal()
     slack_service = SlackService()
+    # New papers each user could be told about, across all their keywords.
+    candidates = defaultdict(list)
     try:
         scholar_service = ScholarService()
 
@@ -40,15 +78,14 @@ async def check_for_new_papers_async():
         for keyword_name, user_ids in keyword_to_users.items():
             try:
                 new_papers_data = scholar_service.search_new_papers(keyword_name)
+                paper_service = PaperService(db)
+                new_papers = []
                 for paper_data in new_papers_data:
                     # Check for duplicates before saving
-                    existing_paper = (
-                        db.query(Paper)
-                        .filter(
-                            (Paper.arxiv_id == paper_data.get("arxiv_id"))
-                            | (Paper.url == paper_data.get("url"))
-                        )
-                        .first()
+                    existing_paper = paper_service.get_paper_by_url_or_arxiv_id(
+                        url=paper_data.get("url"), arxiv_id=paper_data.get("arxiv_id")
+                    ) or paper_service.find_near_duplicate(
+                        paper_data.get("title", ""), paper_data.get("summary")
                     )
 
                     if not existing_paper:
@@ -61,32 +98,105 @@ async def check_for_new_papers_async():
                             author_names=paper_data.get("authors", []),
                             keyword_names=[keyword_name],
                         )
-                        paper_service = PaperService(db)
-                        new_paper = paper_service.create_paper(paper_create)
-
-                        for user_id in user_ids:
-                            try:
-                                await slack_service.send_new_paper_notification(
-                                    user_id=user_id,
-                                    paper_title=new_paper.title,
-                                    paper_url=new_paper.url,
-                                    summary=new_paper.summary or "N/A",
-                                    authors=", ".join(
-                                        [author.name for author in new_paper.authors]
-                                    ),
-                                    keywords=", ".join(
-                                        [keyword.name for keyword in new_paper.keywords]
-                                    ),
-                                )
-                            except Exception:
-                                # print(f"Error sending Slack notification for user {user_id}: {e}")
-                                raise
-
+                        new_papers.append(
+                            await run_in_writer(
+                                paper_service.create_paper, paper_create
+                            )
+                        )
                     else:
-                        print(f"Paper already exists: {existing_paper.title}")
-            except Exception as e:
-                print(f"Error checking for new papers for keyword {keyword_name}: {e}")
+                        logger.info(f"Paper already exists: {existing_paper.title}")
+
+                if settings.SUMMARY_ENRICHMENT_MODE == "inline":
+                    # Notifications then carry a real summary, and later
+                    # summary requests are answered from the database.
+                    await enrich_papers(db, new_papers)
+
+                for user_id in user_ids:
+                    candidates[user_id].extend(new_papers)
+            except Exception:
+                logger.exception(
+                    f"Error checking for new papers for keyword {keyword_name}"
+                )
                 raise
+    except Exception:
+        # Keep the session usable for the notifications below.
+        db.rollback()
+        raise
+    finally:
+        try:
+            # Earlier keywords' papers are already stored, so a later run
+            # would never announce them: send what was found even on failure.
+            await notify_candidates(db, slack_service, candidates)
+        finally:
+            db.close()
+
+
+async def notify_candidates(db, slack_service, candidates) -> None:
+    """Send each user their best-ranked new papers."""
+    for user_id, papers in candidates.items():
+        if papers:
+            home_views.invalidate(user_id)
+
+    # Users with broad subscriptions only hear about their best matches.
+    deliveries = RankingService(db).top_papers(candidates, settings.NOTIFICATION_TOP_K)
+    try:
+        for user_id, papers in deliveries.items():
+            for new_paper in papers:
+                await slack_service.send_new_paper_notification(
+                    user_id=user_id,
+                    paper_title=new_paper.title,
+                    paper_url=new_paper.url,
+                    summary=new_paper.summary or "N/A",
+                    authors=", ".join([author.name for author in new_paper.authors]),
+                    keywords=", ".join(
+                        [keyword.name for keyword in new_paper.keywords]
+                    ),
+                )
+    except Exception:
+        logger.exception("Error sending new paper notifications")
+        raise
+
+
+def workspace_ai_service() -> Optional[AIService]:
+    """Gemini with the workspace key, or None where it is not configured."""
+    if not settings.GEMINI_API_KEY:
+        return None
+    return AIService(settings.GEMINI_API_KEY, circuit_breaker=shared_key_breaker)
+
+
+async def enrich_papers(db, papers) -> int:
+    """
+    Summarize `papers` with the workspace Gemini key, or with the local
+    extractive summarizer where Gemini is not configured or not available.
+    """
+    if not papers:
+        return 0
+    try:
+        enrichment_service = EnrichmentService(db, workspace_ai_service())
+        return await enrichment_service.summarize_papers(papers)
+    except Exception:
+        # Enrichment is best effort; papers keep their abstract.
+        logger.exception("Error summarizing new papers")
+        return 0
+
+
+async def enrich_pending_papers_async():
+    db = SessionLocal()
+    try:
+        papers = EnrichmentService(db, workspace_ai_service()).get_pending_papers()
+        await enrich_papers(db, papers)
+    finally:
+        db.close()
+
+
+async def fetch_full_texts_async():
+    db = SessionLocal()
+    try:
+        full_text_service = FullTextService(db)
+        papers = full_text_service.get_pending_papers(
+            settings.FULL_TEXT_FETCH_BATCH_SIZE
+        )
+        await full_text_service.fetch_papers(papers)
     finally:
         db.close()
 
@@ -100,6 +210,22 @@ async def start_scheduler():
         id="new_paper_check",
         replace_existing=True,
     )
+    if settings.SUMMARY_ENRICHMENT_MODE == "offpeak":
+        scheduler.add_job(
+            enrich_pending_papers_async,
+            "cron",
+            hour=settings.SUMMARY_ENRICHMENT_HOUR,
+            id="summary_enrichment",
+            replace_existing=True,
+        )
+    if settings.FULL_TEXT_FETCH_ENABLED:
+        scheduler.add_job(
+            fetch_full_texts_async,
+            "interval",
+            minutes=60,
+            id="full_text_fetch",
+            replace_existing=True,
+        )
 
 
 async def shutdown_scheduler():
@@ -1,8 +1,18 @@
+import asyncio
 import logging
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Tuple
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.metrics import metrics
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -22,27 +32,209 @@ if SQLALCHEMY_DATABASE_URL.startswith(
 
 logger.debug(f"Connecting to database at: {SQLALCHEMY_DATABASE_URL}")
 
-if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+
+def is_sqlite_file_url(url: str) -> bool:
+    return url.startswith("sqlite") and ":memory:" not in url and url != "sqlite://"
+
+
+def _apply_sqlite_pragmas(dbapi_connection, read_only: bool) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        if not read_only:
+            # journal_mode is persisted in the database file, so only the
+            # writer needs to set it.
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def create_engines(url: str) -> Tuple[Engine, Engine]:
+    """
+    Create the (writer, reader) engine pair for the given database URL.
+
+    File-backed SQLite databases get WAL mode with tuned pragmas and a
+    separate read-only pool, so readers keep working while the scheduler
+    writes. Every other database uses a single engine for both roles.
+    """
+    if not url.startswith("sqlite"):
+        writer = create_engine(url)
+        return writer, writer
+
+    connect_args = {"check_same_thread": False}
+    writer = create_engine(url, connect_args=connect_args)
+    if not is_sqlite_file_url(url):
+        return writer, writer
+
+    reader = create_engine(
+        url,
+        connect_args=connect_args,
+        pool_size=settings.SQLITE_READ_POOL_SIZE,
     )
-else:
-    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    event.listen(
+        writer,
+        "connect",
+        lambda dbapi_connection, _: _apply_sqlite_pragmas(dbapi_connection, False),
+    )
+    event.listen(
+        reader,
+        "connect",
+        lambda dbapi_connection, _: _apply_sqlite_pragmas(dbapi_connection, True),
+    )
+    return writer, reader
+
+
+engine, read_engine = create_engines(SQLALCHEMY_DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# SQLite allows a single writer at a time. Funnelling write units through one
+# dedicated thread serializes them in-process and keeps busy waits off the
+# event loop; other databases get a regular pool.
+_writer_executor = ThreadPoolExecutor(
+    max_workers=1 if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else 4,
+    thread_name_prefix="db-writer",
+)
+
+
+async def run_in_writer(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking write unit on the dedicated writer thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_writer_executor, partial(fn, *args, **kwargs))
+
 
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
+# Sessions currently open through session_scope(), keyed by id(session).
+# Each entry records when the session was opened and the call-site stack so
+# that long-held sessions can be traced back to the handler that opened them.
+_open_sessions: Dict[int, Tuple[float, List[traceback.FrameSummary]]] = {}
+_open_sessions_lock = threading.Lock()
+
+
+@contextmanager
+def session_scope(read_only: bool = False) -> Iterator[Session]:
+    """
+    Open a session for a single Slack interaction or API request and make
+    sure it is closed (returning its connection to the pool) afterwards.
+    Pass read_only=True for paths that never write to use the read pool.
+    """
+    db = ReadSessionLocal() if read_only else SessionLocal()
+    opened_at = time.monotonic()
+    key = id(db)
+    with _open_sessions_lock:
+        _open_sessions[key] = (opened_at, traceback.extract_stack(limit=16)[:-2])
     try:
+        # Check the connection out eagerly so pool wait time can be measured.
+        checkout_started = time.monotonic()
+        db.connection()
+        metrics.observe("db.pool.wait_seconds", time.monotonic() - checkout_started)
         yield db
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
+        with _open_sessions_lock:
+            _, stack = _open_sessions.pop(key)
+        held = time.monotonic() - opened_at
+        metrics.observe("db.session.held_seconds", held)
+        if held > settings.DB_SESSION_LEAK_THRESHOLD_SECONDS:
+            metrics.increment("db.session.long_held")
+            logger.warning(
+                f"Database session held for {held:.1f}s "
+                f"(threshold {settings.DB_SESSION_LEAK_THRESHOLD_SECONDS:.1f}s), "
+                f"opened at:\n{''.join(traceback.format_list(stack))}"
+            )
+
+
+@asynccontextmanager
+async def writer_session_scope() -> AsyncIterator[Session]:
+    """
+    session_scope() for async callers whose database work all goes through
+    run_in_writer: the session is also opened and closed on the writer
+    thread, so not even the connection checkout blocks the event loop.
+    """
+    scope = session_scope()
+    db = await run_in_writer(scope.__enter__)
+    try:
+        yield db
+    except BaseException as e:
+        await run_in_writer(scope.__exit__, type(e), e, e.__traceback__)
+        raise
+    else:
+        await run_in_writer(scope.__exit__, None, None, None)
+
+
+def get_db():
+    with session_scope() as db:
+        yield db
+
+
+def get_read_db():
+    with session_scope(read_only=True) as db:
+        yield db
+
+
+def report_long_held_sessions() -> int:
+    """
+    Log the opening stack of every session that is still open past the leak
+    threshold. Returns the number of such sessions.
+    """
+    now = time.monotonic()
+    with _open_sessions_lock:
+        long_held = [
+            (now - opened_at, stack)
+            for opened_at, stack in _open_sessions.values()
+            if now - opened_at > settings.DB_SESSION_LEAK_THRESHOLD_SECONDS
+        ]
+    for held, stack in long_held:
+        logger.warning(
+            f"Database session open for {held:.1f}s, opened at:\n"
+            f"{''.join(traceback.format_list(stack))}"
+        )
+    return len(long_held)
+
+
+def get_pool_metrics() -> Dict[str, float]:
+    pool = engine.pool
+    read_pool = read_engine.pool
+    # Only QueuePool tracks overflow; other pool classes report what they can.
+    checked_out = pool.checkedout() if hasattr(pool, "checkedout") else 0
+    overflow = pool.overflow() if hasattr(pool, "overflow") else 0
+    wait = metrics.snapshot()["timings"].get("db.pool.wait_seconds", {})
+    with _open_sessions_lock:
+        open_sessions = len(_open_sessions)
+    metrics_by_name = {
+        "checked_out": checked_out,
+        "overflow": overflow,
+        "open_sessions": open_sessions,
+        "wait_seconds_total": wait.get("total", 0.0),
+        "wait_seconds_max": wait.get("max", 0.0),
+    }
+    if read_pool is not pool:
+        metrics_by_name["read_checked_out"] = (
+            read_pool.checkedout() if hasattr(read_pool, "checkedout") else 0
+        )
+    return metrics_by_name
 
 
 def init_db():
+    # Imported here because the migration package is loaded after Base.
+    from app.db.migrations import is_schema_current, run_migrations
+
+    if is_schema_current(engine):
+        logger.debug("Schema is current; skipping table creation.")
+        return
     logger.debug("Attempting to create all tables...")
     Base.metadata.create_all(bind=engine)
     logger.debug("Table creation attempt finished.")
+    version = run_migrations(engine)
+    logger.debug(f"Schema migrated to version {version}.")
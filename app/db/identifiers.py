@@ -0,0 +1,58 @@
+import re
+from typing import Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+# One paper, one identity: arXiv IDs lose their version suffix and URLs are
+# reduced to a canonical form, so /abs/ and /pdf/ links, http and https, and
+# v1 and v2 all find the same row.
+
+_VERSIONED_ID = re.compile(r"^(.+?)v(\d+)$")
+_ARXIV_URL = re.compile(
+    r"^(?:[\w-]+\.)*arxiv\.org/(?:abs|pdf)/([a-z\-]+(?:\.[A-Z]{2})?/\d{7}|\d{4}\.\d{4,5})"
+    r"(?:v\d+)?(?:\.pdf)?/?$",
+    re.IGNORECASE,
+)
+
+
+def split_arxiv_version(arxiv_id: str) -> Tuple[str, Optional[int]]:
+    """Split "2301.00001v2" into ("2301.00001", 2); unversioned IDs get None."""
+    arxiv_id = arxiv_id.strip()
+    match = _VERSIONED_ID.match(arxiv_id)
+    if match:
+        return match.group(1), int(match.group(2))
+    return arxiv_id, None
+
+
+def strip_version(arxiv_id: str) -> str:
+    return split_arxiv_version(arxiv_id)[0]
+
+
+def parse_arxiv_id(url: str) -> Optional[str]:
+    """The arXiv ID in an arxiv.org abs or pdf URL, without its version."""
+    parts = urlsplit((url or "").strip())
+    match = _ARXIV_URL.search(f"{parts.netloc}{parts.path}")
+    return match.group(1) if match else None
+
+
+def arxiv_url(arxiv_id: str) -> str:
+    return f"https://arxiv.org/abs/{strip_version(arxiv_id)}"
+
+
+def canonical_url(url: str) -> str:
+    """
+    The form a URL is deduplicated on: arXiv links become their versionless
+    abs page, and other URLs are lowercased in scheme and host, upgraded to
+    https, and lose "www.", the fragment and any trailing slash.
+    """
+    arxiv_id = parse_arxiv_id(url)
+    if arxiv_id:
+        return arxiv_url(arxiv_id)
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme == "http":
+        scheme = "https"
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/")
+    return urlunsplit((scheme, host, path, parts.query, ""))
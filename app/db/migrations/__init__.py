@@ -0,0 +1,13 @@
+from app.db.migrations.runner import (
+    LATEST_VERSION,
+    get_schema_version,
+    is_schema_current,
+    run_migrations,
+)
+
+__all__ = [
+    "LATEST_VERSION",
+    "get_schema_version",
+    "is_schema_current",
+    "run_migrations",
+]
@@ -0,0 +1,112 @@
+import logging
+from typing import List, Sequence
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+
+def _existing_index_columns(conn: Connection, table: str) -> List[tuple]:
+    """Return (columns, unique) for every index-backed structure on a table."""
+    inspector = inspect(conn)
+    structures = [
+        (tuple(index["column_names"]), bool(index["unique"]))
+        for index in inspector.get_indexes(table)
+    ]
+    structures += [
+        (tuple(constraint["column_names"]), True)
+        for constraint in inspector.get_unique_constraints(table)
+    ]
+    primary_key = inspector.get_pk_constraint(table)["constrained_columns"]
+    if primary_key:
+        structures.append((tuple(primary_key), True))
+    return structures
+
+
+def has_covering_index(
+    conn: Connection, table: str, columns: Sequence[str], unique: bool = False
+) -> bool:
+    """
+    True if an existing index, unique constraint or primary key can serve
+    lookups on `columns`. A unique request needs an exact unique match; a
+    plain request is satisfied by any structure with `columns` as prefix.
+    """
+    columns = tuple(columns)
+    for existing, existing_unique in _existing_index_columns(conn, table):
+        if unique:
+            if existing_unique and existing == columns:
+                return True
+        elif existing[: len(columns)] == columns:
+            return True
+    return False
+
+
+def _drop_invalid_postgres_index(conn: Connection, name: str) -> None:
+    # An interrupted CREATE INDEX CONCURRENTLY leaves an INVALID index behind,
+    # which IF NOT EXISTS would otherwise silently keep.
+    invalid = conn.execute(
+        text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name},
+    ).first()
+    if invalid:
+        logger.warning(f"Dropping invalid index {name} before rebuilding it.")
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+
+def ensure_index(
+    conn: Connection,
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    unique: bool = False,
+) -> None:
+    """
+    Create an index unless one covering the same columns already exists.
+    On PostgreSQL the index is built CONCURRENTLY so writes are not blocked,
+    which requires `conn` to be in AUTOCOMMIT mode.
+    """
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        _drop_invalid_postgres_index(conn, name)
+    if has_covering_index(conn, table, columns, unique=unique):
+        logger.debug(f"Index on {table}({', '.join(columns)}) already present.")
+        return
+
+    unique_sql = "UNIQUE " if unique else ""
+    concurrently_sql = "CONCURRENTLY " if dialect == "postgresql" else ""
+    logger.info(f"Creating index {name} on {table}({', '.join(columns)}).")
+    conn.execute(
+        text(
+            f"CREATE {unique_sql}INDEX {concurrently_sql}IF NOT EXISTS {name} "
+            f"ON {table} ({', '.join(columns)})"
+        )
+    )
+
+
+def delete_duplicate_rows(conn: Connection, table: str, columns: Sequence[str]):
+    """Keep the lowest id for each group of `columns`, so a unique index fits."""
+    column_sql = ", ".join(columns)
+    conn.execute(
+        text(
+            f"DELETE FROM {table} WHERE id NOT IN "
+            f"(SELECT MIN(id) FROM {table} GROUP BY {column_sql})"
+        )
+    )
+
+
+def drop_index(conn: Connection, name: str) -> None:
+    concurrently_sql = "CONCURRENTLY " if conn.dialect.name == "postgresql" else ""
+    conn.execute(text(f"DROP INDEX {concurrently_sql}IF EXISTS {name}"))
+
+
+def add_column(conn: Connection, table: str, name: str, column_sql: str) -> None:
+    """Add a column unless it already exists. `column_sql` is its type and options."""
+    existing = {column["name"] for column in inspect(conn).get_columns(table)}
+    if name in existing:
+        logger.debug(f"Column {table}.{name} already present.")
+        return
+    logger.info(f"Adding column {table}.{name}.")
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {column_sql}"))
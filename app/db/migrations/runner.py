@@ -0,0 +1,61 @@
+import logging
+from datetime import datetime, UTC
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from app.db.migrations.versions import MIGRATIONS
+
+logger = logging.getLogger(__name__)
+
+LATEST_VERSION = MIGRATIONS[-1].VERSION if MIGRATIONS else 0
+
+_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def get_schema_version(engine: Engine) -> int:
+    if not inspect(engine).has_table(schema_version.name):
+        return 0
+    with engine.connect() as conn:
+        return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+
+def is_schema_current(engine: Engine) -> bool:
+    return get_schema_version(engine) >= LATEST_VERSION
+
+
+def run_migrations(engine: Engine) -> int:
+    """
+    Apply every migration newer than the recorded schema version and return
+    the resulting version. Migrations run in AUTOCOMMIT mode so PostgreSQL
+    can build indexes CONCURRENTLY; each one is written to be idempotent.
+    """
+    _metadata.create_all(bind=engine)
+    current = get_schema_version(engine)
+    for migration in MIGRATIONS:
+        if migration.VERSION <= current:
+            continue
+        logger.info(f"Applying migration {migration.VERSION}: {migration.DESCRIPTION}")
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            migration.upgrade(conn)
+            try:
+                conn.execute(
+                    schema_version.insert().values(
+                        version=migration.VERSION,
+                        description=migration.DESCRIPTION,
+                        applied_at=datetime.now(UTC),
+                    )
+                )
+            except IntegrityError:
+                # Another instance recorded the same migration concurrently.
+                logger.debug(f"Migration {migration.VERSION} already recorded.")
+        current = migration.VERSION
+    return current
@@ -0,0 +1,26 @@
+from app.db.migrations.versions import (
+    v0001_hot_path_indexes,
+    v0002_paper_keyset_index,
+    v0003_summary_cache,
+    v0004_full_text,
+    v0005_canonical_identifiers,
+    v0006_paper_minhash,
+    v0007_home_seen_paper,
+    v0008_full_text_retries,
+    v0009_unknown_published_dates,
+    v0010_paper_abstract,
+)
+
+# Ordered list of migration modules; append new versions at the end.
+MIGRATIONS = [
+    v0001_hot_path_indexes,
+    v0002_paper_keyset_index,
+    v0003_summary_cache,
+    v0004_full_text,
+    v0005_canonical_identifiers,
+    v0006_paper_minhash,
+    v0007_home_seen_paper,
+    v0008_full_text_retries,
+    v0009_unknown_published_dates,
+    v0010_paper_abstract,
+]
@@ -0,0 +1,33 @@
+from sqlalchemy.engine import Connection
+from app.db.migrations.ops import delete_duplicate_rows, ensure_index
+
+VERSION = 1
+DESCRIPTION = "Add hot-path indexes for subscriptions, paper lookups and joins"
+
+
+def upgrade(conn: Connection) -> None:
+    # Subscriptions must be unique per (user, target) before indexing them.
+    delete_duplicate_rows(conn, "user_keywords", ["user_id", "keyword_id"])
+    ensure_index(
+        conn,
+        "ix_user_keywords_user_id_keyword_id",
+        "user_keywords",
+        ["user_id", "keyword_id"],
+        unique=True,
+    )
+    delete_duplicate_rows(conn, "user_authors", ["user_id", "author_id"])
+    ensure_index(
+        conn,
+        "ix_user_authors_user_id_author_id",
+        "user_authors",
+        ["user_id", "author_id"],
+        unique=True,
+    )
+
+    ensure_index(conn, "ix_papers_arxiv_id", "papers", ["arxiv_id"])
+    ensure_index(conn, "ix_papers_published_date", "papers", ["published_date"])
+
+    # The association tables are keyed (paper_id, other_id); reverse lookups
+    # from an author or keyword need their own index.
+    ensure_index(conn, "ix_paper_authors_author_id", "paper_authors", ["author_id"])
+    ensure_index(conn, "ix_paper_keywords_keyword_id", "paper_keywords", ["keyword_id"])
@@ -0,0 +1,11 @@
+from sqlalchemy.engine import Connection
+from app.db.migrations.ops import add_column
+from app.db.models import SummaryCacheEntry
+
+VERSION = 3
+DESCRIPTION = "Add the shared summary cache and record which model wrote a summary"
+
+
+def upgrade(conn: Connection) -> None:
+    add_column(conn, "papers", "summary_model", "VARCHAR")
+    SummaryCacheEntry.__table__.create(conn, checkfirst=True)
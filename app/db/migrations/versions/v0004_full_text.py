@@ -0,0 +1,11 @@
+from sqlalchemy.engine import Connection
+from app.db.migrations.ops import add_column
+
+VERSION = 4
+DESCRIPTION = "Store the compressed full text of papers and their cached PDF digest"
+
+
+def upgrade(conn: Connection) -> None:
+    binary_type = "BYTEA" if conn.dialect.name == "postgresql" else "BLOB"
+    add_column(conn, "papers", "full_text", binary_type)
+    add_column(conn, "papers", "pdf_sha256", "VARCHAR(64)")
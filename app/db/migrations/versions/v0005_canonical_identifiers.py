@@ -0,0 +1,82 @@
+import logging
+from typing import Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from app.db.identifiers import canonical_url, parse_arxiv_id, split_arxiv_version
+from app.db.migrations.ops import add_column, ensure_index
+
+logger = logging.getLogger(__name__)
+
+VERSION = 5
+DESCRIPTION = "Canonicalize paper URLs and arXiv IDs and merge the duplicates"
+
+ASSOCIATIONS = (("paper_authors", "author_id"), ("paper_keywords", "keyword_id"))
+
+
+def _merge_paper(conn: Connection, keep: int, duplicate: int) -> None:
+    # Move the duplicate's authors and keywords over, then drop it.
+    for table, column in ASSOCIATIONS:
+        conn.execute(
+            text(
+                f"INSERT INTO {table} (paper_id, {column}) "
+                f"SELECT :keep, {column} FROM {table} WHERE paper_id = :duplicate "
+                f"AND {column} NOT IN "
+                f"(SELECT {column} FROM {table} WHERE paper_id = :keep)"
+            ),
+            {"keep": keep, "duplicate": duplicate},
+        )
+        conn.execute(
+            text(f"DELETE FROM {table} WHERE paper_id = :duplicate"),
+            {"duplicate": duplicate},
+        )
+    conn.execute(text("DELETE FROM papers WHERE id = :id"), {"id": duplicate})
+
+
+def upgrade(conn: Connection) -> None:
+    add_column(conn, "papers", "canonical_url", "VARCHAR")
+    add_column(conn, "papers", "arxiv_version", "INTEGER")
+
+    owner_by_url: Dict[str, int] = {}
+    owner_by_arxiv_id: Dict[str, int] = {}
+    updates = []
+    rows = conn.execute(text("SELECT id, url, arxiv_id FROM papers ORDER BY id"))
+    for paper_id, url, raw_arxiv_id in rows.fetchall():
+        url_key = canonical_url(url)
+        arxiv_id: Optional[str] = None
+        version: Optional[int] = None
+        if raw_arxiv_id:
+            arxiv_id, version = split_arxiv_version(raw_arxiv_id)
+        arxiv_id = arxiv_id or parse_arxiv_id(url)
+
+        # The oldest row wins, as with delete_duplicate_rows.
+        keep = owner_by_url.get(url_key) or (
+            owner_by_arxiv_id.get(arxiv_id) if arxiv_id else None
+        )
+        if keep is not None:
+            logger.info(f"Merging duplicate paper {paper_id} into {keep}.")
+            _merge_paper(conn, keep, paper_id)
+            continue
+        owner_by_url[url_key] = paper_id
+        if arxiv_id:
+            owner_by_arxiv_id[arxiv_id] = paper_id
+        updates.append(
+            {
+                "id": paper_id,
+                "canonical_url": url_key,
+                "arxiv_id": arxiv_id,
+                "arxiv_version": version,
+            }
+        )
+
+    if updates:
+        conn.execute(
+            text(
+                "UPDATE papers SET canonical_url = :canonical_url, "
+                "arxiv_id = :arxiv_id, arxiv_version = :arxiv_version "
+                "WHERE id = :id"
+            ),
+            updates,
+        )
+    ensure_index(
+        conn, "ix_papers_canonical_url", "papers", ["canonical_url"], unique=True
+    )
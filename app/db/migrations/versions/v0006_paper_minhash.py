@@ -0,0 +1,40 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from app.db.migrations.ops import add_column
+from app.services.near_duplicates import minhash_signature, signature_to_bytes
+
+VERSION = 6
+DESCRIPTION = "Store MinHash signatures of papers for near-duplicate detection"
+
+BATCH_SIZE = 1000
+
+
+def upgrade(conn: Connection) -> None:
+    binary_type = "BYTEA" if conn.dialect.name == "postgresql" else "BLOB"
+    add_column(conn, "papers", "minhash", binary_type)
+
+    # Summaries may already be AI-written; they are the best text left.
+    # Papers too short to sign keep a NULL minhash, so page by id.
+    after = 0
+    while True:
+        rows = conn.execute(
+            text(
+                "SELECT id, title, summary FROM papers WHERE minhash IS NULL "
+                "AND id > :after ORDER BY id LIMIT :limit"
+            ),
+            {"after": after, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            return
+        after = rows[-1][0]
+        params = []
+        for paper_id, title, summary in rows:
+            signature = minhash_signature(title, summary)
+            if signature is not None:
+                params.append(
+                    {"id": paper_id, "minhash": signature_to_bytes(signature)}
+                )
+        if params:
+            conn.execute(
+                text("UPDATE papers SET minhash = :minhash WHERE id = :id"), params
+            )
@@ -0,0 +1,9 @@
+from sqlalchemy.engine import Connection
+from app.db.migrations.ops import add_column
+
+VERSION = 7
+DESCRIPTION = "Remember the newest paper each user has seen on their App Home"
+
+
+def upgrade(conn: Connection) -> None:
+    add_column(conn, "users", "home_seen_paper_id", "INTEGER")
@@ -0,0 +1,10 @@
+from sqlalchemy.engine import Connection
+from app.db.migrations.ops import add_column
+
+VERSION = 8
+DESCRIPTION = "Track failed full-text fetches so they back off instead of repeating"
+
+
+def upgrade(conn: Connection) -> None:
+    add_column(conn, "papers", "full_text_attempts", "INTEGER NOT NULL DEFAULT 0")
+    add_column(conn, "papers", "full_text_retry_at", "TIMESTAMP")
@@ -0,0 +1,19 @@
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.engine import Connection
+from app.db.migrations.versions.v0002_paper_keyset_index import UNKNOWN_PUBLISHED_DATE
+
+VERSION = 9
+DESCRIPTION = "Rewrite dates backfilled by version 2 in the ORM's DateTime format"
+
+# What version 2 used to write, which sorts apart from the ORM's format and
+# broke keyset pagination over the backfilled rows.
+LEGACY_UNKNOWN_PUBLISHED_DATE = "1970-01-01 00:00:00"
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(
+        text(
+            "UPDATE papers SET published_date = :date WHERE published_date = :legacy"
+        ).bindparams(bindparam("date", type_=DateTime)),
+        {"date": UNKNOWN_PUBLISHED_DATE, "legacy": LEGACY_UNKNOWN_PUBLISHED_DATE},
+    )
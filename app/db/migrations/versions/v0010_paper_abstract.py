@@ -0,0 +1,9 @@
+from sqlalchemy.engine import Connection
+from app.db.migrations.ops import add_column
+
+VERSION = 10
+DESCRIPTION = "Keep each paper's abstract once a summary replaces it"
+
+
+def upgrade(conn: Connection) -> None:
+    add_column(conn, "papers", "abstract", "TEXT")
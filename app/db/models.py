@@ -1,18 +1,49 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+)
+from sqlalchemy.orm import deferred, relationship, validates
 from datetime import datetime, UTC
+from typing import Optional
 from app.db.database import Base
+from app.db.identifiers import canonical_url, split_arxiv_version
 
 
 class Paper(Base):
     __tablename__ = "papers"
+    # Keyset pagination walks papers in (published_date, id) order.
+    __table_args__ = (Index("ix_papers_published_date_id", "published_date", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
     url = Column(String, unique=True, index=True, nullable=False)
-    summary = Column(Text, nullable=True)
-    published_date = Column(DateTime, default=lambda: datetime.now(UTC))
-    arxiv_id = Column(String, unique=True, nullable=True)  # For arXiv papers
+    # Abstracts and AI summaries are large; load them only where rendered.
+    summary = deferred(Column(Text, nullable=True))
+    # Model that generated `summary`; NULL while it is still the abstract.
+    summary_model = Column(String, nullable=True)
+    # The ingested abstract, kept here once a summary replaces it.
+    abstract = deferred(Column(Text, nullable=True))
+    published_date = Column(DateTime, default=lambda: datetime.now(UTC), nullable=False)
+    # Deduplication key derived from `url`; see app.db.identifiers.
+    canonical_url = Column(String, unique=True, index=True, nullable=True)
+    # For arXiv papers: the versionless ID, with the version kept apart
+    arxiv_id = Column(String, unique=True, index=True, nullable=True)
+    arxiv_version = Column(Integer, nullable=True)
+    # MinHash of the title and ingest-time abstract (app.services.near_duplicates)
+    minhash = deferred(Column(LargeBinary, nullable=True))
+    # Text extracted from the PDF, zlib-compressed (see app.services.pdf_text),
+    # and the SHA-256 of that PDF in the on-disk cache.
+    full_text = deferred(Column(LargeBinary, nullable=True))
+    pdf_sha256 = Column(String(64), nullable=True)
+    # Failed full-text fetches so far, and when the next may be tried.
+    full_text_attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    full_text_retry_at = Column(DateTime, nullable=True)
 
     # Relationships
     authors = relationship("Author", secondary="paper_authors", back_populates="papers")
@@ -20,6 +51,24 @@ class Paper(Base):
         "Keyword", secondary="paper_keywords", back_populates="papers"
     )
 
+    @property
+    def ingested_abstract(self) -> Optional[str]:
+        """The abstract the paper came with, whether or not it was summarized."""
+        return self.abstract or (None if self.summary_model else self.summary)
+
+    @validates("url")
+    def _set_canonical_url(self, key, url):
+        self.canonical_url = canonical_url(url) if url else None
+        return url
+
+    @validates("arxiv_id")
+    def _split_arxiv_version(self, key, arxiv_id):
+        if not arxiv_id:
+            self.arxiv_version = None
+            return None
+        arxiv_id, self.arxiv_version = split_arxiv_version(arxiv_id)
+        return arxiv_id
+
 
 class Author(Base):
     __tablename__ = "authors"
@@ -46,13 +95,15 @@ class Keyword(Base):
 class PaperAuthor(Base):
     __tablename__ = "paper_authors"
     paper_id = Column(Integer, ForeignKey("papers.id"), primary_key=True)
-    author_id = Column(Integer, ForeignKey("authors.id"), primary_key=True)
+    author_id = Column(Integer, ForeignKey("authors.id"), primary_key=True, index=True)
 
 
 class PaperKeyword(Base):
     __tablename__ = "paper_keywords"
     paper_id = Column(Integer, ForeignKey("papers.id"), primary_key=True)
-    keyword_id = Column(Integer, ForeignKey("keywords.id"), primary_key=True)
+    keyword_id = Column(
+        Integer, ForeignKey("keywords.id"), primary_key=True, index=True
+    )
 
 
 class User(Base):
@@ -61,6 +112,8 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     slack_user_id = Column(String, unique=True, index=True, nullable=False)
     api_key = Column(String, nullable=True)  # For AI services
+    # Newest matched paper shown on the user's App Home; newer ones are unread.
+    home_seen_paper_id = Column(Integer, nullable=True)
 
     keywords = relationship("UserKeyword", back_populates="user")
     authors = relationship("UserAuthor", back_populates="user")
@@ -68,6 +121,11 @@ class User(Base):
 
 class UserKeyword(Base):
     __tablename__ = "user_keywords"
+    __table_args__ = (
+        Index(
+            "ix_user_keywords_user_id_keyword_id", "user_id", "keyword_id", unique=True
+        ),
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     keyword_id = Column(Integer, ForeignKey("keywords.id"), nullable=False)
@@ -78,9 +136,24 @@ class UserKeyword(Base):
 
 class UserAuthor(Base):
     __tablename__ = "user_authors"
+    __table_args__ = (
+        Index("ix_user_authors_user_id_author_id", "user_id", "author_id", unique=True),
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     author_id = Column(Integer, ForeignKey("authors.id"), nullable=False)
 
     user = relationship("User", back_populates="authors")
     author = relationship("Author")
+
+
+class SummaryCacheEntry(Base):
+    __tablename__ = "summary_cache"
+
+    # sha256 of (model, length instruction, text); see app.services.summary_cache
+    key = Column(String(64), primary_key=True)
+    model = Column(String, nullable=False)
+    summary = Column(Text, nullable=False)
+    created_at = Column(
+        DateTime, default=lambda: datetime.now(UTC), nullable=False, index=True
+    )
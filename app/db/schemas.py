@@ -72,6 +72,35 @@ class Paper(PaperBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class PaperPage(BaseModel):
+    items: List[Paper]
+    next_cursor: Optional[str] = None
+
+
+class PaperHeader(BaseModel):
+    id: int
+    title: str
+    url: str
+    arxiv_id: Optional[str] = None
+    published_date: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SimilarPaper(PaperHeader):
+    score: float
+
+
+class PaperHeaderPage(BaseModel):
+    items: List[PaperHeader]
+    next_cursor: Optional[str] = None
+
+
+class BibtexImportResult(BaseModel):
+    created: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+
+
 class UserKeywordBase(BaseModel):
     user_id: str
     keyword_id: int
@@ -0,0 +1,90 @@
+from typing import Any, Dict, Optional, Sequence
+from sqlalchemy import Table, event, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.db.database import Base
+
+# (table name, natural key) -> primary key for hot authors, keywords and users.
+name_id_cache = LRUCache(settings.NAME_ID_CACHE_SIZE)
+
+_PENDING_KEY = "pending_name_ids"
+
+
+def _supports_on_conflict(session: Session) -> bool:
+    dialect = session.get_bind().dialect
+    if dialect.name == "postgresql":
+        return True
+    # ON CONFLICT needs SQLite 3.24 and RETURNING needs 3.35.
+    return dialect.name == "sqlite" and dialect.dbapi.sqlite_version_info >= (3, 35)
+
+
+def insert_ignore_returning_id(
+    db: Session, table: Table, values: Dict[str, Any], conflict_columns: Sequence[str]
+) -> Optional[int]:
+    """
+    INSERT a row unless it conflicts on `conflict_columns`, in one round trip.
+    Returns the new id, or None if the row already existed.
+    """
+    if _supports_on_conflict(db):
+        dialect_insert = (
+            postgresql.insert
+            if db.get_bind().dialect.name == "postgresql"
+            else sqlite.insert
+        )
+        stmt = (
+            dialect_insert(table)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=list(conflict_columns))
+            .returning(table.c.id)
+        )
+        return db.execute(stmt).scalar()
+
+    # Fallback: a savepoint keeps a lost race from aborting the transaction.
+    try:
+        with db.begin_nested():
+            result = db.execute(insert(table).values(**values))
+        return result.inserted_primary_key[0]
+    except IntegrityError:
+        return None
+
+
+def get_or_create_id(db: Session, model, **values) -> int:
+    """
+    Return the id of the `model` row identified by `values`, inserting it if
+    needed. Hot keys are served from an in-process LRU without touching the
+    database; new ids only enter the cache once their transaction commits.
+    """
+    table = model.__table__
+    cache_key = (table.name, *values.values())
+    cached_id = name_id_cache.get(cache_key)
+    if cached_id is not None:
+        return cached_id
+
+    row_id = insert_ignore_returning_id(db, table, values, list(values))
+    if row_id is None:
+        stmt = select(table.c.id).filter_by(**values)
+        row_id = db.execute(stmt).scalar_one()
+    db.info.setdefault(_PENDING_KEY, {})[cache_key] = row_id
+    return row_id
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_ids(session: Session) -> None:
+    for cache_key, row_id in session.info.pop(_PENDING_KEY, {}).items():
+        name_id_cache.put(cache_key, row_id)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending_ids(session: Session, transaction) -> None:
+    # Runs after after_commit; anything still pending was rolled back.
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+@event.listens_for(Base.metadata, "after_drop")
+def _clear_cache_on_drop(*args, **kwargs) -> None:
+    # Ids are meaningless once their tables are dropped (e.g. between tests).
+    name_id_cache.clear()
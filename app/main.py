@@ -1,13 +1,13 @@
 from fastapi import Request
-from slack_bolt.adapter.fastapi import SlackRequestHandler
+from slack_bolt.adapter.fastapi.async_handler import AsyncSlackRequestHandler
 from app.api.main import app as api_app
 from app.bot.app import slack_app
 
 # Mount the API app
 app = api_app
 
-# Create a SlackRequestHandler
-slack_handler = SlackRequestHandler(slack_app)
+# Create a request handler; slack_app is an AsyncApp
+slack_handler = AsyncSlackRequestHandler(slack_app)
 
 
 # Slack Bolt endpoint
@@ -1,15 +1,173 @@
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Set
 import google.generativeai as genai
-from tenacity import retry, stop_after_attempt, wait_random_exponential
+from google.ai import generativelanguage as glm
+from google.api_core.exceptions import ResourceExhausted, ServerError
+from tenacity import (
+    AsyncRetrying,
+    RetryError,
+    retry,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.rate_limit import CircuitBreaker, CircuitOpenError, FairQueue
+from app.services.extractive_summarizer import (
+    sentences_for_instruction,
+    summarize_extractive,
+)
+from app.services.text_chunking import estimate_tokens, split_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gemini-1.5-flash"
+# Local TextRank summarizer: instant, offline, and used when Gemini is not.
+EXTRACTIVE_MODEL = "extractive"
+# Length instruction for paper summaries, shared by on-demand and batch paths.
+PAPER_SUMMARY_INSTRUCTION = "in three sentences"
+# Map step of long inputs: keep enough detail for the final reduce.
+CHUNK_SUMMARY_INSTRUCTION = "concisely, keeping every key claim and result"
+
+# Quota errors and an open circuit fail fast instead of being retried for
+# minutes; other errors keep the backoff retries.
+FAIL_FAST_ERRORS = (ResourceExhausted, CircuitOpenError)
+# Errors meaning Gemini is unavailable right now, as opposed to bad input;
+# callers may fall back to EXTRACTIVE_MODEL on these.
+FALLBACK_ERRORS = (*FAIL_FAST_ERRORS, RetryError)
+
+# Lets requests still running on an evicted client finish before its channel
+# is closed.
+CLIENT_CLOSE_GRACE_SECONDS = 60.0
+
+BATCH_GENERATION_CONFIG: Dict = {
+    "response_mime_type": "application/json",
+    "response_schema": list[str],
+}
+
+
+class GeminiClientPool:
+    """
+    One async Gemini client per API key, plus the model instances built on it,
+    so users' keys never go through the process-global genai.configure() and
+    each key's transport is set up once. Least recently used keys are evicted
+    and their gRPC channels closed.
+    """
+
+    def __init__(self, maxsize: int):
+        # api_key -> (client, {model name: GenerativeModel})
+        self._entries = LRUCache(maxsize, on_evict=self._close_entry)
+        self._closing: Set[asyncio.Task] = set()
+
+    def get_model(self, api_key: Optional[str], model: str) -> genai.GenerativeModel:
+        entry = self._entries.get(api_key)
+        if entry is None:
+            # Without a key, fall back to the library's default client, which
+            # reads GEMINI_API_KEY / GOOGLE_API_KEY from the environment.
+            client = (
+                glm.GenerativeServiceAsyncClient(client_options={"api_key": api_key})
+                if api_key
+                else None
+            )
+            entry = (client, {})
+            self._entries.put(api_key, entry)
+        client, models = entry
+        model_instance = models.get(model)
+        if model_instance is None:
+            model_instance = genai.GenerativeModel(model)
+            if client is not None:
+                # google-generativeai takes no client argument; this private
+                # attribute is pinned by a test in test_ai_service.py.
+                model_instance._async_client = client
+            models[model] = model_instance
+        return model_instance
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _close_entry(self, api_key: Optional[str], entry) -> None:
+        client, _ = entry
+        if client is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # The channel is bound to the loop that created it; with no loop
+            # running, nothing is left to close it on.
+            return
+        task = loop.create_task(
+            client.transport.grpc_channel.close(CLIENT_CLOSE_GRACE_SECONDS)
+        )
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+client_pool = GeminiClientPool(settings.GEMINI_CLIENT_POOL_SIZE)
+
+
+# Guards the workspace-wide GEMINI_API_KEY shared by /요약 and enrichment.
+shared_key_breaker = CircuitBreaker(
+    "gemini_shared_key",
+    failure_threshold=settings.GEMINI_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.GEMINI_BREAKER_RESET_SECONDS,
+)
+
+# Fair admission of /요약 requests onto the shared key, costed in tokens.
+shared_key_queue = FairQueue(
+    "gemini_shared_key",
+    concurrency=settings.SUMMARY_GLOBAL_CONCURRENCY,
+    tokens_per_minute=settings.SUMMARY_USER_TOKENS_PER_MINUTE,
+    burst_tokens=settings.SUMMARY_USER_BURST_TOKENS,
+)
 
 
 class AIService:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, circuit_breaker: Optional[CircuitBreaker] = None):
         self.api_key = api_key
-        genai.configure(api_key=self.api_key)
+        self.circuit_breaker = circuit_breaker
+
+    async def _generate(self, model_instance, prompt: str, **kwargs):
+        """Call Gemini through the circuit breaker, if this key has one."""
+        if self.circuit_breaker is None:
+            return await model_instance.generate_content_async(prompt, **kwargs)
+        self.circuit_breaker.before_call()
+        try:
+            response = await model_instance.generate_content_async(prompt, **kwargs)
+        except (ResourceExhausted, ServerError):
+            self.circuit_breaker.record_failure()
+            raise
+        except Exception:
+            # Bad input is not a sign the service is down, but a trial call
+            # must still finish one way or the other.
+            self.circuit_breaker.record_success()
+            raise
+        self.circuit_breaker.record_success()
+        return response
 
-    @retry(wait=wait_random_exponential(min=1, max=60), stop=stop_after_attempt(5))
     async def summarize_text(
-        self, text: str, model: str = "gemini-1.5-flash", length_instruction: str = ""
+        self, text: str, model: str = DEFAULT_MODEL, length_instruction: str = ""
+    ) -> str:
+        if model == EXTRACTIVE_MODEL:
+            return summarize_extractive(
+                text, sentences_for_instruction(length_instruction)
+            )
+        if estimate_tokens(text) > settings.SUMMARY_MAX_INPUT_TOKENS:
+            text = await self._reduce_to_budget(text, model)
+        return await self._summarize_once(text, model, length_instruction)
+
+    @retry(
+        wait=wait_random_exponential(min=1, max=60),
+        stop=stop_after_attempt(5),
+        retry=retry_if_not_exception_type(FAIL_FAST_ERRORS),
+    )
+    async def _summarize_once(
+        self, text: str, model: str = DEFAULT_MODEL, length_instruction: str = ""
     ) -> str:
         try:
             # For Gemini, we can directly use the generate_content method
@@ -18,12 +176,108 @@ class AIService:
                 f"Please summarize the following text: {length_instruction}\n\n{text}"
             )
 
-            # Use the GenerativeModel for chat-like interactions
-            model_instance = genai.GenerativeModel(model)
-            response = await model_instance.generate_content_async(prompt)
+            # Reuse this key's model instance and transport across calls
+            model_instance = client_pool.get_model(self.api_key, model)
+            response = await self._generate(model_instance, prompt)
 
             return response.text.strip()
         except Exception as e:
             # Log the exception for debugging
             print(f"Error during summarization: {e}")
             raise
+
+    async def _reduce_to_budget(self, text: str, model: str) -> str:
+        """
+        Map step for inputs over the token budget: summarize section-aligned
+        chunks concurrently and join the partial summaries, repeating until
+        the result fits into a single request.
+        """
+        semaphore = asyncio.Semaphore(settings.SUMMARY_MAP_CONCURRENCY)
+
+        async def summarize_chunk(chunk: str) -> str:
+            async with semaphore:
+                return await self._summarize_once(
+                    chunk, model, CHUNK_SUMMARY_INSTRUCTION
+                )
+
+        while estimate_tokens(text) > settings.SUMMARY_MAX_INPUT_TOKENS:
+            chunks = split_text(text, settings.SUMMARY_CHUNK_TOKENS)
+            partials = await asyncio.gather(*(summarize_chunk(c) for c in chunks))
+            reduced = "\n\n".join(partials)
+            if len(reduced) >= len(text):
+                # The model is not shrinking the input; cut instead of looping.
+                return reduced[: settings.SUMMARY_MAX_INPUT_TOKENS * 4]
+            text = reduced
+        return text
+
+    async def stream_summary(
+        self, text: str, model: str = DEFAULT_MODEL, length_instruction: str = ""
+    ) -> AsyncIterator[str]:
+        """
+        Yield the summary piece by piece as Gemini generates it. Only opening
+        the stream is retried, briefly: retrying after partial output would
+        repeat text the user has already seen.
+        """
+        if model == EXTRACTIVE_MODEL:
+            yield summarize_extractive(
+                text, sentences_for_instruction(length_instruction)
+            )
+            return
+        try:
+            if estimate_tokens(text) > settings.SUMMARY_MAX_INPUT_TOKENS:
+                # Chunk summaries are not streamed; only the final reduce is.
+                text = await self._reduce_to_budget(text, model)
+            prompt = (
+                f"Please summarize the following text: {length_instruction}\n\n{text}"
+            )
+            model_instance = client_pool.get_model(self.api_key, model)
+            async for attempt in AsyncRetrying(
+                wait=wait_random_exponential(min=1, max=10),
+                stop=stop_after_attempt(3),
+                retry=retry_if_not_exception_type(FAIL_FAST_ERRORS),
+                reraise=True,
+            ):
+                with attempt:
+                    response = await self._generate(model_instance, prompt, stream=True)
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        except Exception:
+            logger.exception("Error during streaming summarization")
+            raise
+
+    @retry(
+        wait=wait_random_exponential(min=1, max=60),
+        stop=stop_after_attempt(5),
+        retry=retry_if_not_exception_type(FAIL_FAST_ERRORS),
+    )
+    async def summarize_batch(
+        self,
+        texts: List[str],
+        model: str = DEFAULT_MODEL,
+        length_instruction: str = "",
+    ) -> List[str]:
+        """Summarize several texts with one structured-output request."""
+        try:
+            numbered = "\n\n".join(
+                f"[{i}]\n{text}" for i, text in enumerate(texts, start=1)
+            )
+            prompt = (
+                f"Please summarize each of the following {len(texts)} texts "
+                f"{length_instruction}. Return a JSON array with exactly one "
+                f"summary string per text, in the same order.\n\n{numbered}"
+            )
+            model_instance = client_pool.get_model(self.api_key, model)
+            response = await self._generate(
+                model_instance, prompt, generation_config=BATCH_GENERATION_CONFIG
+            )
+
+            summaries = json.loads(response.text)
+            if not isinstance(summaries, list) or len(summaries) != len(texts):
+                raise ValueError(
+                    f"Expected {len(texts)} summaries, got {response.text[:200]}"
+                )
+            return [str(summary).strip() for summary in summaries]
+        except Exception:
+            logger.exception("Error during batch summarization")
+            raise
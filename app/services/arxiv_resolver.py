@@ -0,0 +1,123 @@
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional
+import arxiv
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.identifiers import strip_version
+from app.services.scholar_service import result_to_paper_data
+
+logger = logging.getLogger(__name__)
+
+
+class ArxivResolver:
+    """
+    Look up arXiv metadata by ID. Lookups arriving within `window_seconds` of
+    each other are sent as one id_list query of up to `batch_size` IDs, and
+    every caller waiting on an ID gets the shared result; if the query fails,
+    its IDs are retried one by one. Results are kept in an LRU cache, so
+    resolving 1,000 IDs costs a handful of requests. Batches run one at a
+    time to respect arXiv's rate limit.
+    """
+
+    def __init__(
+        self,
+        client: Optional[arxiv.Client] = None,
+        window_seconds: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        cache_size: Optional[int] = None,
+    ):
+        self.batch_size = batch_size or settings.ARXIV_RESOLVER_BATCH_SIZE
+        self.window_seconds = (
+            settings.ARXIV_RESOLVER_WINDOW_SECONDS
+            if window_seconds is None
+            else window_seconds
+        )
+        self.client = client or arxiv.Client(page_size=self.batch_size)
+        self._cache = LRUCache(cache_size or settings.ARXIV_RESOLVER_CACHE_SIZE)
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._fetch_lock: Optional[asyncio.Lock] = None
+
+    async def resolve(self, arxiv_id: str) -> Optional[Dict]:
+        """Paper data for `arxiv_id`, or None if arXiv does not know it."""
+        key = strip_version(arxiv_id)
+        cached = self._cache.get(key)
+        if cached is not None:
+            metrics.increment("arxiv_resolver.hit")
+            return cached
+
+        future = self._pending.get(key)
+        if future is None:
+            metrics.increment("arxiv_resolver.miss")
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(
+                    self.window_seconds, self._flush
+                )
+        else:
+            metrics.increment("arxiv_resolver.coalesced")
+        # shield() so one caller being cancelled does not fail the others.
+        return await asyncio.shield(future)
+
+    async def resolve_many(self, arxiv_ids: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        arxiv_ids = list(dict.fromkeys(arxiv_ids))
+        results = await asyncio.gather(*(self.resolve(i) for i in arxiv_ids))
+        return dict(zip(arxiv_ids, results))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            asyncio.ensure_future(self._fetch_batch(batch))
+
+    async def _fetch_batch(self, batch: Dict[str, asyncio.Future]) -> None:
+        if self._fetch_lock is None:
+            self._fetch_lock = asyncio.Lock()
+        try:
+            async with self._fetch_lock:
+                found = await asyncio.to_thread(self._fetch, list(batch))
+        except Exception as e:
+            if len(batch) > 1:
+                # One malformed ID can fail the whole query; retry the IDs
+                # one at a time so it only fails its own callers.
+                logger.warning(
+                    f"Error resolving {len(batch)} arXiv IDs, retrying each: {e}"
+                )
+                for key, future in batch.items():
+                    await self._fetch_batch({key: future})
+                return
+            logger.error(f"Error resolving arXiv ID {next(iter(batch))}: {e}")
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark it retrieved in case every caller has gone.
+                    future.exception()
+            return
+        for key, future in batch.items():
+            paper_data = found.get(key)
+            if paper_data is not None:
+                self._cache.put(key, paper_data)
+            if not future.done():
+                future.set_result(paper_data)
+
+    def _fetch(self, arxiv_ids: List[str]) -> Dict[str, Dict]:
+        metrics.increment("arxiv_resolver.requests")
+        search = arxiv.Search(id_list=arxiv_ids, max_results=len(arxiv_ids))
+        found = {}
+        for result in self.client.results(search):
+            # get_short_id() keeps the archive of old-style IDs (hep-th/...).
+            found[strip_version(result.get_short_id())] = result_to_paper_data(result)
+        return found
+
+
+arxiv_resolver = ArxivResolver()
@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+import bibtexparser
+from bibtexparser.customization import author, convert_to_unicode
+
+# This module is imported by process-pool workers, so it must stay free of
+# application imports (settings, database) and only deal in plain data.
+
+MONTHS = {
+    "jan": 1,
+    "feb": 2,
+    "mar": 3,
+    "apr": 4,
+    "may": 5,
+    "jun": 6,
+    "jul": 7,
+    "aug": 8,
+    "sep": 9,
+    "oct": 10,
+    "nov": 11,
+    "dec": 12,
+}
+
+# Blocks that define state for the entries after them rather than a paper.
+MACRO_BLOCKS = ("string", "preamble")
+
+
+def _customize(record: Dict) -> Dict:
+    # Both customizations must run; assigning them one after the other to
+    # parser.customization would silently keep only the last.
+    return author(convert_to_unicode(record))
+
+
+def parse_bibtex(bibtex_str: str) -> List[Dict]:
+    parser = bibtexparser.bparser.BibTexParser(common_strings=True)
+    parser.customization = _customize
+    return bibtexparser.loads(bibtex_str, parser=parser).entries
+
+
+def entry_to_paper_data(entry: Dict) -> Dict:
+    """Map a parsed BibTeX entry onto PaperCreate-style fields."""
+    paper_data = {
+        "title": entry.get("title"),
+        "url": entry.get("url"),
+        # The author customization splits authors into a list
+        "authors": entry.get("author", []),
+        # arXiv IDs are usually stored in the eprint field
+        "arxiv_id": entry.get("eprint"),
+        "summary": entry.get("abstract") or entry.get("note"),
+        "keywords": [
+            k.strip() for k in entry.get("keywords", "").split(",") if k.strip()
+        ],
+    }
+    if "year" in entry:
+        try:
+            month = MONTHS.get(entry.get("month", "jan").lower()[:3], 1)
+            paper_data["published_date"] = datetime(int(entry["year"]), month, 1)
+        except (ValueError, TypeError):
+            paper_data["published_date"] = datetime.now()
+    return paper_data
+
+
+def split_bibtex_entries(lines: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """
+    Group a stream of BibTeX lines into chunks of about `chunk_size` entries,
+    splitting only where a new entry starts, without reading the whole file.
+    @string and @preamble blocks are repeated at the top of every later chunk
+    so entries can still use the macros they define.
+    """
+    chunk: List[str] = []
+    macros: List[str] = []
+    entries = 0
+    in_macro = False
+    for line in lines:
+        stripped = line.lstrip()
+        if stripped.startswith("@"):
+            in_macro = stripped[1:].lower().startswith(MACRO_BLOCKS)
+            if not in_macro:
+                if entries == chunk_size:
+                    yield "".join(chunk)
+                    chunk, entries = list(macros), 0
+                entries += 1
+        if in_macro:
+            macros.append(line)
+        chunk.append(line)
+    if chunk:
+        yield "".join(chunk)
+
+
+def parse_bibtex_chunk(chunk: str) -> List[Dict]:
+    """Process-pool entry point: parse a chunk into picklable paper data."""
+    return [entry_to_paper_data(entry) for entry in parse_bibtex(chunk)]
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session, undefer
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.database import run_in_writer
+from app.db.models import Paper
+from app.services.ai_service import (
+    DEFAULT_MODEL,
+    EXTRACTIVE_MODEL,
+    PAPER_SUMMARY_INSTRUCTION,
+    AIService,
+)
+from app.services.extractive_summarizer import (
+    sentences_for_instruction,
+    summarize_extractive,
+)
+from app.services.summary_cache import summary_cache, summary_cache_key
+from app.services.text_chunking import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class EnrichmentService:
+    """
+    Replace the arXiv abstracts of newly ingested papers with AI summaries.
+    Abstracts are packed into batches that share one structured-output
+    request, at most `concurrency` requests run at once, and a run stops
+    scheduling work once `token_budget` estimated input tokens are spent.
+    Papers Gemini does not cover (no `ai_service`, failed batches, spent
+    budget) get an instant extractive summary, so digests always have one;
+    their abstract is kept, and with `ai_service` they stay pending.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        ai_service: Optional[AIService],
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        batch_max_tokens: Optional[int] = None,
+        token_budget: Optional[int] = None,
+    ):
+        self.db = db
+        self.ai_service = ai_service
+        self.concurrency = concurrency or settings.SUMMARY_CONCURRENCY
+        self.batch_size = batch_size or settings.SUMMARY_BATCH_SIZE
+        self.batch_max_tokens = batch_max_tokens or settings.SUMMARY_BATCH_MAX_TOKENS
+        self.token_budget = token_budget or settings.SUMMARY_TOKEN_BUDGET
+
+    def get_pending_papers(self, limit: int = 1000) -> List[Paper]:
+        """
+        Papers whose summary is still the abstract they were ingested with,
+        and, when Gemini is available, those with only an extractive preview.
+        """
+        pending = and_(Paper.summary_model.is_(None), Paper.summary.is_not(None))
+        if self.ai_service is not None:
+            pending = or_(
+                pending,
+                and_(
+                    Paper.summary_model == EXTRACTIVE_MODEL,
+                    Paper.abstract.is_not(None),
+                ),
+            )
+        return list(
+            self.db.scalars(
+                select(Paper)
+                .options(undefer(Paper.summary), undefer(Paper.abstract))
+                .where(pending)
+                .order_by(Paper.id)
+                .limit(limit)
+            )
+        )
+
+    def _plan_batches(self, papers: List[Paper]) -> List[List[Paper]]:
+        batches: List[List[Paper]] = []
+        batch: List[Paper] = []
+        batch_tokens = 0
+        spent = 0
+        for paper in papers:
+            abstract = paper.ingested_abstract
+            if not abstract or paper.summary_model not in (None, EXTRACTIVE_MODEL):
+                continue
+            tokens = estimate_tokens(abstract)
+            if spent + tokens > self.token_budget:
+                logger.info(
+                    f"Summary token budget of {self.token_budget} reached; "
+                    f"leaving the remaining papers for the next run."
+                )
+                break
+            if batch and (
+                len(batch) == self.batch_size
+                or batch_tokens + tokens > self.batch_max_tokens
+            ):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(paper)
+            batch_tokens += tokens
+            spent += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def _summarize_batch(
+        self, batch: List[Paper], semaphore: asyncio.Semaphore
+    ) -> List[Tuple[Paper, str]]:
+        async with semaphore:
+            try:
+                summaries = await self.ai_service.summarize_batch(
+                    [paper.ingested_abstract for paper in batch],
+                    model=DEFAULT_MODEL,
+                    length_instruction=PAPER_SUMMARY_INSTRUCTION,
+                )
+            except Exception as e:
+                # These papers fall back to an extractive preview.
+                logger.error(f"Error summarizing a batch of {len(batch)} papers: {e}")
+                metrics.increment("enrichment.batch_failed")
+                return []
+        metrics.increment("enrichment.batch_succeeded")
+        return list(zip(batch, summaries))
+
+    async def summarize_papers(self, papers: List[Paper]) -> int:
+        """Summarize `papers` in place and return how many were summarized."""
+        summarized: List[Tuple[Paper, str]] = []
+        batches = self._plan_batches(papers) if self.ai_service else []
+        if batches:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            results = await asyncio.gather(
+                *(self._summarize_batch(batch, semaphore) for batch in batches)
+            )
+            summarized = [pair for batch_result in results for pair in batch_result]
+
+            for paper, summary in summarized:
+                # Seed the on-demand cache with the same key summarize_paper uses.
+                await summary_cache.put(
+                    summary_cache_key(
+                        paper.ingested_abstract,
+                        DEFAULT_MODEL,
+                        PAPER_SUMMARY_INSTRUCTION,
+                    ),
+                    DEFAULT_MODEL,
+                    summary,
+                )
+            await run_in_writer(self._save, summarized, DEFAULT_MODEL)
+
+        done = {id(paper) for paper, _ in summarized}
+        previews = self.preview_papers(
+            [paper for paper in papers if id(paper) not in done]
+        )
+        await run_in_writer(self._save, previews, EXTRACTIVE_MODEL)
+        metrics.increment("enrichment.papers_summarized", len(summarized))
+        metrics.increment("enrichment.papers_previewed", len(previews))
+        return len(summarized) + len(previews)
+
+    def preview_papers(self, papers: List[Paper]) -> List[Tuple[Paper, str]]:
+        """Extractive summaries of the papers that still carry their abstract."""
+        max_sentences = sentences_for_instruction(PAPER_SUMMARY_INSTRUCTION)
+        return [
+            (paper, summarize_extractive(paper.summary, max_sentences))
+            for paper in papers
+            if paper.summary and not paper.summary_model
+        ]
+
+    def _save(self, summarized: List[Tuple[Paper, str]], model: str) -> None:
+        if not summarized:
+            return
+        for paper, summary in summarized:
+            paper.abstract = paper.ingested_abstract
+            paper.summary = summary
+            paper.summary_model = model
+        self.db.commit()
@@ -0,0 +1,133 @@
+import csv
+import io
+import json
+from typing import IO, Dict, Iterator, List, Optional
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.db.models import Paper
+from app.services.paper_service import PaperService
+
+# Output is flushed in chunks of roughly this many characters.
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+CSV_COLUMNS = [
+    "id",
+    "title",
+    "url",
+    "arxiv_id",
+    "published_date",
+    "authors",
+    "keywords",
+    "summary",
+]
+
+
+def _bibtex_escape(value: str) -> str:
+    # Unbalanced braces would break the entry; drop them rather than guess.
+    return value.replace("{", "").replace("}", "")
+
+
+def paper_to_bibtex(paper: Paper) -> str:
+    key = paper.arxiv_id or f"paper{paper.id}"
+    fields = {
+        "title": paper.title,
+        "author": " and ".join(author.name for author in paper.authors),
+        "year": str(paper.published_date.year) if paper.published_date else None,
+        "url": paper.url,
+        "eprint": paper.arxiv_id,
+        "keywords": ", ".join(keyword.name for keyword in paper.keywords),
+        "abstract": paper.summary,
+    }
+    lines = [f"@article{{{_bibtex_escape(key)},"]
+    for name, value in fields.items():
+        if value:
+            lines.append(f"  {name} = {{{_bibtex_escape(value)}}},")
+    lines.append("}\n\n")
+    return "\n".join(lines)
+
+
+def _paper_to_dict(paper: Paper) -> Dict:
+    return {
+        "id": paper.id,
+        "title": paper.title,
+        "url": paper.url,
+        "arxiv_id": paper.arxiv_id,
+        "published_date": paper.published_date.isoformat()
+        if paper.published_date
+        else None,
+        "authors": [author.name for author in paper.authors],
+        "keywords": [keyword.name for keyword in paper.keywords],
+        "summary": paper.summary,
+    }
+
+
+def paper_to_jsonl(paper: Paper) -> str:
+    return json.dumps(_paper_to_dict(paper), ensure_ascii=False) + "\n"
+
+
+def paper_to_csv(paper: Paper) -> str:
+    row = _paper_to_dict(paper)
+    row["authors"] = "; ".join(row["authors"])
+    row["keywords"] = "; ".join(row["keywords"])
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow([row[column] for column in CSV_COLUMNS])
+    return buffer.getvalue()
+
+
+def _csv_header() -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CSV_COLUMNS)
+    return buffer.getvalue()
+
+
+# format -> (media type, file extension, header, row serializer)
+EXPORT_FORMATS: Dict[str, tuple] = {
+    "bibtex": ("application/x-bibtex", "bib", "", paper_to_bibtex),
+    "jsonl": ("application/x-ndjson", "jsonl", "", paper_to_jsonl),
+    "csv": ("text/csv", "csv", _csv_header(), paper_to_csv),
+}
+
+
+class ExportService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.paper_service = PaperService(db)
+
+    def stream(
+        self,
+        export_format: str,
+        keyword: Optional[str] = None,
+        author: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Iterator[str]:
+        """
+        Serialize matching papers in `export_format`, yielding text chunks as
+        rows stream from the database so memory stays bounded.
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        _, _, header, serialize = EXPORT_FORMATS[export_format]
+
+        chunk: List[str] = [header] if header else []
+        size = len(header)
+        for paper in self.paper_service.iter_papers(
+            with_summary=True,
+            with_relations=True,
+            keyword=keyword,
+            author=author,
+            since=since,
+            until=until,
+        ):
+            row = serialize(paper)
+            chunk.append(row)
+            size += len(row)
+            if size >= EXPORT_CHUNK_SIZE:
+                yield "".join(chunk)
+                chunk, size = [], 0
+        if chunk:
+            yield "".join(chunk)
+
+    def write(self, fileobj: IO[str], export_format: str, **filters) -> None:
+        for chunk in self.stream(export_format, **filters):
+            fileobj.write(chunk)
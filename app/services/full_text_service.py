@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, UTC
+from typing import List, Optional, Tuple, Union
+import aiohttp
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.workers import run_in_process_pool
+from app.db.database import run_in_writer
+from app.db.models import Paper
+from app.services.pdf_cache import (
+    NotAPdfError,
+    PdfCache,
+    PdfTooLargeError,
+    pdf_cache,
+)
+from app.services.pdf_text import decompress_text, extract_compressed_text
+
+logger = logging.getLogger(__name__)
+
+
+def pdf_url(paper: Paper) -> str:
+    # arXiv papers are often saved with their abstract page URL.
+    if paper.arxiv_id:
+        return f"https://arxiv.org/pdf/{paper.arxiv_id}.pdf"
+    return paper.url
+
+
+class FullTextService:
+    """
+    Fetch the PDFs of papers, at most `concurrency` downloads at a time, into
+    the on-disk PDF cache, extract their text on the shared process pool and
+    store it zlib-compressed in papers.full_text. Failed papers are retried
+    with exponential backoff, up to FULL_TEXT_MAX_ATTEMPTS times; ones that
+    can never succeed (not a PDF, too large) are given up on at once.
+    """
+
+    # Retrying these cannot help: the URL serves the same content next time.
+    PERMANENT_ERRORS = (NotAPdfError, PdfTooLargeError)
+
+    def __init__(
+        self,
+        db: Session,
+        cache: Optional[PdfCache] = None,
+        concurrency: Optional[int] = None,
+    ):
+        self.db = db
+        self.cache = cache or pdf_cache
+        self.concurrency = concurrency or settings.PDF_DOWNLOAD_CONCURRENCY
+
+    def get_pending_papers(self, limit: int = 100) -> List[Paper]:
+        """Papers without full text that are not given up on or backing off."""
+        now = datetime.now(UTC).replace(tzinfo=None)
+        return list(
+            self.db.scalars(
+                select(Paper)
+                .where(
+                    Paper.pdf_sha256.is_(None),
+                    Paper.full_text_attempts < settings.FULL_TEXT_MAX_ATTEMPTS,
+                    or_(
+                        Paper.full_text_retry_at.is_(None),
+                        Paper.full_text_retry_at <= now,
+                    ),
+                )
+                .order_by(Paper.id)
+                .limit(limit)
+            )
+        )
+
+    def get_full_text(self, paper: Paper) -> Optional[str]:
+        """The stored text of `paper`, or None if it was never extracted."""
+        if paper.full_text is None:
+            return None
+        return decompress_text(paper.full_text)
+
+    async def fetch_papers(self, papers: List[Paper]) -> int:
+        """Fetch and extract the text of `papers`; returns how many succeeded."""
+        if not papers:
+            return 0
+        semaphore = asyncio.Semaphore(self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=settings.PDF_DOWNLOAD_TIMEOUT_SECONDS)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            results = await asyncio.gather(
+                *(self._fetch_paper(session, paper, semaphore) for paper in papers)
+            )
+        extracted = [result for result in results if isinstance(result[1], str)]
+        failed = [result for result in results if isinstance(result[1], Exception)]
+        await run_in_writer(self._save, extracted, failed)
+        metrics.increment("full_text.papers_extracted", len(extracted))
+        return len(extracted)
+
+    async def _fetch_paper(
+        self,
+        session: aiohttp.ClientSession,
+        paper: Paper,
+        semaphore: asyncio.Semaphore,
+    ) -> Union[Tuple[Paper, str, bytes], Tuple[Paper, Exception]]:
+        try:
+            digest = paper.pdf_sha256
+            path = self.cache.get(digest)
+            if path is None:
+                async with semaphore:
+                    digest = await self.cache.download(session, pdf_url(paper))
+                path = self.cache.path_for(digest)
+            full_text = await run_in_process_pool(extract_compressed_text, path)
+        except Exception as e:
+            logger.error(f"Error fetching the full text of paper {paper.id}: {e}")
+            metrics.increment("full_text.failed")
+            return paper, e
+        return paper, digest, full_text
+
+    def _save(
+        self,
+        extracted: List[Tuple[Paper, str, bytes]],
+        failed: List[Tuple[Paper, Exception]],
+    ) -> None:
+        if not extracted and not failed:
+            return
+        for paper, digest, full_text in extracted:
+            paper.pdf_sha256 = digest
+            paper.full_text = full_text
+        now = datetime.now(UTC).replace(tzinfo=None)
+        for paper, error in failed:
+            if isinstance(error, self.PERMANENT_ERRORS):
+                paper.full_text_attempts = settings.FULL_TEXT_MAX_ATTEMPTS
+                paper.full_text_retry_at = None
+                continue
+            paper.full_text_attempts = (paper.full_text_attempts or 0) + 1
+            backoff = settings.FULL_TEXT_RETRY_BACKOFF_SECONDS * 2 ** (
+                paper.full_text_attempts - 1
+            )
+            paper.full_text_retry_at = now + timedelta(seconds=backoff)
+        self.db.commit()
@@ -0,0 +1,252 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import func, select, union
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.database import run_in_writer, session_scope
+from app.db.models import (
+    Author,
+    Keyword,
+    Paper,
+    PaperAuthor,
+    PaperKeyword,
+    User,
+    UserAuthor,
+    UserKeyword,
+)
+
+logger = logging.getLogger(__name__)
+
+COMMANDS_TEXT = (
+    "*Available Commands:*\n"
+    "- `/논문-추가`: Add a new paper to your archive.\n"
+    "- `/논문-검색`: Search for papers in your archive.\n"
+    "- `/키워드-등록`: Subscribe to a keyword for new paper alerts."
+)
+
+
+def render_home(
+    slack_user_id: str,
+    keywords: List[str],
+    authors: List[str],
+    papers: List[Tuple[int, str, str]],
+    unread: int,
+) -> Dict:
+    """The App Home view for a user's subscriptions and recent matches."""
+    subscriptions = (
+        f"*구독 키워드:* {', '.join(keywords) or '없음'}\n"
+        f"*구독 저자:* {', '.join(authors) or '없음'}"
+    )
+    if papers:
+        recent = "\n".join(
+            f"• <{url}|{title}> (ID {paper_id})" for paper_id, title, url in papers
+        )
+    else:
+        recent = "아직 구독과 일치하는 논문이 없습니다."
+    return {
+        "type": "home",
+        "blocks": [
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"*Welcome to PaperWhale, <@{slack_user_id}>!* :whale:\n\nThis is your personal research assistant. You can use slash commands to manage papers, subscribe to keywords, and more.",
+                },
+            },
+            {"type": "divider"},
+            {"type": "section", "text": {"type": "mrkdwn", "text": subscriptions}},
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"*최근 논문* (새 논문 {unread}편)\n{recent}",
+                },
+            },
+            {"type": "divider"},
+            {"type": "section", "text": {"type": "mrkdwn", "text": COMMANDS_TEXT}},
+        ],
+    }
+
+
+class HomeService:
+    """Queries behind the App Home: subscriptions and matching papers."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def build_view(
+        self, slack_user_id: str, recent_limit: int
+    ) -> Tuple[Dict, Optional[int]]:
+        """
+        Render the user's home and return it with the newest matched paper ID
+        when the view shows unread papers, so the caller can mark them seen.
+        """
+        user = self.db.scalar(select(User).where(User.slack_user_id == slack_user_id))
+        if user is None:
+            return render_home(slack_user_id, [], [], [], 0), None
+
+        keywords = list(
+            self.db.scalars(
+                select(Keyword.name)
+                .join(UserKeyword, UserKeyword.keyword_id == Keyword.id)
+                .where(UserKeyword.user_id == user.id)
+                .order_by(Keyword.name)
+            )
+        )
+        authors = list(
+            self.db.scalars(
+                select(Author.name)
+                .join(UserAuthor, UserAuthor.author_id == Author.id)
+                .where(UserAuthor.user_id == user.id)
+                .order_by(Author.name)
+            )
+        )
+        matched = union(
+            select(PaperKeyword.paper_id)
+            .join(UserKeyword, UserKeyword.keyword_id == PaperKeyword.keyword_id)
+            .where(UserKeyword.user_id == user.id),
+            select(PaperAuthor.paper_id)
+            .join(UserAuthor, UserAuthor.author_id == PaperAuthor.author_id)
+            .where(UserAuthor.user_id == user.id),
+        ).subquery()
+        papers = [
+            tuple(row)
+            for row in self.db.execute(
+                select(Paper.id, Paper.title, Paper.url)
+                .where(Paper.id.in_(select(matched.c.paper_id)))
+                .order_by(Paper.id.desc())
+                .limit(recent_limit)
+            )
+        ]
+        unread = self.db.scalar(
+            select(func.count())
+            .select_from(matched)
+            .where(matched.c.paper_id > (user.home_seen_paper_id or 0))
+        )
+        view = render_home(slack_user_id, keywords, authors, papers, unread)
+        return view, (papers[0][0] if unread else None)
+
+    def subscribers_of(self, paper_ids: List[int]) -> List[str]:
+        """Users subscribed to a keyword or author of any of `paper_ids`."""
+        return list(
+            self.db.scalars(
+                union(
+                    select(User.slack_user_id)
+                    .join(UserKeyword, UserKeyword.user_id == User.id)
+                    .join(
+                        PaperKeyword, PaperKeyword.keyword_id == UserKeyword.keyword_id
+                    )
+                    .where(PaperKeyword.paper_id.in_(paper_ids)),
+                    select(User.slack_user_id)
+                    .join(UserAuthor, UserAuthor.user_id == User.id)
+                    .join(PaperAuthor, PaperAuthor.author_id == UserAuthor.author_id)
+                    .where(PaperAuthor.paper_id.in_(paper_ids)),
+                )
+            )
+        )
+
+    def mark_seen(self, slack_user_id: str, paper_id: int) -> None:
+        user = self.db.scalar(select(User).where(User.slack_user_id == slack_user_id))
+        if user is not None and (user.home_seen_paper_id or 0) < paper_id:
+            user.home_seen_paper_id = paper_id
+            self.db.commit()
+
+
+class HomeViewPublisher:
+    """
+    Publishes App Home views from a per-user cache of rendered views. A view
+    is re-rendered only after invalidate(), a view Slack already shows is not
+    published again, and a user's publishes are at least `debounce_seconds`
+    apart: opens arriving meanwhile share the one pending publish.
+    """
+
+    def __init__(
+        self,
+        debounce_seconds: Optional[float] = None,
+        recent_papers: Optional[int] = None,
+        max_users: Optional[int] = None,
+    ):
+        self.debounce_seconds = (
+            debounce_seconds
+            if debounce_seconds is not None
+            else settings.HOME_PUBLISH_DEBOUNCE_SECONDS
+        )
+        self.recent_papers = recent_papers or settings.HOME_RECENT_PAPERS
+        max_users = max_users or settings.HOME_CACHE_SIZE
+        self._views = LRUCache(max_users)
+        # slack_user_id -> (view, monotonic time it was published)
+        self._published = LRUCache(max_users)
+        self._publishing: Set[str] = set()
+        self._invalidations = 0
+
+    def invalidate(self, slack_user_id: str) -> None:
+        self._invalidations += 1
+        self._views.pop(slack_user_id)
+
+    def invalidate_for_papers(self, db: Session, paper_ids: List[int]) -> None:
+        """Invalidate the homes whose recent papers `paper_ids` now belong to."""
+        if not paper_ids:
+            return
+        if not len(self._views):
+            # Nothing cached to drop, but a render in flight may predate them.
+            self._invalidations += 1
+            return
+        for slack_user_id in HomeService(db).subscribers_of(paper_ids):
+            self.invalidate(slack_user_id)
+
+    def clear(self) -> None:
+        self._invalidations += 1
+        self._views.clear()
+        self._published.clear()
+
+    async def publish(self, client, slack_user_id: str) -> None:
+        if slack_user_id in self._publishing:
+            metrics.increment("home.publish_coalesced")
+            return
+        published = self._published.get(slack_user_id)
+        if published is not None and published[0] is self._views.get(slack_user_id):
+            metrics.increment("home.publish_skipped")
+            return
+
+        self._publishing.add(slack_user_id)
+        try:
+            if published is not None:
+                wait = published[1] + self.debounce_seconds - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            view = self._views.get(slack_user_id)
+            if view is None:
+                view = await self._render(slack_user_id)
+            await client.views_publish(user_id=slack_user_id, view=view)
+            self._published.put(slack_user_id, (view, time.monotonic()))
+            metrics.increment("home.published")
+        finally:
+            self._publishing.discard(slack_user_id)
+
+    async def _render(self, slack_user_id: str) -> Dict:
+        invalidations = self._invalidations
+        with session_scope(read_only=True) as db:
+            view, newest_paper_id = HomeService(db).build_view(
+                slack_user_id, self.recent_papers
+            )
+        # An invalidation during the queries may not be reflected in them.
+        if invalidations == self._invalidations:
+            self._views.put(slack_user_id, view)
+        if newest_paper_id is not None:
+            try:
+                await run_in_writer(self._mark_seen, slack_user_id, newest_paper_id)
+            except SQLAlchemyError as e:
+                logger.error(f"Error marking App Home papers as seen: {e}")
+        return view
+
+    def _mark_seen(self, slack_user_id: str, paper_id: int) -> None:
+        with session_scope() as db:
+            HomeService(db).mark_seen(slack_user_id, paper_id)
+
+
+home_views = HomeViewPublisher()
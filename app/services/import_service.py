@@ -0,0 +1,168 @@
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from pydantic import ValidationError
+from sqlalchemy import select, union
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.workers import PROCESS_POOL_WORKERS, run_in_process_pool
+from app.db.database import run_in_writer
+from app.db.identifiers import canonical_url, strip_version
+from app.db.models import Paper
+from app.db.schemas import BibtexImportResult, PaperCreate
+from app.services.bibtex_service import parse_bibtex_chunk, split_bibtex_entries
+from app.services.home_service import home_views
+from app.services.paper_service import PaperService
+
+logger = logging.getLogger(__name__)
+
+
+class BibtexImportService:
+    """
+    Import large BibTeX libraries. Chunks of entries are parsed on the shared
+    process pool while earlier chunks are written, so neither parsing nor the
+    file size ever stalls the event loop.
+    """
+
+    def __init__(self, db: Session, chunk_size: Optional[int] = None):
+        self.db = db
+        self.paper_service = PaperService(db)
+        self.chunk_size = chunk_size or settings.BIBTEX_IMPORT_CHUNK_SIZE
+        # Papers created earlier in this import, so duplicates within the
+        # file are caught without waiting for the database.
+        self._seen_urls: Set[str] = set()
+        self._seen_arxiv_ids: Set[str] = set()
+
+    async def import_lines(self, lines: Iterable[str]) -> BibtexImportResult:
+        result = BibtexImportResult()
+        in_flight: List[Tuple[str, asyncio.Future]] = []
+        # Bound the number of parsed-but-unwritten chunks so memory stays flat
+        # no matter how large the upload is.
+        max_in_flight = PROCESS_POOL_WORKERS * 2
+
+        for chunk in split_bibtex_entries(lines, self.chunk_size):
+            in_flight.append(
+                (
+                    chunk,
+                    asyncio.ensure_future(
+                        run_in_process_pool(parse_bibtex_chunk, chunk)
+                    ),
+                )
+            )
+            if len(in_flight) >= max_in_flight:
+                await self._write_chunk(*in_flight.pop(0), result)
+        while in_flight:
+            await self._write_chunk(*in_flight.pop(0), result)
+
+        logger.info(
+            f"BibTeX import finished: {result.created} created, "
+            f"{result.duplicates} duplicates, {result.invalid} invalid."
+        )
+        return result
+
+    async def _write_chunk(
+        self, chunk: str, parsed: asyncio.Future, result: BibtexImportResult
+    ) -> None:
+        try:
+            papers_data = await parsed
+        except Exception as e:
+            logger.warning(f"Failed to parse BibTeX chunk, retrying by entry: {e}")
+            papers_data = await self._parse_entries(chunk, result)
+        await run_in_writer(self._write_batch, papers_data, result)
+
+    async def _parse_entries(
+        self, chunk: str, result: BibtexImportResult
+    ) -> List[Dict]:
+        """Parse a chunk one entry at a time so a bad entry only loses itself."""
+        entries = list(split_bibtex_entries(chunk.splitlines(keepends=True), 1))
+        outcomes = await asyncio.gather(
+            *(run_in_process_pool(parse_bibtex_chunk, entry) for entry in entries),
+            return_exceptions=True,
+        )
+        papers_data = []
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to parse BibTeX entry: {outcome}")
+                result.invalid += 1
+            else:
+                papers_data.extend(outcome)
+        return papers_data
+
+    def _to_paper_create(self, paper_data: Dict) -> Optional[PaperCreate]:
+        url = paper_data.get("url")
+        if not url and paper_data.get("arxiv_id"):
+            url = f"https://arxiv.org/pdf/{paper_data['arxiv_id']}.pdf"
+        try:
+            return PaperCreate(
+                title=paper_data.get("title"),
+                url=url,
+                summary=paper_data.get("summary"),
+                published_date=paper_data.get("published_date"),
+                arxiv_id=paper_data.get("arxiv_id"),
+                author_names=paper_data.get("authors", []),
+                keyword_names=paper_data.get("keywords", []),
+            )
+        except ValidationError:
+            return None
+
+    def _write_batch(self, papers_data: List[Dict], result: BibtexImportResult):
+        candidates = []
+        for paper_data in papers_data:
+            paper_create = self._to_paper_create(paper_data)
+            if paper_create is None:
+                result.invalid += 1
+            else:
+                candidates.append(paper_create)
+        if not candidates:
+            return
+
+        # One lookup per batch instead of one per entry, on the canonical
+        # identifiers so /abs/ vs /pdf/ links and versions still match.
+        urls = {canonical_url(str(p.url)) for p in candidates}
+        arxiv_ids = {strip_version(p.arxiv_id) for p in candidates if p.arxiv_id}
+        for url, arxiv_id in self.db.execute(
+            union(
+                select(Paper.canonical_url, Paper.arxiv_id).where(
+                    Paper.canonical_url.in_(urls)
+                ),
+                select(Paper.canonical_url, Paper.arxiv_id).where(
+                    Paper.arxiv_id.in_(arxiv_ids)
+                ),
+            )
+        ):
+            self._seen_urls.add(url)
+            if arxiv_id:
+                self._seen_arxiv_ids.add(arxiv_id)
+
+        created = []
+        for paper_create in candidates:
+            url = canonical_url(str(paper_create.url))
+            arxiv_id = (
+                strip_version(paper_create.arxiv_id) if paper_create.arxiv_id else None
+            )
+            if (
+                url in self._seen_urls
+                or arxiv_id in self._seen_arxiv_ids
+                or self.paper_service.find_near_duplicate(
+                    paper_create.title, paper_create.summary
+                )
+            ):
+                result.duplicates += 1
+                continue
+            try:
+                # A savepoint keeps a concurrent insert of the same paper from
+                # rolling back the whole batch.
+                with self.db.begin_nested():
+                    created.append(
+                        self.paper_service.create_paper(paper_create, commit=False)
+                    )
+            except IntegrityError:
+                result.duplicates += 1
+                continue
+            self._seen_urls.add(url)
+            if arxiv_id:
+                self._seen_arxiv_ids.add(arxiv_id)
+            result.created += 1
+        self.db.commit()
+        home_views.invalidate_for_papers(self.db, [paper.id for paper in created])
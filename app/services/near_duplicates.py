@@ -0,0 +1,120 @@
+import re
+import threading
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+
+# MinHash signatures of title and abstract shingles, bucketed by LSH bands,
+# so likely near-duplicates of a paper are found without comparing it to
+# every other one. Kept free of application imports so the migration that
+# backfills signatures can use it as well.
+
+NUM_PERMUTATIONS = 128
+# 4 rows per band: pairs at 0.7 Jaccard collide with P > 0.999 and at the
+# default NEAR_DUPLICATE_THRESHOLD of 0.8 with P ≈ 1; ~0.87 at 0.5, so
+# candidates are always verified against their signatures.
+BANDS = 32
+SHINGLE_SIZE = 5
+# Shorter texts ("", "N/A", a one-word title) get no signature: they carry
+# too little to tell papers apart, and would all match each other.
+MIN_SHINGLES = 16
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_NON_WORD = re.compile(r"[^\w]+")
+
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Character `size`-grams of the text with case and punctuation removed."""
+    normalized = _NON_WORD.sub(" ", text.lower()).strip()
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i : i + size] for i in range(len(normalized) - size + 1)}
+
+
+def minhash_signature(
+    title: str, abstract: Optional[str] = None
+) -> Optional[np.ndarray]:
+    """
+    NUM_PERMUTATIONS 32-bit minimum hashes of the paper's shingles, or None
+    if it has fewer than MIN_SHINGLES of them.
+    """
+    grams = shingles(f"{title} {abstract or ''}")
+    if len(grams) < MIN_SHINGLES:
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(gram.encode("utf-8")) for gram in grams),
+        dtype=np.uint64,
+        count=len(grams),
+    )
+    # (a * x + b) mod p for every permutation and shingle; x < 2^32 and
+    # a < 2^61 may overflow uint64, which only permutes the hash further.
+    permuted = (np.outer(_A, hashes) + _B[:, None]) % np.uint64(_PRIME)
+    return (permuted.min(axis=1) & np.uint64(_MAX_HASH)).astype(np.uint32)
+
+
+def signature_to_bytes(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def signature_from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4")
+
+
+def estimated_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity: the share of matching minimum hashes."""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+class LSHIndex:
+    """
+    Maps each LSH band of a signature to the papers that share it. Only ids
+    are kept, not signatures, so memory grows by BANDS small entries per
+    paper; candidates are verified against the stored signatures.
+    """
+
+    def __init__(self, bands: int = BANDS):
+        self.bands = bands
+        self._buckets: List[Dict[bytes, Set[int]]] = [
+            defaultdict(set) for _ in range(bands)
+        ]
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def _band_keys(self, signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        for band, rows in enumerate(np.array_split(signature, self.bands)):
+            yield band, rows.tobytes()
+
+    def add(self, paper_id: int, signature: np.ndarray) -> None:
+        with self._lock:
+            for band, key in self._band_keys(signature):
+                self._buckets[band][key].add(paper_id)
+
+    def remove(self, paper_id: int, signature: np.ndarray) -> None:
+        with self._lock:
+            for band, key in self._band_keys(signature):
+                bucket = self._buckets[band].get(key)
+                if bucket is not None:
+                    bucket.discard(paper_id)
+                    if not bucket:
+                        del self._buckets[band][key]
+
+    def candidates(self, signature: np.ndarray) -> Set[int]:
+        found: Set[int] = set()
+        with self._lock:
+            for band, key in self._band_keys(signature):
+                found |= self._buckets[band].get(key, set())
+        return found
+
+    def clear(self) -> None:
+        with self._lock:
+            for buckets in self._buckets:
+                buckets.clear()
+            self.loaded = False
+
+
+near_duplicate_index = LSHIndex()
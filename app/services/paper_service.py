@@ -1,72 +1,290 @@
-import arxiv
-from sqlalchemy.orm import Session
+import base64
+import logging
+from sqlalchemy.orm import Session, selectinload, undefer
+from app.core.config import settings
+from app.db.identifiers import canonical_url, parse_arxiv_id, strip_version
 from app.db.models import Paper, Author, Keyword, PaperAuthor, PaperKeyword
 from app.db.schemas import PaperCreate, PaperUpdate
-from app.services.ai_service import AIService
+from app.services.ai_service import (
+    DEFAULT_MODEL,
+    EXTRACTIVE_MODEL,
+    FALLBACK_ERRORS,
+    PAPER_SUMMARY_INSTRUCTION,
+    AIService,
+)
+from app.services.arxiv_resolver import arxiv_resolver
+from app.services.full_text_service import FullTextService
+from app.services.near_duplicates import (
+    estimated_similarity,
+    minhash_signature,
+    near_duplicate_index,
+    signature_from_bytes,
+    signature_to_bytes,
+)
+from app.services.summary_cache import summary_cache
 from app.services.user_service import UserService
-from typing import List, Optional
-from sqlalchemy import or_
+from typing import Awaitable, Callable, Iterator, List, NamedTuple, Optional, Tuple
+from sqlalchemy import Row, and_, insert, or_, select, union
+from app.db.upsert import get_or_create_id
 from datetime import datetime, UTC
 
+logger = logging.getLogger(__name__)
+
+
+# Lean projection for listing and duplicate checks; never touches the summary.
+PAPER_HEADER_COLUMNS = (
+    Paper.id,
+    Paper.title,
+    Paper.url,
+    Paper.arxiv_id,
+    Paper.published_date,
+)
+
+
+async def fetch_arxiv_abstract(arxiv_id: str) -> str:
+    paper_data = await arxiv_resolver.resolve(arxiv_id)
+    if paper_data is None:
+        raise ValueError(f"Could not find paper with arXiv ID: {arxiv_id}")
+    return paper_data["summary"]
+
+
+async def generate_summary(
+    api_key: Optional[str],
+    text: str,
+    read_abstract: Callable[[], Awaitable[str]],
+) -> Tuple[str, str]:
+    """
+    (model, summary) for a paper: Gemini summarizes `text` when there is a
+    key, otherwise the local summarizer reads the abstract. Touches no
+    database, so callers need not hold a session while it runs.
+    """
+    ai_service = AIService(api_key)
+    if api_key:
+        try:
+            summary = await summary_cache.get_or_generate(
+                text,
+                lambda: ai_service.summarize_text(
+                    text, length_instruction=PAPER_SUMMARY_INSTRUCTION
+                ),
+                model=DEFAULT_MODEL,
+                length_instruction=PAPER_SUMMARY_INSTRUCTION,
+            )
+            return DEFAULT_MODEL, summary
+        except FALLBACK_ERRORS as e:
+            logger.warning(f"Gemini unavailable, summarizing locally: {e}")
+    # No key, or Gemini is down: an instant local summary beats none.
+    # TextRank is quadratic in sentences, so it reads the abstract.
+    summary = await ai_service.summarize_text(
+        await read_abstract(),
+        model=EXTRACTIVE_MODEL,
+        length_instruction=PAPER_SUMMARY_INSTRUCTION,
+    )
+    return EXTRACTIVE_MODEL, summary
+
+
+class SummaryInputs(NamedTuple):
+    """What summarizing a paper needs from the database."""
+
+    # An existing summary to return as is, or None to generate one.
+    summary: Optional[str]
+    api_key: Optional[str]
+    full_text: Optional[str]
+    # The abstract the paper was ingested or imported with, if any.
+    abstract: Optional[str]
+    arxiv_id: Optional[str]
+
+
+async def generate_paper_summary(inputs: SummaryInputs) -> Tuple[str, str]:
+    """(model, summary) from `inputs`; touches no database."""
+
+    async def read_abstract() -> str:
+        if inputs.abstract:
+            return inputs.abstract
+        if not inputs.arxiv_id:
+            raise ValueError("Paper does not have an arXiv ID.")
+        return await fetch_arxiv_abstract(inputs.arxiv_id)
+
+    text = inputs.full_text or await read_abstract()
+    return await generate_summary(inputs.api_key, text, read_abstract)
+
 
 class PaperService:
     def __init__(self, db: Session):
         self.db = db
         self.user_service = UserService(db)
+        self.full_text_service = FullTextService(db)
 
     async def summarize_paper(self, paper_id: int, slack_user_id: str) -> Optional[str]:
-        paper = self.get_paper(paper_id)
-        if not paper:
+        inputs = self.load_summary_inputs(paper_id, slack_user_id)
+        if inputs is None:
             return None
+        if inputs.summary is not None:
+            return inputs.summary
+        model, summary = await generate_paper_summary(inputs)
+        self.save_summary(paper_id, summary, model)
+        return summary
 
-        if (
-            paper.summary and len(paper.summary) > 10
-        ):  # Don't re-summarize if already summarized
-            return paper.summary
+    def load_summary_inputs(
+        self, paper_id: int, slack_user_id: str
+    ) -> Optional[SummaryInputs]:
+        """The database half of summarize_paper; None if there is no such paper."""
+        paper = self.get_paper(paper_id, with_summary=True)
+        if not paper:
+            return None
 
         user = self.user_service.get_or_create_user(slack_user_id)
-        if not user.api_key:
-            raise ValueError("User API key is not set.")
-
-        if not paper.arxiv_id:
-            raise ValueError("Paper does not have an arXiv ID.")
-
-        try:
-            search = arxiv.Search(id_list=[paper.arxiv_id])
-            paper_result = next(search.results())
-            text_to_summarize = paper_result.summary
-        except StopIteration:
-            raise ValueError(f"Could not find paper with arXiv ID: {paper.arxiv_id}")
-
-        ai_service = AIService(user.api_key)
-        summary = await ai_service.summarize_text(
-            text_to_summarize, length_instruction="in three sentences"
+        # Papers imported with their abstract have a summary but no model.
+        # An extractive summary is upgraded once the user has an API key.
+        abstract = paper.ingested_abstract
+        reusable = (
+            paper.summary
+            and paper.summary_model
+            and (
+                paper.summary_model != EXTRACTIVE_MODEL
+                or not user.api_key
+                # Previewed before abstracts were kept: nothing to upgrade from.
+                or not (abstract or paper.arxiv_id)
+            )
+        )
+        return SummaryInputs(
+            summary=paper.summary if reusable else None,
+            api_key=user.api_key,
+            # Gemini reads the whole paper when its text has been extracted.
+            full_text=(
+                self.full_text_service.get_full_text(paper) if user.api_key else None
+            ),
+            abstract=abstract,
+            arxiv_id=paper.arxiv_id,
         )
-        paper.summary = summary
-        self.db.commit()
-        return summary
 
-    def get_paper(self, paper_id: int) -> Optional[Paper]:
-        return self.db.query(Paper).filter(Paper.id == paper_id).first()
+    def save_summary(self, paper_id: int, summary: str, model: str) -> None:
+        paper = self.get_paper(paper_id, with_summary=True)
+        if paper is not None:
+            paper.abstract = paper.ingested_abstract
+            paper.summary = summary
+            paper.summary_model = model
+            self.db.commit()
+
+    def get_paper(self, paper_id: int, with_summary: bool = False) -> Optional[Paper]:
+        query = self.db.query(Paper).filter(Paper.id == paper_id)
+        if with_summary:
+            query = query.options(undefer(Paper.summary), undefer(Paper.abstract))
+        return query.first()
 
     def get_papers(self, skip: int = 0, limit: int = 100) -> List[Paper]:
         return self.db.query(Paper).offset(skip).limit(limit).all()
 
+    def get_papers_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        with_summary: bool = False,
+    ) -> Tuple[List[Paper], Optional[str]]:
+        """
+        Return up to `limit` papers ordered by (published_date, id) after the
+        given cursor, plus the cursor for the next page (None on the last).
+        Each page is a single index range scan, however deep it is.
+        """
+        stmt = (
+            select(Paper)
+            .options(selectinload(Paper.authors), selectinload(Paper.keywords))
+            .order_by(Paper.published_date, Paper.id)
+            .limit(limit)
+        )
+        if with_summary:
+            stmt = stmt.options(undefer(Paper.summary))
+        papers = list(self.db.scalars(_after_cursor(stmt, cursor)))
+        return papers, _next_cursor(papers, limit)
+
+    def get_paper_headers_page(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Row], Optional[str]]:
+        """Like get_papers_page, but returns PAPER_HEADER_COLUMNS rows only."""
+        stmt = (
+            select(*PAPER_HEADER_COLUMNS)
+            .order_by(Paper.published_date, Paper.id)
+            .limit(limit)
+        )
+        rows = list(self.db.execute(_after_cursor(stmt, cursor)))
+        return rows, _next_cursor(rows, limit)
+
+    def iter_papers(
+        self,
+        batch_size: int = 1000,
+        with_summary: bool = False,
+        with_relations: bool = False,
+        keyword: Optional[str] = None,
+        author: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Iterator[Paper]:
+        """
+        Stream papers in (published_date, id) order through a server-side
+        cursor, `batch_size` rows at a time, optionally filtered by keyword,
+        author and published date range. Each batch is expunged from the
+        session once the next one is requested, so memory stays bounded;
+        don't rely on lazy loading after iterating past a row.
+        """
+        stmt = (
+            select(Paper)
+            .order_by(Paper.published_date, Paper.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if with_summary:
+            stmt = stmt.options(undefer(Paper.summary))
+        if with_relations:
+            stmt = stmt.options(
+                selectinload(Paper.authors), selectinload(Paper.keywords)
+            )
+        if keyword:
+            stmt = stmt.where(Paper.keywords.any(Keyword.name == keyword))
+        if author:
+            stmt = stmt.where(Paper.authors.any(Author.name == author))
+        if since:
+            stmt = stmt.where(Paper.published_date >= since)
+        if until:
+            stmt = stmt.where(Paper.published_date < until)
+
+        for batch in self.db.scalars(stmt).partitions():
+            yield from batch
+            related = set()
+            for paper in batch:
+                if with_relations:
+                    related.update(paper.authors)
+                    related.update(paper.keywords)
+                self.db.expunge(paper)
+            for obj in related:
+                if obj in self.db:
+                    self.db.expunge(obj)
+
     def get_paper_by_url_or_arxiv_id(
         self, url: Optional[str] = None, arxiv_id: Optional[str] = None
-    ) -> Optional[Paper]:
-        if not url and not arxiv_id:
-            return None
-        query = self.db.query(Paper)
+    ) -> Optional[Row]:
+        """
+        Duplicate check; returns a PAPER_HEADER_COLUMNS row, not a Paper.
+        Both identifiers are canonicalized, and each is its own unique index
+        probe, combined with UNION rather than OR so neither becomes a scan.
+        """
+        arxiv_id = arxiv_id or (parse_arxiv_id(url) if url else None)
+        probes = []
         if url:
-            query = query.filter(Paper.url == url)
+            probes.append(
+                select(*PAPER_HEADER_COLUMNS).where(
+                    Paper.canonical_url == canonical_url(str(url))
+                )
+            )
         if arxiv_id:
-            query = query.filter(
-                or_(query.expression.clauses, Paper.arxiv_id == arxiv_id)
+            probes.append(
+                select(*PAPER_HEADER_COLUMNS).where(
+                    Paper.arxiv_id == strip_version(arxiv_id)
+                )
             )
-        return query.first()
+        if not probes:
+            return None
+        stmt = probes[0] if len(probes) == 1 else union(*probes)
+        return self.db.execute(stmt.limit(1)).first()
 
-    def create_paper(self, paper: PaperCreate) -> Paper:
+    def create_paper(self, paper: PaperCreate, commit: bool = True) -> Paper:
         db_paper = Paper(
             title=paper.title,
             url=str(paper.url),  # Convert HttpUrl to string
@@ -76,14 +294,22 @@ class PaperService:
             else datetime.now(UTC),
             arxiv_id=paper.arxiv_id,
         )
+        signature = minhash_signature(paper.title, paper.summary)
+        if signature is not None:
+            db_paper.minhash = signature_to_bytes(signature)
         self.db.add(db_paper)
         self.db.flush()  # Flush to get the paper ID before adding relationships
+        if signature is not None:
+            # Rolled-back ids stay in the index; lookups verify against the table.
+            near_duplicate_index.add(db_paper.id, signature)
 
         self._add_authors_to_paper(db_paper, paper.author_names)
         self._add_keywords_to_paper(db_paper, paper.keyword_names)
 
-        self.db.commit()
-        self.db.refresh(db_paper)
+        # Bulk callers commit once per batch instead of once per paper.
+        if commit:
+            self.db.commit()
+            self.db.refresh(db_paper)
         return db_paper
 
     def update_paper(self, paper_id: int, paper: PaperUpdate) -> Optional[Paper]:
@@ -116,15 +342,72 @@ class PaperService:
     def delete_paper(self, paper_id: int):
         db_paper = self.db.query(Paper).filter(Paper.id == paper_id).first()
         if db_paper:
+            if db_paper.minhash:
+                near_duplicate_index.remove(
+                    paper_id, signature_from_bytes(db_paper.minhash)
+                )
             self.db.delete(db_paper)
             self.db.commit()
             return True
         return False
 
+    def find_near_duplicate(
+        self,
+        title: str,
+        abstract: Optional[str] = None,
+        threshold: Optional[float] = None,
+    ) -> Optional[Row]:
+        """
+        The stored paper most similar to this title and abstract, if their
+        estimated Jaccard similarity reaches `threshold`, as a
+        PAPER_HEADER_COLUMNS row. Only the LSH candidates are compared.
+        """
+        if threshold is None:
+            threshold = settings.NEAR_DUPLICATE_THRESHOLD
+        signature = minhash_signature(title, abstract)
+        if signature is None:
+            return None
+        self._load_near_duplicate_index()
+        candidates = near_duplicate_index.candidates(signature)
+        if not candidates:
+            return None
+        best, best_similarity = None, threshold
+        for row in self.db.execute(
+            select(*PAPER_HEADER_COLUMNS, Paper.minhash).where(
+                Paper.id.in_(candidates), Paper.minhash.is_not(None)
+            )
+        ):
+            similarity = estimated_similarity(
+                signature, signature_from_bytes(row.minhash)
+            )
+            if similarity >= best_similarity:
+                best, best_similarity = row, similarity
+        return best
+
+    def _load_near_duplicate_index(self) -> None:
+        if near_duplicate_index.loaded:
+            return
+        # Built once per process from the stored signatures; create_paper
+        # keeps it current from then on.
+        stmt = (
+            select(Paper.id, Paper.minhash)
+            .where(Paper.minhash.is_not(None))
+            .execution_options(yield_per=1000)
+        )
+        for paper_id, minhash in self.db.execute(stmt):
+            near_duplicate_index.add(paper_id, signature_from_bytes(minhash))
+        near_duplicate_index.loaded = True
+
     def search_papers(self, query: str) -> List[Paper]:
         search_query = f"%{query.lower()}%"
         return (
             self.db.query(Paper)
+            # Search results render the summary and every author and keyword.
+            .options(
+                undefer(Paper.summary),
+                selectinload(Paper.authors),
+                selectinload(Paper.keywords),
+            )
             .join(Paper.authors, isouter=True)
             .join(Paper.keywords, isouter=True)
             .filter(
@@ -139,28 +422,65 @@ class PaperService:
             .all()
         )
 
-    def _get_or_create_author(self, author_name: str) -> Author:
-        author = self.db.query(Author).filter(Author.name == author_name).first()
-        if not author:
-            author = Author(name=author_name)
-            self.db.add(author)
-            self.db.flush()
-        return author
-
-    def _get_or_create_keyword(self, keyword_name: str) -> Keyword:
-        keyword = self.db.query(Keyword).filter(Keyword.name == keyword_name).first()
-        if not keyword:
-            keyword = Keyword(name=keyword_name)
-            self.db.add(keyword)
-            self.db.flush()
-        return keyword
+    def _get_or_create_author_id(self, author_name: str) -> int:
+        return get_or_create_id(self.db, Author, name=author_name)
+
+    def _get_or_create_keyword_id(self, keyword_name: str) -> int:
+        return get_or_create_id(self.db, Keyword, name=keyword_name)
 
     def _add_authors_to_paper(self, db_paper: Paper, author_names: List[str]):
-        for name in author_names:
-            author = self._get_or_create_author(name)
-            db_paper.authors.append(author)
+        # dict.fromkeys drops repeated names while keeping their order
+        author_ids = [
+            self._get_or_create_author_id(name) for name in dict.fromkeys(author_names)
+        ]
+        if author_ids:
+            self.db.execute(
+                insert(PaperAuthor),
+                [{"paper_id": db_paper.id, "author_id": i} for i in author_ids],
+            )
+            self.db.expire(db_paper, ["authors"])
 
     def _add_keywords_to_paper(self, db_paper: Paper, keyword_names: List[str]):
-        for name in keyword_names:
-            keyword = self._get_or_create_keyword(name)
-            db_paper.keywords.append(keyword)
+        keyword_ids = [
+            self._get_or_create_keyword_id(name)
+            for name in dict.fromkeys(keyword_names)
+        ]
+        if keyword_ids:
+            self.db.execute(
+                insert(PaperKeyword),
+                [{"paper_id": db_paper.id, "keyword_id": i} for i in keyword_ids],
+            )
+            self.db.expire(db_paper, ["keywords"])
+
+
+def _after_cursor(stmt, cursor: Optional[str]):
+    if not cursor:
+        return stmt
+    published_date, paper_id = decode_cursor(cursor)
+    return stmt.where(
+        or_(
+            Paper.published_date > published_date,
+            and_(Paper.published_date == published_date, Paper.id > paper_id),
+        )
+    )
+
+
+def _next_cursor(rows: list, limit: int) -> Optional[str]:
+    if len(rows) < limit:
+        return None
+    return encode_cursor(rows[-1].published_date, rows[-1].id)
+
+
+def encode_cursor(published_date: datetime, paper_id: int) -> str:
+    raw = f"{published_date.isoformat()}|{paper_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        published_date, paper_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        )
+        return datetime.fromisoformat(published_date), int(paper_id)
+    except ValueError as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor}") from e
@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from typing import Optional
+import aiohttp
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+PDF_MAGIC = b"%PDF-"
+
+
+class PdfTooLargeError(Exception):
+    pass
+
+
+class NotAPdfError(Exception):
+    pass
+
+
+class PdfCache:
+    """
+    Downloaded PDFs stored on disk under the SHA-256 of their content, so a
+    file linked from several papers is kept once. The directory holds at most
+    `max_bytes`; the least recently used files are evicted first, using the
+    file modification time, which is bumped on every hit, as the access time.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_file_bytes: Optional[int] = None,
+    ):
+        self.directory = directory or settings.PDF_CACHE_DIR
+        self.max_bytes = max_bytes or settings.PDF_CACHE_MAX_BYTES
+        self.max_file_bytes = max_file_bytes or settings.PDF_MAX_BYTES
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.directory, f"{digest}.pdf")
+
+    def get(self, digest: Optional[str]) -> Optional[str]:
+        """Path of the cached PDF with this digest, or None if it is not cached."""
+        if not digest:
+            return None
+        path = self.path_for(digest)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            metrics.increment("pdf_cache.miss")
+            return None
+        metrics.increment("pdf_cache.hit")
+        return path
+
+    async def download(self, session: aiohttp.ClientSession, url: str) -> str:
+        """
+        Stream the PDF at `url` into the cache and return its digest. The body
+        is hashed while it is written, so it is never held in memory.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    async for chunk in response.content.iter_chunked(
+                        DOWNLOAD_CHUNK_SIZE
+                    ):
+                        if size == 0 and not chunk.startswith(PDF_MAGIC):
+                            raise NotAPdfError(f"{url} did not return a PDF")
+                        size += len(chunk)
+                        if size > self.max_file_bytes:
+                            raise PdfTooLargeError(
+                                f"{url} is larger than {self.max_file_bytes} bytes"
+                            )
+                        digest.update(chunk)
+                        f.write(chunk)
+            key = digest.hexdigest()
+            path = self.path_for(key)
+            if os.path.exists(path):
+                os.utime(path)
+            else:
+                os.replace(tmp_path, path)
+                self._add(size)
+            metrics.increment("pdf_cache.downloaded_bytes", size)
+            return key
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _add(self, size: int) -> None:
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan()
+            else:
+                self._size += size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pdf"):
+                yield entry
+
+    def _scan(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self._size <= self.max_bytes:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            self._size -= size
+            metrics.increment("pdf_cache.evicted")
+        logger.info(f"PDF cache trimmed to {self._size} bytes.")
+
+
+pdf_cache = PdfCache()
@@ -0,0 +1,31 @@
+import zlib
+from pypdf import PdfReader
+
+# This module is imported by process-pool workers, so it must stay free of
+# application imports (settings, database) and only deal in plain data.
+
+COMPRESSION_LEVEL = 6
+
+
+def extract_pdf_text(path: str) -> str:
+    """Text of every page of the PDF at `path`, pages separated by blank lines."""
+    reader = PdfReader(path)
+    pages = []
+    for page in reader.pages:
+        text = (page.extract_text() or "").strip()
+        if text:
+            pages.append(text)
+    return "\n\n".join(pages)
+
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def decompress_text(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def extract_compressed_text(path: str) -> bytes:
+    """Process-pool entry point: extract and compress in the worker."""
+    return compress_text(extract_pdf_text(path))
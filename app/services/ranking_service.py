@@ -0,0 +1,99 @@
+import logging
+from collections import defaultdict
+from typing import Dict, List
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.metrics import metrics
+from app.db.models import Author, Keyword, Paper, User, UserAuthor, UserKeyword
+from app.services.vector_index import embed_text
+
+logger = logging.getLogger(__name__)
+
+# Profiles and papers are only ever compared within one run, so the vectors
+# can be much wider than the persistent index's, which keeps hash collisions
+# between unrelated terms rare.
+RANKING_DIM = 1024
+
+
+class RankingService:
+    """
+    Decide which new papers each user is notified about. A user's profile is
+    the hashed term vector of their subscribed keywords and authors; every
+    candidate paper of a run is scored against every profile in a single
+    matrix product, and each user keeps their `top_k` best matches.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def user_profiles(self, slack_user_ids: List[str]) -> np.ndarray:
+        terms: Dict[str, List[str]] = defaultdict(list)
+        for slack_user_id, name in self.db.execute(
+            select(User.slack_user_id, Keyword.name)
+            .join(UserKeyword, UserKeyword.user_id == User.id)
+            .join(Keyword, Keyword.id == UserKeyword.keyword_id)
+            .where(User.slack_user_id.in_(slack_user_ids))
+        ):
+            terms[slack_user_id].append(name)
+        for slack_user_id, name in self.db.execute(
+            select(User.slack_user_id, Author.name)
+            .join(UserAuthor, UserAuthor.user_id == User.id)
+            .join(Author, Author.id == UserAuthor.author_id)
+            .where(User.slack_user_id.in_(slack_user_ids))
+        ):
+            terms[slack_user_id].append(name)
+        return np.stack(
+            [
+                # Each term is its own "title" so terms do not form bigrams.
+                sum(
+                    (embed_text(term, None, RANKING_DIM) for term in terms[user]),
+                    np.zeros(RANKING_DIM, dtype=np.float32),
+                )
+                for user in slack_user_ids
+            ]
+        )
+
+    def top_papers(
+        self, candidates: Dict[str, List[Paper]], top_k: int
+    ) -> Dict[str, List[Paper]]:
+        """
+        The best `top_k` of each user's candidate papers, most relevant
+        first. Users with no more than `top_k` candidates keep them all in
+        arrival order, and a run where nobody has more is not scored.
+        """
+        deduped = {
+            user: list({paper.id: paper for paper in papers}.values())
+            for user, papers in candidates.items()
+        }
+        if all(len(papers) <= top_k for papers in deduped.values()):
+            return deduped
+
+        papers = list({p.id: p for ps in deduped.values() for p in ps}.values())
+        column = {paper.id: i for i, paper in enumerate(papers)}
+        users = list(deduped)
+        paper_vectors = np.stack(
+            [
+                embed_text(
+                    paper.title,
+                    " ".join([paper.summary or ""] + [a.name for a in paper.authors]),
+                    RANKING_DIM,
+                )
+                for paper in papers
+            ]
+        )
+        # One product for the whole run: users x papers relevance.
+        scores = self.user_profiles(users) @ paper_vectors.T
+        allowed = np.zeros(scores.shape, dtype=bool)
+        for row, user in enumerate(users):
+            allowed[row, [column[p.id] for p in deduped[user]]] = True
+        scores[~allowed] = -np.inf
+        ranked = np.argsort(-scores, axis=1, kind="stable")[:, :top_k]
+
+        delivered = {}
+        for row, user in enumerate(users):
+            delivered[user] = [papers[i] for i in ranked[row] if allowed[row, i]]
+        skipped = sum(map(len, deduped.values())) - sum(map(len, delivered.values()))
+        metrics.increment("ranking.notifications_skipped", skipped)
+        logger.info(f"Ranking kept the top {top_k}; {skipped} notifications skipped.")
+        return delivered
@@ -5,6 +5,19 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def result_to_paper_data(result: arxiv.Result) -> Dict:
+    """Map an arXiv result onto PaperCreate-style fields."""
+    return {
+        "title": result.title,
+        "url": result.pdf_url,
+        "summary": result.summary,
+        "authors": [author.name for author in result.authors],
+        "published_date": result.published,
+        # Not entry_id.split("/"): old-style IDs keep their archive (hep-th/...)
+        "arxiv_id": result.get_short_id(),
+    }
+
+
 class ScholarService:
     def __init__(self):
         self.client = arxiv.Client()
@@ -26,16 +39,7 @@ class ScholarService:
         papers_data = []
         try:
             for result in self.client.results(search):
-                papers_data.append(
-                    {
-                        "title": result.title,
-                        "url": result.pdf_url,
-                        "summary": result.summary,
-                        "authors": [author.name for author in result.authors],
-                        "published_date": result.published,
-                        "arxiv_id": result.entry_id.split("/")[-1],
-                    }
-                )
+                papers_data.append(result_to_paper_data(result))
         except Exception as e:
             logger.error(f"Error searching arXiv for keyword '{keyword}': {e}")
             # Depending on the desired fault tolerance, you might want to re-raise,
@@ -0,0 +1,82 @@
+import logging
+from typing import List, Optional, Tuple
+import numpy as np
+from sqlalchemy import Row, select
+from sqlalchemy.orm import Session
+from app.core.metrics import metrics
+from app.db.models import Paper
+from app.services.paper_service import PAPER_HEADER_COLUMNS
+from app.services.vector_index import VectorIndex, embed_text, vector_index
+
+logger = logging.getLogger(__name__)
+
+SYNC_BATCH_SIZE = 1000
+
+
+class SimilarPaperService:
+    """
+    "More like this" over the vector index. Papers added since the last call
+    are embedded and appended first, so the index never needs a rebuild.
+    """
+
+    def __init__(self, db: Session, index: Optional[VectorIndex] = None):
+        self.db = db
+        self.index = index if index is not None else vector_index
+
+    def sync(self) -> int:
+        """Index every paper newer than the newest indexed one."""
+        added = 0
+        with self.index.write_lock:
+            stmt = (
+                select(Paper.id, Paper.title, Paper.summary)
+                .where(Paper.id > self.index.max_id)
+                .order_by(Paper.id)
+                .execution_options(yield_per=SYNC_BATCH_SIZE)
+            )
+            for batch in self.db.execute(stmt).partitions():
+                vectors = np.stack(
+                    [
+                        embed_text(title, summary, self.index.dim)
+                        for _, title, summary in batch
+                    ]
+                )
+                self.index.append([paper_id for paper_id, _, _ in batch], vectors)
+                added += len(batch)
+        if added:
+            logger.info(f"Added {added} papers to the vector index.")
+            metrics.increment("vector_index.papers_added", added)
+        return added
+
+    def similar_to_paper(
+        self, paper_id: int, limit: int = 10
+    ) -> Optional[List[Tuple[Row, float]]]:
+        """Papers most like `paper_id`, or None if there is no such paper."""
+        self.sync()
+        query = self.index.vector_for(paper_id)
+        if query is None:
+            row = self.db.execute(
+                select(Paper.title, Paper.summary).where(Paper.id == paper_id)
+            ).first()
+            if row is None:
+                return None
+            query = embed_text(row.title, row.summary, self.index.dim)
+        return self._headers(self.index.search(query, limit, exclude=paper_id))
+
+    def similar_to_text(self, text: str, limit: int = 10) -> List[Tuple[Row, float]]:
+        self.sync()
+        query = embed_text(text, None, self.index.dim)
+        return self._headers(self.index.search(query, limit))
+
+    def _headers(self, hits: List[Tuple[int, float]]) -> List[Tuple[Row, float]]:
+        if not hits:
+            return []
+        rows = {
+            row.id: row
+            for row in self.db.execute(
+                select(*PAPER_HEADER_COLUMNS).where(
+                    Paper.id.in_([paper_id for paper_id, _ in hits])
+                )
+            )
+        }
+        # Deleted papers stay in the index until it is rebuilt; skip them.
+        return [(rows[pid], score) for pid, score in hits if pid in rows]
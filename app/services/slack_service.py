@@ -1,22 +1,123 @@
+import asyncio
+import time
+from typing import Optional
+import aiohttp
 from slack_sdk.web.async_client import AsyncWebClient  # Changed to AsyncWebClient
 from slack_sdk.errors import SlackApiError
+from app.core.cache import LRUCache
 from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+_client: Optional[AsyncWebClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+# Shared by every SlackService, as user ID -> (value, monotonic expiry):
+# the DM channel ID, and the users.info "user" object. Failed lookups are
+# cached too (the user ID itself, or None) so a missing scope or a bad user
+# costs one failing call per SLACK_NEGATIVE_CACHE_TTL_SECONDS, not per post.
+_dm_channels = LRUCache(settings.SLACK_DM_CHANNEL_CACHE_SIZE)
+_user_info = LRUCache(settings.SLACK_USER_INFO_CACHE_SIZE)
+
+_MISSING = object()
+
+
+def _cached(cache: LRUCache, key: str):
+    entry = cache.get(key)
+    if entry is None or entry[1] <= time.monotonic():
+        return _MISSING
+    return entry[0]
+
+
+def _cache(cache: LRUCache, key: str, value, ttl: float) -> None:
+    cache.put(key, (value, time.monotonic() + ttl))
+
+
+def get_slack_client() -> AsyncWebClient:
+    """
+    The process-wide Slack Web API client. Without a session slack_sdk opens
+    a new aiohttp session, and so a new TLS connection, for every call; this
+    one keeps up to SLACK_HTTP_POOL_SIZE connections alive instead. Must be
+    called on the event loop that will use it.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop or _client.session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=settings.SLACK_HTTP_POOL_SIZE,
+            keepalive_timeout=settings.SLACK_HTTP_KEEPALIVE_SECONDS,
+        )
+        _client = AsyncWebClient(
+            token=settings.SLACK_BOT_TOKEN,
+            session=aiohttp.ClientSession(connector=connector),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_slack_client() -> None:
+    global _client, _client_loop
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _client.session.close()
+    _client, _client_loop = None, None
+
 
 class SlackService:
-    def __init__(self):
-        self.client = AsyncWebClient(token=settings.SLACK_BOT_TOKEN)
+    def __init__(self, client: Optional[AsyncWebClient] = None):
+        self.client = client if client is not None else get_slack_client()
+
+    async def open_dm(self, user_id: str) -> str:
+        """The user's DM channel, opened once and then served from cache."""
+        channel = _cached(_dm_channels, user_id)
+        if channel is not _MISSING:
+            return channel
+        try:
+            response = await self.client.conversations_open(users=user_id)
+        except SlackApiError as e:
+            logger.error(f"Error opening DM with {user_id}: {e.response['error']}")
+            # chat.postMessage still accepts the user ID itself.
+            _cache(
+                _dm_channels,
+                user_id,
+                user_id,
+                settings.SLACK_NEGATIVE_CACHE_TTL_SECONDS,
+            )
+            return user_id
+        channel = response["channel"]["id"]
+        # DM channel IDs never change.
+        _cache(_dm_channels, user_id, channel, float("inf"))
+        return channel
+
+    async def get_user_info(self, user_id: str) -> Optional[dict]:
+        """users.info for `user_id`, cached for SLACK_USER_INFO_TTL_SECONDS."""
+        info = _cached(_user_info, user_id)
+        if info is not _MISSING:
+            return info
+        try:
+            response = await self.client.users_info(user=user_id)
+        except SlackApiError as e:
+            logger.error(f"Error looking up user {user_id}: {e.response['error']}")
+            _cache(_user_info, user_id, None, settings.SLACK_NEGATIVE_CACHE_TTL_SECONDS)
+            return None
+        _cache(
+            _user_info, user_id, response["user"], settings.SLACK_USER_INFO_TTL_SECONDS
+        )
+        return response["user"]
+
+    def is_known_inactive(self, user_id: str) -> bool:
+        """True if a cached users.info says the account is deactivated."""
+        info = _cached(_user_info, user_id)
+        return info is not _MISSING and info is not None and bool(info.get("deleted"))
 
-    async def send_message(self, channel: str, text: str, blocks: list = None):
+    async def send_message(self, channel: str, text: str, blocks: list = None) -> bool:
         try:
             await self.client.chat_postMessage(
                 channel=channel, text=text, blocks=blocks
             )
         except SlackApiError as e:
             logger.error(f"Error sending message to Slack: {e.response['error']}")
+            return False
+        return True
 
     async def send_new_paper_notification(
         self,
@@ -74,6 +175,15 @@ class SlackService:
                 ],
             },
         ]
-        await self.send_message(
-            channel=user_id, text=f"새로운 논문: {paper_title}", blocks=blocks
+        if self.is_known_inactive(user_id):
+            # Deactivated accounts would fail every post of the fan-out.
+            return
+        sent = await self.send_message(
+            channel=await self.open_dm(user_id),
+            text=f"새로운 논문: {paper_title}",
+            blocks=blocks,
         )
+        if not sent:
+            # Only a failed post is worth a lookup; a deactivated account is
+            # then skipped for the rest of the fan-out.
+            await self.get_user_info(user_id)
@@ -0,0 +1,164 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta, UTC
+from typing import Awaitable, Callable, Dict, Optional
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.database import run_in_writer, session_scope
+from app.db.models import SummaryCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+def summary_cache_key(text: str, model: str, length_instruction: str = "") -> str:
+    """Content address of a summary: identical inputs share one entry."""
+    digest = hashlib.sha256()
+    for part in (model, length_instruction, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """
+    Summaries keyed by summary_cache_key(), kept in a small in-process LRU in
+    front of the summary_cache table so every worker and restart shares them.
+    Entries expire after `ttl_seconds`; the table keeps at most `max_entries`
+    rows, dropping the oldest first. Concurrent requests for the same key
+    share a single generation.
+    """
+
+    # Once the table is full it is pruned to this fraction of max_entries,
+    # so the oldest rows are deleted in batches rather than on every put.
+    PRUNE_TO = 0.9
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        memory_size: Optional[int] = None,
+    ):
+        self.ttl = timedelta(seconds=ttl_seconds or settings.SUMMARY_CACHE_TTL_SECONDS)
+        self.max_entries = max_entries or settings.SUMMARY_CACHE_MAX_ENTRIES
+        self._memory = LRUCache(memory_size or settings.SUMMARY_CACHE_MEMORY_SIZE)
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        # Rows in the table as far as this process knows; counted once, then
+        # kept up to date by _store (other writers make it approximate).
+        self._row_count: Optional[int] = None
+
+    async def get_or_generate(
+        self,
+        text: str,
+        generate: Callable[[], Awaitable[str]],
+        model: str,
+        length_instruction: str = "",
+    ) -> str:
+        key = summary_cache_key(text, model, length_instruction)
+        summary = await self.get(key)
+        if summary is not None:
+            metrics.increment("summary_cache.hit")
+            return summary
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            metrics.increment("summary_cache.coalesced")
+            # shield() so one waiter being cancelled does not cancel the rest.
+            return await asyncio.shield(in_flight)
+
+        metrics.increment("summary_cache.miss")
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            summary = await generate()
+            await self.put(key, model, summary)
+            future.set_result(summary)
+            return summary
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved in case there are none.
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def get(self, key: str) -> Optional[str]:
+        cached = self._memory.get(key)
+        if cached is not None:
+            summary, created_at = cached
+            if not self._expired(created_at):
+                return summary
+            self._memory.pop(key)
+
+        try:
+            # Off the event loop, like the writes.
+            return await asyncio.to_thread(self._load, key)
+        except SQLAlchemyError as e:
+            # A cache failure must never block summarization.
+            logger.error(f"Error reading summary cache: {e}")
+            return None
+
+    def _load(self, key: str) -> Optional[str]:
+        with session_scope(read_only=True) as db:
+            entry = db.get(SummaryCacheEntry, key)
+            if entry is None or self._expired(entry.created_at):
+                return None
+            self._memory.put(key, (entry.summary, entry.created_at))
+            return entry.summary
+
+    async def put(self, key: str, model: str, summary: str) -> None:
+        created_at = datetime.now(UTC).replace(tzinfo=None)
+        self._memory.put(key, (summary, created_at))
+        try:
+            await run_in_writer(self._store, key, model, summary, created_at)
+        except SQLAlchemyError as e:
+            logger.error(f"Error writing summary cache: {e}")
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+        self._row_count = None
+
+    def _expired(self, created_at: datetime) -> bool:
+        return created_at < datetime.now(UTC).replace(tzinfo=None) - self.ttl
+
+    def _store(self, key: str, model: str, summary: str, created_at: datetime) -> None:
+        with session_scope() as db:
+            if self._row_count is None:
+                self._row_count = db.scalar(
+                    select(func.count()).select_from(SummaryCacheEntry)
+                )
+            is_new = db.get(SummaryCacheEntry, key) is None
+            db.merge(
+                SummaryCacheEntry(
+                    key=key, model=model, summary=summary, created_at=created_at
+                )
+            )
+            db.flush()
+            expired = db.execute(
+                delete(SummaryCacheEntry).where(
+                    SummaryCacheEntry.created_at < created_at - self.ttl
+                )
+            ).rowcount
+            self._row_count += int(is_new) - max(expired or 0, 0)
+            # Size bound: prune to the newest PRUNE_TO share of max_entries.
+            if self._row_count > self.max_entries:
+                keep = max(1, int(self.max_entries * self.PRUNE_TO))
+                oldest = (
+                    select(SummaryCacheEntry.key)
+                    .order_by(SummaryCacheEntry.created_at.desc())
+                    .offset(keep)
+                )
+                pruned = db.execute(
+                    delete(SummaryCacheEntry).where(SummaryCacheEntry.key.in_(oldest))
+                ).rowcount
+                self._row_count -= max(pruned or 0, 0)
+            db.commit()
+
+
+summary_cache = SummaryCache()
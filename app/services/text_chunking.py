@@ -0,0 +1,55 @@
+import re
+from typing import List
+
+# Markdown headings and numbered section titles ("2 Related Work",
+# "3.1 Setup") that start a new section in papers and notes.
+_SECTION_BREAK = re.compile(r"\n(?=#{1,6} |\d+(?:\.\d+)*\.? +[A-Z])")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?。])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English prose.
+    return len(text) // 4 + 1
+
+
+def _hard_split(text: str, max_tokens: int) -> List[str]:
+    width = max_tokens * 4
+    return [text[i : i + width] for i in range(0, len(text), width)]
+
+
+def _split(text: str, max_tokens: int, separators: List[re.Pattern]) -> List[str]:
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    if not separators:
+        return _hard_split(text, max_tokens)
+
+    separator, finer = separators[0], separators[1:]
+    pieces: List[str] = []
+    for part in separator.split(text):
+        if part.strip():
+            pieces.extend(_split(part, max_tokens, finer))
+
+    # Greedily pack adjacent pieces back together up to the budget.
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current}\n\n{piece}" if current else piece
+        if current and estimate_tokens(candidate) > max_tokens:
+            chunks.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Split `text` into chunks of at most about `max_tokens` tokens, preferring
+    section boundaries, then paragraphs, then sentences.
+    """
+    return _split(
+        text.strip(), max_tokens, [_SECTION_BREAK, _PARAGRAPH_BREAK, _SENTENCE_BREAK]
+    )
@@ -1,5 +1,7 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.db import models
+from app.db.upsert import get_or_create_id
 
 
 class UserService:
@@ -7,17 +9,16 @@ class UserService:
         self.db = db
 
     def get_or_create_user(self, slack_user_id: str) -> models.User:
-        user = (
-            self.db.query(models.User)
-            .filter(models.User.slack_user_id == slack_user_id)
-            .first()
+        user = self.db.scalar(
+            select(models.User).where(models.User.slack_user_id == slack_user_id)
         )
-        if not user:
-            user = models.User(slack_user_id=slack_user_id)
-            self.db.add(user)
-            self.db.commit()
-            self.db.refresh(user)
-        return user
+        if user is not None:
+            return user
+        # Commit the insert at once: callers may await network calls next, and
+        # an open write transaction would hold SQLite's write lock meanwhile.
+        user_id = get_or_create_id(self.db, models.User, slack_user_id=slack_user_id)
+        self.db.commit()
+        return self.db.get(models.User, user_id)
 
     def update_api_key(self, slack_user_id: str, api_key: str) -> models.User:
         user = self.get_or_create_user(slack_user_id)
@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 from app.db.models import UserKeyword, UserAuthor, Keyword, Author
+from app.services.home_service import home_views
 from app.services.user_service import UserService
+from app.db.upsert import get_or_create_id, insert_ignore_returning_id
 from typing import List, Optional
 
 
@@ -13,28 +15,19 @@ class UserSubscriptionService:
         self, slack_user_id: str, keyword_name: str
     ) -> Optional[UserKeyword]:
         user = self.user_service.get_or_create_user(slack_user_id)
-        keyword = self.db.query(Keyword).filter(Keyword.name == keyword_name).first()
-        if not keyword:
-            keyword = Keyword(name=keyword_name)
-            self.db.add(keyword)
-            self.db.flush()
-
-        user_keyword = (
-            self.db.query(UserKeyword)
-            .filter(
-                UserKeyword.user_id == user.id, UserKeyword.keyword_id == keyword.id
-            )
-            .first()
+        keyword_id = get_or_create_id(self.db, Keyword, name=keyword_name)
+        user_keyword_id = insert_ignore_returning_id(
+            self.db,
+            UserKeyword.__table__,
+            {"user_id": user.id, "keyword_id": keyword_id},
+            ["user_id", "keyword_id"],
         )
+        self.db.commit()
+        home_views.invalidate(slack_user_id)
 
-        if user_keyword:
+        if user_keyword_id is None:
             return None  # Already subscribed
-
-        new_user_keyword = UserKeyword(user_id=user.id, keyword_id=keyword.id)
-        self.db.add(new_user_keyword)
-        self.db.commit()
-        self.db.refresh(new_user_keyword)
-        return new_user_keyword
+        return self.db.get(UserKeyword, user_keyword_id)
 
     def unsubscribe_keyword(self, slack_user_id: str, keyword_name: str) -> bool:
         user = self.user_service.get_or_create_user(slack_user_id)
@@ -53,6 +46,7 @@ class UserSubscriptionService:
         if user_keyword:
             self.db.delete(user_keyword)
             self.db.commit()
+            home_views.invalidate(slack_user_id)
             return True
         return False
 
@@ -64,26 +58,19 @@ class UserSubscriptionService:
         self, slack_user_id: str, author_name: str
     ) -> Optional[UserAuthor]:
         user = self.user_service.get_or_create_user(slack_user_id)
-        author = self.db.query(Author).filter(Author.name == author_name).first()
-        if not author:
-            author = Author(name=author_name)
-            self.db.add(author)
-            self.db.flush()
-
-        user_author = (
-            self.db.query(UserAuthor)
-            .filter(UserAuthor.user_id == user.id, UserAuthor.author_id == author.id)
-            .first()
+        author_id = get_or_create_id(self.db, Author, name=author_name)
+        user_author_id = insert_ignore_returning_id(
+            self.db,
+            UserAuthor.__table__,
+            {"user_id": user.id, "author_id": author_id},
+            ["user_id", "author_id"],
         )
+        self.db.commit()
+        home_views.invalidate(slack_user_id)
 
-        if user_author:
+        if user_author_id is None:
             return None  # Already subscribed
-
-        new_user_author = UserAuthor(user_id=user.id, author_id=author.id)
-        self.db.add(new_user_author)
-        self.db.commit()
-        self.db.refresh(new_user_author)
-        return new_user_author
+        return self.db.get(UserAuthor, user_author_id)
 
     def unsubscribe_author(self, slack_user_id: str, author_name: str) -> bool:
         user = self.user_service.get_or_create_user(slack_user_id)
@@ -100,6 +87,7 @@ class UserSubscriptionService:
         if user_author:
             self.db.delete(user_author)
             self.db.commit()
+            home_views.invalidate(slack_user_id)
             return True
         return False
 
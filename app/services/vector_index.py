@@ -0,0 +1,139 @@
+import logging
+import os
+import re
+import threading
+import zlib
+from collections import Counter
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from app.core.config import settings
+from app.services.extractive_summarizer import STOPWORDS
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[^\W_]{2,}")
+
+
+def embed_text(title: str, abstract: Optional[str], dim: int) -> np.ndarray:
+    """
+    Hashed term vector of a paper: words and word bigrams of the title
+    (counted twice) and abstract are hashed into `dim` signed buckets with
+    sublinear term frequency, then L2-normalized. Needs no model or corpus
+    statistics, so vectors never have to be recomputed.
+    """
+    terms: Counter = Counter()
+    for text, weight in ((title, 2), (abstract or "", 1)):
+        words = [w for w in _WORD.findall(text.lower()) if w not in STOPWORDS]
+        for term in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            terms[term] += weight
+    vector = np.zeros(dim, dtype=np.float32)
+    for term, count in terms.items():
+        h = zlib.crc32(term.encode("utf-8"))
+        sign = 1.0 if h & 0x80000000 else -1.0
+        vector[h % dim] += sign * (1.0 + np.log(count))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class VectorIndex:
+    """
+    Unit vectors of papers in two append-only files, memory-mapped for search:
+    ids.i64 holds paper ids in increasing order and vectors.f32 the matching
+    rows. Opening the index maps the files as they are, so a restart needs no
+    rebuild; a row is only visible once its id has been written.
+    """
+
+    def __init__(self, directory: Optional[str] = None, dim: Optional[int] = None):
+        self.directory = directory or settings.VECTOR_INDEX_DIR
+        self.dim = dim or settings.VECTOR_INDEX_DIM
+        self._ids_path = os.path.join(self.directory, "ids.i64")
+        self._vectors_path = os.path.join(self.directory, "vectors.f32")
+        self._ids = np.empty(0, dtype=np.int64)
+        self._vectors = np.empty((0, self.dim), dtype=np.float32)
+        self._opened = False
+        # Held by writers for a whole sync, so two syncs never append twice.
+        self.write_lock = threading.Lock()
+        self._map_lock = threading.Lock()
+
+    def _open(self) -> None:
+        with self._map_lock:
+            if self._opened:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            for path in (self._ids_path, self._vectors_path):
+                open(path, "ab").close()
+            row_bytes = self.dim * np.dtype(np.float32).itemsize
+            count = min(
+                os.path.getsize(self._ids_path) // 8,
+                os.path.getsize(self._vectors_path) // row_bytes,
+            )
+            # Drop the tail of an append that was interrupted half way.
+            os.truncate(self._ids_path, count * 8)
+            os.truncate(self._vectors_path, count * row_bytes)
+            self._remap(count)
+            self._opened = True
+
+    def _remap(self, count: int) -> None:
+        if count == 0:
+            return
+        self._ids = np.memmap(self._ids_path, np.int64, "r", shape=(count,))
+        self._vectors = np.memmap(
+            self._vectors_path, np.float32, "r", shape=(count, self.dim)
+        )
+
+    def __len__(self) -> int:
+        self._open()
+        return len(self._ids)
+
+    @property
+    def max_id(self) -> int:
+        self._open()
+        return int(self._ids[-1]) if len(self._ids) else 0
+
+    def append(self, paper_ids: Sequence[int], vectors: np.ndarray) -> None:
+        """Append rows; ids must be larger than every id already indexed."""
+        if not len(paper_ids):
+            return
+        self._open()
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with open(self._vectors_path, "ab") as f:
+            f.write(vectors.tobytes())
+        with open(self._ids_path, "ab") as f:
+            f.write(np.asarray(paper_ids, dtype=np.int64).tobytes())
+        with self._map_lock:
+            self._remap(len(self._ids) + len(paper_ids))
+
+    def vector_for(self, paper_id: int) -> Optional[np.ndarray]:
+        self._open()
+        ids = self._ids
+        position = int(np.searchsorted(ids, paper_id))
+        if position < len(ids) and ids[position] == paper_id:
+            return np.array(self._vectors[position])
+        return None
+
+    def search(
+        self, query: np.ndarray, k: int, exclude: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """The `k` (paper id, cosine similarity) pairs closest to `query`."""
+        self._open()
+        ids, vectors = self._ids, self._vectors
+        if not len(ids) or not np.any(query):
+            return []
+        scores = vectors @ query.astype(np.float32)
+        if exclude is not None:
+            position = int(np.searchsorted(ids, exclude))
+            if position < len(ids) and ids[position] == exclude:
+                scores[position] = -np.inf
+        k = min(k, len(scores))
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+    def clear(self) -> None:
+        with self._map_lock:
+            self._ids = np.empty(0, dtype=np.int64)
+            self._vectors = np.empty((0, self.dim), dtype=np.float32)
+            self._opened = False
+
+
+vector_index = VectorIndex()
@@ -0,0 +1,168 @@
+import json
+import threading
+import pytest
+from contextlib import contextmanager
+from datetime import datetime
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.routes import papers
+from app.db.database import get_read_db
+from app.db.models import Base
+from app.db.schemas import PaperCreate
+from app.services.paper_service import PaperService
+from app.services.vector_index import VectorIndex
+
+engine = create_engine(
+    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def client():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    app = FastAPI()
+    app.include_router(papers.router)
+    app.dependency_overrides[get_read_db] = lambda: db
+    try:
+        yield TestClient(app), db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_list_papers_pages_with_cursor(client):
+    test_client, db = client
+    for day in (1, 2, 3):
+        PaperService(db).create_paper(
+            PaperCreate(
+                title=f"Paper {day}",
+                url=f"http://example.com/{day}",
+                published_date=datetime(2023, 1, day),
+                author_names=["Alice"],
+            )
+        )
+
+    response = test_client.get("/papers", params={"limit": 2})
+    assert response.status_code == 200
+    body = response.json()
+    assert [p["title"] for p in body["items"]] == ["Paper 1", "Paper 2"]
+    assert body["items"][0]["authors"][0]["name"] == "Alice"
+
+    response = test_client.get(
+        "/papers", params={"limit": 2, "cursor": body["next_cursor"]}
+    )
+    body = response.json()
+    assert [p["title"] for p in body["items"]] == ["Paper 3"]
+    assert body["next_cursor"] is None
+
+
+def test_list_papers_invalid_cursor(client):
+    test_client, _ = client
+    response = test_client.get("/papers", params={"cursor": "bogus"})
+    assert response.status_code == 400
+
+
+def test_list_paper_headers(client):
+    test_client, db = client
+    PaperService(db).create_paper(
+        PaperCreate(title="Lean", url="http://lean.com", summary="Skipped")
+    )
+
+    response = test_client.get("/papers/headers")
+
+    assert response.status_code == 200
+    item = response.json()["items"][0]
+    assert item["title"] == "Lean"
+    assert "summary" not in item
+
+
+def test_export_papers_streams_jsonl(client):
+    test_client, db = client
+    PaperService(db).create_paper(
+        PaperCreate(
+            title="Exported",
+            url="http://export.com/paper",
+            keyword_names=["PL"],
+        )
+    )
+
+    @contextmanager
+    def _session_scope(read_only=False):
+        yield db
+
+    with patch("app.api.routes.papers.session_scope", _session_scope):
+        response = test_client.get(
+            "/papers/export", params={"format": "jsonl", "keyword": "PL"}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert json.loads(response.text.splitlines()[0])["title"] == "Exported"
+
+
+def test_export_papers_rejects_unknown_format(client):
+    test_client, _ = client
+    response = test_client.get("/papers/export", params={"format": "xml"})
+    assert response.status_code == 422
+
+
+def test_import_papers_from_raw_body(client):
+    test_client, db = client
+    threads = []
+
+    @contextmanager
+    def _session_scope(read_only=False):
+        threads.append(threading.current_thread().name)
+        yield db
+
+    bibtex = (
+        "@article{a,\n  title = {Imported},\n  url = {http://import.com/a}\n}\n"
+        "@article{b,\n  title = {Imported},\n  url = {http://import.com/a}\n}\n"
+    )
+    with patch("app.db.database.session_scope", _session_scope):
+        response = test_client.post("/papers/import", content=bibtex.encode())
+
+    assert response.status_code == 200
+    assert response.json() == {"created": 1, "duplicates": 1, "invalid": 0}
+    # The session is opened off the event loop, where the writes run.
+    assert threads[0].startswith("db-writer")
+
+
+def test_similar_papers_routes(client, tmp_path):
+    test_client, db = client
+    service = PaperService(db)
+    first = service.create_paper(
+        PaperCreate(
+            title="Gradual Typing",
+            url="http://example.com/gradual",
+            summary="Sound gradual type systems with blame.",
+        )
+    )
+    service.create_paper(
+        PaperCreate(
+            title="Blame for Gradual Types",
+            url="http://example.com/blame",
+            summary="Blame tracking in gradual type systems.",
+        )
+    )
+
+    with patch(
+        "app.services.similar_paper_service.vector_index",
+        VectorIndex(str(tmp_path), dim=64),
+    ):
+        response = test_client.get(f"/papers/{first.id}/similar")
+        assert response.status_code == 200
+        body = response.json()
+        assert [p["title"] for p in body] == ["Blame for Gradual Types"]
+        assert 0 < body[0]["score"] <= 1
+
+        response = test_client.get("/papers/similar", params={"q": "gradual typing"})
+        assert response.json()[0]["title"] == "Gradual Typing"
+
+        assert test_client.get("/papers/999/similar").status_code == 404
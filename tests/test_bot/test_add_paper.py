@@ -1,11 +1,19 @@
 import pytest
+from contextlib import contextmanager
+from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.db.models import Base, User, Paper
 from app.services.paper_service import PaperService
 from app.services.user_service import UserService
-from app.bot.actions import lazy_process_add_paper_submission
+from app.db.schemas import PaperCreate
+from app.bot.actions import (
+    ack_add_paper_submission,
+    lazy_process_add_paper_submission,
+    process_add_paper_submission,
+    register_actions,
+)
 
 # Setup a test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -39,6 +47,22 @@ def user_service(db_session):
     return UserService(db_session)
 
 
+@pytest.fixture(autouse=True)
+def services(db_session, paper_service, user_service):
+    """Every session the listener opens is the test session and its services."""
+
+    @contextmanager
+    def _session_scope(read_only=False):
+        yield db_session
+
+    with (
+        patch("app.bot.actions.session_scope", _session_scope),
+        patch("app.bot.actions.PaperService", return_value=paper_service),
+        patch("app.bot.actions.UserService", return_value=user_service),
+    ):
+        yield
+
+
 @pytest.fixture
 def mock_slack_context():
     client = MagicMock()
@@ -102,9 +126,7 @@ async def test_add_paper_with_bibtex_only(
         patch("app.services.paper_service.PaperService", return_value=paper_service),
         patch("app.services.user_service.UserService", return_value=user_service),
     ):
-        await lazy_process_add_paper_submission(
-            body, client, logger, db_session, paper_service, user_service
-        )
+        await lazy_process_add_paper_submission(body, client, logger)
 
     # Assertions
     client.chat_postMessage.assert_called_once_with(
@@ -171,9 +193,7 @@ async def test_add_paper_with_manual_input_only(
         patch("app.services.paper_service.PaperService", return_value=paper_service),
         patch("app.services.user_service.UserService", return_value=user_service),
     ):
-        await lazy_process_add_paper_submission(
-            body, client, logger, db_session, paper_service, user_service
-        )
+        await lazy_process_add_paper_submission(body, client, logger)
 
     client.chat_postMessage.assert_called_once_with(
         channel="U123", text="Paper 'Manual Paper' successfully added!"
@@ -245,9 +265,7 @@ async def test_add_paper_with_bibtex_and_manual_override(
         patch("app.services.paper_service.PaperService", return_value=paper_service),
         patch("app.services.user_service.UserService", return_value=user_service),
     ):
-        await lazy_process_add_paper_submission(
-            body, client, logger, db_session, paper_service, user_service
-        )
+        await lazy_process_add_paper_submission(body, client, logger)
 
     client.chat_postMessage.assert_called_once_with(
         channel="U123",
@@ -274,6 +292,7 @@ async def test_add_paper_with_invalid_bibtex(
     client, logger = mock_slack_context
     mock_get_db.return_value = iter([db_session])
 
+    paper_service.create_paper = MagicMock()
     user_service.get_or_create_user = MagicMock(
         return_value=User(id=1, slack_user_id="U123")
     )
@@ -308,9 +327,7 @@ This is not a valid bibtex entry.
         patch("app.services.paper_service.PaperService", return_value=paper_service),
         patch("app.services.user_service.UserService", return_value=user_service),
     ):
-        await lazy_process_add_paper_submission(
-            body, client, logger, db_session, paper_service, user_service
-        )
+        await lazy_process_add_paper_submission(body, client, logger)
 
     client.chat_postMessage.assert_called_once_with(
         channel="U123",
@@ -327,6 +344,7 @@ async def test_add_paper_with_missing_required_fields(
     client, logger = mock_slack_context
     mock_get_db.return_value = iter([db_session])
 
+    paper_service.create_paper = MagicMock()
     user_service.get_or_create_user = MagicMock(
         return_value=User(id=1, slack_user_id="U123")
     )
@@ -356,9 +374,7 @@ async def test_add_paper_with_missing_required_fields(
         patch("app.services.paper_service.PaperService", return_value=paper_service),
         patch("app.services.user_service.UserService", return_value=user_service),
     ):
-        await lazy_process_add_paper_submission(
-            body, client, logger, db_session, paper_service, user_service
-        )
+        await lazy_process_add_paper_submission(body, client, logger)
 
     client.chat_postMessage.assert_called_once_with(
         channel="U123",
@@ -414,9 +430,7 @@ async def test_add_paper_with_bibtex_minimal_fields(
         patch("app.services.paper_service.PaperService", return_value=paper_service),
         patch("app.services.user_service.UserService", return_value=user_service),
     ):
-        await lazy_process_add_paper_submission(
-            body, client, logger, db_session, paper_service, user_service
-        )
+        await lazy_process_add_paper_submission(body, client, logger)
 
     client.chat_postMessage.assert_called_once_with(
         channel="U123", text="Paper 'Minimal BibTeX' successfully added!"
@@ -480,9 +494,7 @@ async def test_add_paper_with_bibtex_no_url_or_arxiv_id(
         patch("app.services.paper_service.PaperService", return_value=paper_service),
         patch("app.services.user_service.UserService", return_value=user_service),
     ):
-        await lazy_process_add_paper_submission(
-            body, client, logger, db_session, paper_service, user_service
-        )
+        await lazy_process_add_paper_submission(body, client, logger)
 
     client.chat_postMessage.assert_called_once_with(
         channel="U123",
@@ -540,9 +552,7 @@ async def test_add_paper_with_bibtex_only_eprint(
         patch("app.services.paper_service.PaperService", return_value=paper_service),
         patch("app.services.user_service.UserService", return_value=user_service),
     ):
-        await lazy_process_add_paper_submission(
-            body, client, logger, db_session, paper_service, user_service
-        )
+        await lazy_process_add_paper_submission(body, client, logger)
 
     client.chat_postMessage.assert_called_once_with(
         channel="U123",
@@ -606,9 +616,7 @@ async def test_add_paper_with_bibtex_invalid_year(
         patch("app.services.paper_service.PaperService", return_value=paper_service),
         patch("app.services.user_service.UserService", return_value=user_service),
     ):
-        await lazy_process_add_paper_submission(
-            body, client, logger, db_session, paper_service, user_service
-        )
+        await lazy_process_add_paper_submission(body, client, logger)
 
     client.chat_postMessage.assert_called_once_with(
         channel="U123",
@@ -671,9 +679,7 @@ async def test_add_paper_with_existing_url(
         patch("app.services.paper_service.PaperService", return_value=paper_service),
         patch("app.services.user_service.UserService", return_value=user_service),
     ):
-        await lazy_process_add_paper_submission(
-            body, client, logger, db_session, paper_service, user_service
-        )
+        await lazy_process_add_paper_submission(body, client, logger)
 
     client.chat_postMessage.assert_called_once_with(
         channel="U123",
@@ -746,9 +752,7 @@ async def test_add_paper_with_full_bibtex(
         patch("app.services.paper_service.PaperService", return_value=paper_service),
         patch("app.services.user_service.UserService", return_value=user_service),
     ):
-        await lazy_process_add_paper_submission(
-            body, client, logger, db_session, paper_service, user_service
-        )
+        await lazy_process_add_paper_submission(body, client, logger)
 
     client.chat_postMessage.assert_called_once_with(
         channel="U123",
@@ -769,3 +773,265 @@ async def test_add_paper_with_full_bibtex(
     assert "Fictional Science" in created_paper_data.keyword_names
     assert "This paper presents a novel approach" in created_paper_data.summary
     assert created_paper_data.bibtex == bibtex_str
+
+
+@pytest.mark.asyncio
+@patch("app.db.database.get_db")
+async def test_add_paper_with_arxiv_url_only_resolves_metadata(
+    mock_get_db, db_session, paper_service, user_service, mock_slack_context
+):
+    client, logger = mock_slack_context
+    mock_get_db.return_value = iter([db_session])
+
+    paper_service.create_paper = MagicMock(
+        return_value=Paper(id=8, title="Resolved", url="https://arxiv.org/abs/2305.1")
+    )
+    user_service.get_or_create_user = MagicMock(
+        return_value=User(id=1, slack_user_id="U123", api_key=None)
+    )
+    resolved = {
+        "title": "Resolved Title",
+        "url": "http://arxiv.org/pdf/2305.00001v1",
+        "summary": "Resolved abstract.",
+        "authors": ["Ada Lovelace"],
+        "published_date": datetime(2023, 5, 1),
+        "arxiv_id": "2305.00001v1",
+    }
+
+    body = {
+        "user": {"id": "U123"},
+        "view": {
+            "state": {
+                "values": {
+                    "paper_title_block": {"paper_title_input": {"value": ""}},
+                    "paper_url_block": {
+                        "paper_url_input": {"value": "https://arxiv.org/abs/2305.00001"}
+                    },
+                    "paper_authors_block": {"paper_authors_input": {"value": ""}},
+                    "paper_keywords_block": {"paper_keywords_input": {"value": ""}},
+                    "paper_summary_block": {"paper_summary_input": {"value": ""}},
+                    "paper_published_date_block": {
+                        "paper_published_date_input": {"value": ""}
+                    },
+                    "paper_arxiv_id_block": {"paper_arxiv_id_input": {"value": ""}},
+                    "paper_bibtex_block": {"paper_bibtex_input": {"value": ""}},
+                }
+            }
+        },
+    }
+
+    with patch(
+        "app.bot.actions.arxiv_resolver.resolve", AsyncMock(return_value=resolved)
+    ) as mock_resolve:
+        await lazy_process_add_paper_submission(body, client, logger)
+
+    mock_resolve.assert_awaited_once_with("2305.00001")
+    created_paper_data = paper_service.create_paper.call_args[0][0]
+    assert created_paper_data.title == "Resolved Title"
+    assert str(created_paper_data.url) == "https://arxiv.org/abs/2305.00001"
+    assert created_paper_data.summary == "Resolved abstract."
+    assert created_paper_data.author_names == ["Ada Lovelace"]
+    assert created_paper_data.published_date == datetime(2023, 5, 1)
+    assert created_paper_data.arxiv_id == "2305.00001"
+
+
+def test_add_paper_modal_acks_before_processing():
+    app = MagicMock()
+    register_actions(app)
+
+    app.view.assert_any_call("add_paper_modal")
+    app.view.return_value.assert_any_call(
+        ack=ack_add_paper_submission, lazy=[process_add_paper_submission]
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_add_paper_submission_sends_placeholder_first(
+    mock_slack_context,
+):
+    client, logger = mock_slack_context
+    body = {"user": {"id": "U123"}}
+
+    with (
+        patch("app.bot.actions.session_scope"),
+        patch(
+            "app.bot.actions.lazy_process_add_paper_submission",
+            new_callable=AsyncMock,
+        ) as mock_process,
+    ):
+        await process_add_paper_submission(body, client, logger)
+
+    client.chat_postMessage.assert_called_once_with(
+        channel="U123", text="논문을 추가하는 중입니다..."
+    )
+    mock_process.assert_awaited_once()
+    assert mock_process.call_args.kwargs["body"] is body
+
+
+@pytest.mark.asyncio
+async def test_added_paper_invalidates_matching_homes(
+    db_session, paper_service, user_service, mock_slack_context
+):
+    client, logger = mock_slack_context
+    paper_service.create_paper = MagicMock(
+        return_value=Paper(id=7, title="Manual Paper", url="http://manual.com")
+    )
+    body = {
+        "user": {"id": "U123"},
+        "view": {
+            "state": {
+                "values": {
+                    "paper_title_block": {
+                        "paper_title_input": {"value": "Manual Paper"}
+                    },
+                    "paper_url_block": {
+                        "paper_url_input": {"value": "http://manual.com"}
+                    },
+                    "paper_authors_block": {"paper_authors_input": {"value": ""}},
+                    "paper_keywords_block": {
+                        "paper_keywords_input": {"value": "graphs"}
+                    },
+                    "paper_summary_block": {
+                        "paper_summary_input": {"value": "Abstract."}
+                    },
+                    "paper_published_date_block": {
+                        "paper_published_date_input": {"value": ""}
+                    },
+                    "paper_arxiv_id_block": {"paper_arxiv_id_input": {"value": ""}},
+                    "paper_bibtex_block": {"paper_bibtex_input": {"value": ""}},
+                }
+            }
+        },
+    }
+
+    with patch("app.bot.actions.home_views") as mock_home_views:
+        await lazy_process_add_paper_submission(body, client, logger)
+
+    mock_home_views.invalidate_for_papers.assert_called_once()
+    assert mock_home_views.invalidate_for_papers.call_args.args[1] == [7]
+
+
+@pytest.mark.asyncio
+async def test_add_paper_summarizes_without_holding_a_session(
+    db_session, paper_service, user_service, mock_slack_context
+):
+    client, logger = mock_slack_context
+    user_service.update_api_key("U123", "key")
+    paper_service.create_paper = MagicMock(
+        return_value=Paper(id=7, title="Manual Paper", url="http://manual.com")
+    )
+    paper_service.save_summary = MagicMock()
+    open_sessions = []
+
+    @contextmanager
+    def _session_scope(read_only=False):
+        open_sessions.append(db_session)
+        try:
+            yield db_session
+        finally:
+            open_sessions.pop()
+
+    async def generate_paper_summary(inputs):
+        assert not open_sessions
+        return "gemini-1.5-flash", f"Summary of {inputs.arxiv_id}"
+
+    body = {
+        "user": {"id": "U123"},
+        "view": {
+            "state": {
+                "values": {
+                    "paper_title_block": {
+                        "paper_title_input": {"value": "Manual Paper"}
+                    },
+                    "paper_url_block": {
+                        "paper_url_input": {"value": "http://manual.com"}
+                    },
+                    "paper_authors_block": {"paper_authors_input": {"value": ""}},
+                    "paper_keywords_block": {"paper_keywords_input": {"value": ""}},
+                    "paper_summary_block": {"paper_summary_input": {"value": ""}},
+                    "paper_published_date_block": {
+                        "paper_published_date_input": {"value": ""}
+                    },
+                    "paper_arxiv_id_block": {
+                        "paper_arxiv_id_input": {"value": "2301.00001"}
+                    },
+                    "paper_bibtex_block": {"paper_bibtex_input": {"value": ""}},
+                }
+            }
+        },
+    }
+
+    with (
+        patch("app.bot.actions.session_scope", _session_scope),
+        patch("app.bot.actions.generate_paper_summary", generate_paper_summary),
+        patch(
+            "app.bot.actions.run_in_writer",
+            AsyncMock(side_effect=lambda func, *args: func(*args)),
+        ),
+    ):
+        await lazy_process_add_paper_submission(body, client, logger)
+
+    paper_service.save_summary.assert_called_once_with(
+        7, "Summary of 2301.00001", "gemini-1.5-flash"
+    )
+    client.chat_postMessage.assert_called_once_with(
+        channel="U123",
+        text="Paper 'Manual Paper' successfully added and summarized!",
+    )
+
+
+@pytest.mark.asyncio
+async def test_summarize_modal_does_not_hold_a_session_while_generating(
+    db_session, paper_service, mock_slack_context
+):
+    client, logger = mock_slack_context
+    paper = paper_service.create_paper(
+        PaperCreate(title="To Summarize", url="http://example.com/summarize")
+    )
+    app = MagicMock()
+    register_actions(app)
+    handler = next(
+        call.args[0]
+        for call in app.view.return_value.call_args_list
+        if call.args
+        and call.args[0].__name__ == "handle_summarize_paper_modal_submission"
+    )
+    open_sessions = []
+
+    @contextmanager
+    def _session_scope(read_only=False):
+        open_sessions.append(db_session)
+        try:
+            yield db_session
+        finally:
+            open_sessions.pop()
+
+    async def generate_paper_summary(inputs):
+        assert not open_sessions
+        return "extractive", "Summary."
+
+    body = {
+        "user": {"id": "U123"},
+        "view": {
+            "state": {
+                "values": {
+                    "paper_id_block": {"paper_id_input": {"value": str(paper.id)}}
+                }
+            }
+        },
+    }
+    with (
+        patch("app.bot.actions.session_scope", _session_scope),
+        patch("app.bot.actions.generate_paper_summary", generate_paper_summary),
+        patch(
+            "app.bot.actions.run_in_writer",
+            AsyncMock(side_effect=lambda func, *args: func(*args)),
+        ),
+    ):
+        await handler(ack=AsyncMock(), body=body, client=client, logger=logger)
+
+    assert paper.summary == "Summary."
+    assert paper.summary_model == "extractive"
+    client.chat_postMessage.assert_called_once_with(
+        channel="U123", text=f"*논문 ID {paper.id} 요약:*\n\nSummary."
+    )
@@ -0,0 +1,70 @@
+import os
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.bot.commands import export_papers_command
+
+
+@pytest.fixture
+def mock_client():
+    client = MagicMock()
+    client.conversations_open = AsyncMock(return_value={"channel": {"id": "D123"}})
+    client.files_upload_v2 = AsyncMock()
+    client.chat_postMessage = AsyncMock()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_export_command_uploads_file(mock_client, tmp_path):
+    export_path = tmp_path / "papers.csv"
+    export_path.write_text("id,title\n")
+
+    with patch(
+        "app.bot.commands._export_to_tempfile", return_value=str(export_path)
+    ) as mock_export:
+        await export_papers_command(
+            ack=AsyncMock(),
+            command={"user_id": "U123", "text": "csv Type Systems"},
+            client=mock_client,
+            logger=MagicMock(),
+        )
+
+    mock_export.assert_called_once_with("csv", "Type Systems")
+    mock_client.files_upload_v2.assert_called_once()
+    assert mock_client.files_upload_v2.call_args.kwargs["channel"] == "D123"
+    # The temporary export file is removed after upload
+    assert not os.path.exists(export_path)
+
+
+@pytest.mark.asyncio
+async def test_export_command_defaults_to_bibtex(mock_client, tmp_path):
+    export_path = tmp_path / "papers.bib"
+    export_path.write_text("")
+
+    with patch(
+        "app.bot.commands._export_to_tempfile", return_value=str(export_path)
+    ) as mock_export:
+        await export_papers_command(
+            ack=AsyncMock(),
+            command={"user_id": "U123", "text": ""},
+            client=mock_client,
+            logger=MagicMock(),
+        )
+
+    mock_export.assert_called_once_with("bibtex", None)
+
+
+@pytest.mark.asyncio
+async def test_export_command_reports_failure(mock_client):
+    with patch(
+        "app.bot.commands._export_to_tempfile", side_effect=Exception("db down")
+    ):
+        await export_papers_command(
+            ack=AsyncMock(),
+            command={"user_id": "U123", "text": "jsonl"},
+            client=mock_client,
+            logger=MagicMock(),
+        )
+
+    mock_client.chat_postMessage.assert_called_once_with(
+        channel="U123", text="논문 내보내기에 실패했습니다. 다시 시도해주세요."
+    )
@@ -0,0 +1,78 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from slack_bolt.request.async_request import AsyncBoltRequest
+from app.bot.middleware import (
+    deduplicate_deliveries,
+    deliveries,
+    delivery_key,
+    use_shared_slack_client,
+)
+from app.core.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def clear_deliveries():
+    deliveries.clear()
+    yield
+    deliveries.clear()
+
+
+def _counter(name):
+    return metrics.snapshot()["counters"].get(name, 0)
+
+
+def test_delivery_key_prefers_event_then_view_then_trigger():
+    assert delivery_key({"event_id": "Ev1", "trigger_id": "T1"}) == "event:Ev1"
+    assert (
+        delivery_key(
+            {
+                "type": "view_submission",
+                "view": {"id": "V1", "hash": "h"},
+                "trigger_id": "T1",
+            }
+        )
+        == "view:V1:h"
+    )
+    assert delivery_key({"command": "/논문-검색", "trigger_id": "T1"}) == "trigger:T1"
+    assert delivery_key({"type": "url_verification"}) is None
+
+
+@pytest.mark.asyncio
+async def test_retried_event_is_acked_without_running_listeners():
+    body = {"type": "event_callback", "event_id": "Ev1"}
+    first = AsyncBoltRequest(body="{}", headers={})
+    retry = AsyncBoltRequest(body="{}", headers={"X-Slack-Retry-Num": "1"})
+    retries, dropped = _counter("slack.retries"), _counter("slack.duplicates_dropped")
+
+    next_ = AsyncMock()
+    assert await deduplicate_deliveries(first, body, next_, MagicMock()) is None
+    next_.assert_awaited_once()
+
+    next_ = AsyncMock()
+    response = await deduplicate_deliveries(retry, body, next_, MagicMock())
+    assert response.status == 200
+    next_.assert_not_awaited()
+    assert _counter("slack.retries") == retries + 1
+    assert _counter("slack.duplicates_dropped") == dropped + 1
+
+
+@pytest.mark.asyncio
+async def test_deliveries_without_a_key_always_run():
+    request = AsyncBoltRequest(body="{}", headers={})
+    next_ = AsyncMock()
+    for _ in range(2):
+        await deduplicate_deliveries(
+            request, {"type": "url_verification"}, next_, MagicMock()
+        )
+    assert next_.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_listeners_get_the_shared_slack_client():
+    context = {}
+    next_ = AsyncMock()
+    with patch("app.bot.middleware.get_slack_client") as mock_get_client:
+        await use_shared_slack_client(context, next_)
+
+    assert context["client"] is mock_get_client.return_value
+    next_.assert_awaited_once()
@@ -0,0 +1,43 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.bot.commands import similar_papers_command
+
+
+@pytest.mark.asyncio
+async def test_similar_papers_command_lists_results():
+    say = AsyncMock()
+    row = SimpleNamespace(id=7, title="Related", url="http://example.com/7")
+
+    with patch(
+        "app.bot.commands._find_similar_papers", return_value=[(row, 0.8123)]
+    ) as mock_find:
+        await similar_papers_command(
+            ack=AsyncMock(), say=say, command={"text": " 42 "}, logger=MagicMock()
+        )
+
+    mock_find.assert_called_once_with("42")
+    say.assert_called_once_with(
+        "*비슷한 논문:*\n• <http://example.com/7|Related> (ID 7, 유사도 0.81)"
+    )
+
+
+@pytest.mark.asyncio
+async def test_similar_papers_command_reports_unknown_paper():
+    say = AsyncMock()
+
+    with patch("app.bot.commands._find_similar_papers", return_value=None):
+        await similar_papers_command(
+            ack=AsyncMock(), say=say, command={"text": "42"}, logger=MagicMock()
+        )
+
+    say.assert_called_once_with("논문 ID 42를 찾을 수 없습니다.")
+
+
+@pytest.mark.asyncio
+async def test_similar_papers_command_requires_query():
+    say = AsyncMock()
+    await similar_papers_command(
+        ack=AsyncMock(), say=say, command={"text": ""}, logger=MagicMock()
+    )
+    assert "검색어" in say.call_args.args[0]
@@ -0,0 +1,30 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.bot.streaming import STREAMING_CURSOR, stream_to_message
+
+
+async def _stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_stream_to_message_throttles_updates():
+    client = MagicMock()
+    client.chat_update = AsyncMock()
+    clock = iter([0.0, 0.2, 0.4, 1.5])
+
+    with patch("app.bot.streaming.time.monotonic", side_effect=lambda: next(clock)):
+        text = await stream_to_message(
+            client,
+            "D123",
+            "1.0",
+            _stream("a", "b", "c", "d "),
+            prefix="> ",
+            min_interval=1.0,
+        )
+
+    assert text == "abcd"
+    texts = [call.kwargs["text"] for call in client.chat_update.call_args_list]
+    # First chunk immediately, then once the interval has passed, then final
+    assert texts == [f"> a{STREAMING_CURSOR}", f"> abcd {STREAMING_CURSOR}", "> abcd"]
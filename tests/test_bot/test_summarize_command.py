@@ -1,9 +1,23 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from app.bot.commands import (
     summarize_text_command,
 )  # Directly import the command handler
+from app.core.rate_limit import RateLimitedError
 from app.services.ai_service import AIService
+from app.services.summary_cache import SummaryCache
+
+
+@pytest.fixture(autouse=True)
+def summary_cache():
+    """Start every test with an empty cache that never reaches the database."""
+    cache = SummaryCache()
+    with (
+        patch.object(cache, "get", return_value=None),
+        patch.object(cache, "put", AsyncMock()),
+        patch("app.bot.commands.summary_cache", cache),
+    ):
+        yield cache
 
 
 @pytest.fixture
@@ -17,72 +31,133 @@ def mock_ai_service():
 @pytest.fixture
 def mock_say():
     """Mock 'say' function from Slack Bolt context."""
-    return AsyncMock()
+    return AsyncMock(return_value={"channel": "D123", "ts": "1.0"})
+
+
+@pytest.fixture
+def mock_client():
+    client = MagicMock()
+    client.chat_update = AsyncMock()
+    return client
 
 
 @pytest.mark.asyncio
-async def test_summarize_command_success(mock_ai_service, mock_say):
+async def test_summarize_command_no_text(mock_ai_service, mock_say, mock_client):
     """
-    Test that the /요약 command successfully summarizes text and responds.
+    Test that the /요약 command handles empty text input.
     """
-    command_payload = {
-        "text": "이것은 요약할 긴 텍스트입니다. 이 텍스트는 AI 서비스에 의해 요약될 것입니다."
-    }
+    command_payload = {"text": ""}
 
     await summarize_text_command(
         ack=AsyncMock(),
         say=mock_say,
         command=command_payload,
         ai_service=mock_ai_service,
+        client=mock_client,
     )
 
     # Assertions
-    mock_ai_service.summarize_text.assert_called_once_with(
-        "이것은 요약할 긴 텍스트입니다. 이 텍스트는 AI 서비스에 의해 요약될 것입니다."
+    mock_ai_service.summarize_text.assert_not_called()
+    mock_say.assert_called_once_with(
+        "요약할 텍스트를 입력해주세요. 예: `/요약 긴 텍스트...`"
     )
-    mock_say.assert_called_once_with("요약 결과:\n요약된 텍스트입니다.")
 
 
 @pytest.mark.asyncio
-async def test_summarize_command_no_text(mock_ai_service, mock_say):
+async def test_summarize_command_ai_service_error(
+    mock_ai_service, mock_say, mock_client
+):
     """
-    Test that the /요약 command handles empty text input.
+    Test that the /요약 command handles errors from AIService.
     """
-    command_payload = {"text": ""}
+    mock_ai_service.stream_summary = MagicMock(side_effect=Exception("API 호출 실패"))
 
     await summarize_text_command(
         ack=AsyncMock(),
         say=mock_say,
-        command=command_payload,
+        command={"text": "이것은 요약할 텍스트입니다."},
         ai_service=mock_ai_service,
+        client=mock_client,
     )
 
-    # Assertions
-    mock_ai_service.summarize_text.assert_not_called()
-    mock_say.assert_called_once_with(
-        "요약할 텍스트를 입력해주세요. 예: `/요약 긴 텍스트...`"
+    mock_ai_service.stream_summary.assert_called_once()
+    mock_client.chat_update.assert_called_once_with(
+        channel="D123",
+        ts="1.0",
+        text="텍스트 요약 중 오류가 발생했습니다: API 호출 실패",
     )
 
 
+async def _stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
 @pytest.mark.asyncio
-async def test_summarize_command_ai_service_error(mock_ai_service, mock_say):
-    """
-    Test that the /요약 command handles errors from AIService.
-    """
-    # Configure mock_ai_service to raise an exception
-    mock_ai_service.summarize_text.side_effect = Exception("API 호출 실패")
+async def test_summarize_command_streams_into_placeholder(
+    mock_ai_service, mock_say, mock_client
+):
+    mock_ai_service.stream_summary = MagicMock(
+        return_value=_stream("첫 번째 ", "두 번째 ", "문장.")
+    )
+    client = mock_client
+
+    with patch("app.bot.streaming.settings.SLACK_STREAM_UPDATE_INTERVAL_SECONDS", 0):
+        await summarize_text_command(
+            ack=AsyncMock(),
+            say=mock_say,
+            command={"text": "스트리밍할 텍스트"},
+            ai_service=mock_ai_service,
+            client=client,
+        )
+
+    mock_say.assert_called_once_with("요약하는 중입니다... :hourglass_flowing_sand:")
+    mock_ai_service.summarize_text.assert_not_called()
+    first_update = client.chat_update.call_args_list[0].kwargs
+    assert first_update["ts"] == "1.0"
+    assert first_update["text"].startswith("요약 결과:\n첫 번째")
+    assert (
+        client.chat_update.call_args.kwargs["text"]
+        == "요약 결과:\n첫 번째 두 번째 문장."
+    )
 
-    command_payload = {"text": "이것은 요약할 텍스트입니다."}
+
+@pytest.mark.asyncio
+async def test_summarize_command_answers_cached_text_directly(
+    summary_cache, mock_ai_service, mock_say
+):
+    summary_cache.get.return_value = "캐시된 요약"
 
     await summarize_text_command(
         ack=AsyncMock(),
         say=mock_say,
-        command=command_payload,
+        command={"text": "이미 요약한 텍스트"},
         ai_service=mock_ai_service,
+        client=MagicMock(),
     )
 
-    # Assertions
-    mock_ai_service.summarize_text.assert_called_once()
-    mock_say.assert_called_once_with(
-        "텍스트 요약 중 오류가 발생했습니다: API 호출 실패"
+    mock_say.assert_called_once_with("요약 결과:\n캐시된 요약")
+    mock_ai_service.summarize_text.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_summarize_command_reports_rate_limit(
+    mock_ai_service, mock_say, mock_client
+):
+    with patch(
+        "app.bot.commands.shared_key_queue.run",
+        AsyncMock(side_effect=RateLimitedError(12.2)),
+    ):
+        await summarize_text_command(
+            ack=AsyncMock(),
+            say=mock_say,
+            command={"text": "많이 요청한 텍스트", "user_id": "U1"},
+            ai_service=mock_ai_service,
+            client=mock_client,
+        )
+
+    mock_client.chat_update.assert_called_once_with(
+        channel="D123",
+        ts="1.0",
+        text="요약 요청이 너무 많습니다. 13초 후에 다시 시도해주세요.",
     )
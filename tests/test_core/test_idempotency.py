@@ -0,0 +1,20 @@
+from unittest.mock import patch
+from app.core.idempotency import IdempotencyStore
+
+
+def test_claim_succeeds_once_per_ttl():
+    store = IdempotencyStore(ttl_seconds=60, max_keys=10)
+    with patch("app.core.idempotency.time.monotonic", return_value=100.0):
+        assert store.claim("event:Ev1")
+        assert not store.claim("event:Ev1")
+        assert store.claim("event:Ev2")
+    with patch("app.core.idempotency.time.monotonic", return_value=161.0):
+        assert store.claim("event:Ev1")
+
+
+def test_oldest_keys_are_forgotten_past_max_keys():
+    store = IdempotencyStore(ttl_seconds=60, max_keys=2)
+    for key in ("a", "b", "c"):
+        assert store.claim(key)
+    assert store.claim("a")
+    assert not store.claim("c")
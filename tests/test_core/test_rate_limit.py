@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from app.core.rate_limit import (
+    CircuitBreaker,
+    CircuitOpenError,
+    FairQueue,
+    RateLimitedError,
+    TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with patch("app.core.rate_limit.time.monotonic", fake):
+        yield fake
+
+
+def test_token_bucket_refills_over_time(clock):
+    bucket = TokenBucket(rate=1, capacity=10)
+    assert bucket.try_acquire(10)
+    assert not bucket.try_acquire(5)
+    assert bucket.retry_after(5) == 5
+
+    clock.now = 5
+    assert bucket.try_acquire(5)
+    # Requests larger than the bucket are admitted once it is full again
+    clock.now = 20
+    assert bucket.try_acquire(100)
+
+
+def test_circuit_breaker_opens_and_recovers(clock):
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=30)
+    breaker.before_call()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now = 31
+    assert breaker.state == "half_open"
+    breaker.before_call()  # the single trial call
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 62
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_fair_queue_rate_limits_per_user():
+    queue = FairQueue("test", concurrency=1, tokens_per_minute=60, burst_tokens=10)
+
+    async def work():
+        return "done"
+
+    assert await queue.run("U1", 10, work) == "done"
+    with pytest.raises(RateLimitedError):
+        await queue.run("U1", 10, work)
+    # Other users have their own bucket
+    assert await queue.run("U2", 10, work) == "done"
+
+
+@pytest.mark.asyncio
+async def test_fair_queue_interleaves_users_under_global_cap():
+    queue = FairQueue("test", concurrency=1, tokens_per_minute=6000, burst_tokens=100)
+    release = asyncio.Event()
+    order = []
+    running = 0
+    peak = 0
+
+    async def work(label):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        if label == "blocker":
+            await release.wait()
+        order.append(label)
+        running -= 1
+
+    blocker = asyncio.create_task(queue.run("U0", 1, lambda: work("blocker")))
+    await asyncio.sleep(0)
+    # A flooding user queues first, then a second user arrives
+    tasks = [
+        asyncio.create_task(queue.run("U1", 1, lambda i=i: work(f"U1-{i}")))
+        for i in range(3)
+    ]
+    tasks.append(asyncio.create_task(queue.run("U2", 1, lambda: work("U2-0"))))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(blocker, *tasks)
+
+    assert order == ["blocker", "U1-0", "U2-0", "U1-1", "U1-2"]
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_fair_queue_skips_cancelled_waiters():
+    queue = FairQueue("test", concurrency=1, tokens_per_minute=6000, burst_tokens=100)
+    release = asyncio.Event()
+
+    async def blocker():
+        await release.wait()
+
+    async def work():
+        return "ran"
+
+    first = asyncio.create_task(queue.run("U1", 1, blocker))
+    await asyncio.sleep(0)
+    cancelled = asyncio.create_task(queue.run("U2", 1, work))
+    waiting = asyncio.create_task(queue.run("U3", 1, work))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    release.set()
+
+    await first
+    assert await waiting == "ran"
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
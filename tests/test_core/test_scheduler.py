@@ -40,7 +40,10 @@ def mock_slack_service_instance():
 
 @pytest.fixture
 def mock_paper_service_instance():
-    return MagicMock()
+    paper_service = MagicMock()
+    paper_service.get_paper_by_url_or_arxiv_id.return_value = None
+    paper_service.find_near_duplicate.return_value = None
+    return paper_service
 
 
 @pytest.mark.asyncio
@@ -152,7 +155,7 @@ async def test_check_for_new_papers_async_existing_paper(
         }
     ]
 
-    mock_db_session.query().filter().first.return_value = Paper(
+    mock_paper_service_instance.get_paper_by_url_or_arxiv_id.return_value = Paper(
         id=1, title="Existing Paper"
     )  # Simulate existing paper
 
@@ -183,6 +186,9 @@ async def test_check_for_new_papers_async_existing_paper(
         mock_scholar_service_instance.search_new_papers.assert_called_once_with(
             "test_keyword"
         )
+        mock_paper_service_instance.get_paper_by_url_or_arxiv_id.assert_called_once_with(
+            url="http://existing.com", arxiv_id="9876.54321"
+        )
         mock_paper_service_instance.create_paper.assert_not_called()
         mock_slack_service_instance.send_new_paper_notification.assert_not_called()
         mock_db_session.close.assert_called_once()
@@ -226,9 +232,7 @@ async def test_check_for_new_papers_async_scholar_service_exception(
         stack.enter_context(
             patch("app.core.scheduler.SessionLocal", return_value=mock_db_session)
         )
-        mock_print = stack.enter_context(
-            patch("app.core.scheduler.print")
-        )  # Patch print for error logging
+        mock_logger = stack.enter_context(patch("app.core.scheduler.logger"))
         with pytest.raises(Exception):
             await check_for_new_papers_async()
 
@@ -236,7 +240,7 @@ async def test_check_for_new_papers_async_scholar_service_exception(
         mock_paper_service_instance.create_paper.assert_not_called()
         mock_slack_service_instance.send_new_paper_notification.assert_not_called()
         mock_db_session.close.assert_called_once()
-        mock_print.assert_called_once()  # Check that the error was printed
+        mock_logger.exception.assert_called_once()  # The error was logged
 
 
 @pytest.mark.asyncio
@@ -299,9 +303,7 @@ async def test_check_for_new_papers_async_slack_notification_exception(
         stack.enter_context(
             patch("app.core.scheduler.SessionLocal", return_value=mock_db_session)
         )
-        mock_print = stack.enter_context(
-            patch("app.core.scheduler.print")
-        )  # Patch print for error logging
+        mock_logger = stack.enter_context(patch("app.core.scheduler.logger"))
         with pytest.raises(Exception):
             await check_for_new_papers_async()
 
@@ -309,4 +311,208 @@ async def test_check_for_new_papers_async_slack_notification_exception(
         mock_paper_service_instance.create_paper.assert_called_once()
         mock_slack_service_instance.send_new_paper_notification.assert_called_once()
         mock_db_session.close.assert_called_once()
-        mock_print.assert_called_once()  # Check that the error was printed
+        mock_logger.exception.assert_called_once()  # The error was logged
+
+
+@pytest.mark.asyncio
+async def test_start_scheduler_offpeak_enrichment(mock_scheduler):
+    from app.core.scheduler import enrich_pending_papers_async
+
+    with patch("app.core.scheduler.settings.SUMMARY_ENRICHMENT_MODE", "offpeak"):
+        await start_scheduler()
+
+    mock_scheduler.add_job.assert_called_with(
+        enrich_pending_papers_async,
+        "cron",
+        hour=3,
+        id="summary_enrichment",
+        replace_existing=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_check_for_new_papers_async_summarizes_before_notifying(
+    mock_db_session,
+    mock_scholar_service_instance,
+    mock_slack_service_instance,
+    mock_paper_service_instance,
+):
+    user_keyword = MagicMock()
+    user_keyword.user = MagicMock(slack_user_id="U123")
+    user_keyword.keyword.name = "test_keyword"
+    mock_db_session.query().all.return_value = [user_keyword]
+    mock_scholar_service_instance.search_new_papers.return_value = [
+        {"title": "New Paper", "url": "http://new.com", "summary": "Abstract."}
+    ]
+    new_paper = Paper(
+        id=1, title="New Paper", url="http://new.com", summary="Abstract."
+    )
+    mock_paper_service_instance.create_paper.return_value = new_paper
+
+    async def summarize_papers(papers):
+        for paper in papers:
+            paper.summary = "AI summary."
+        return len(papers)
+
+    mock_enrichment_service = MagicMock()
+    mock_enrichment_service.summarize_papers = AsyncMock(side_effect=summarize_papers)
+
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch(
+                "app.core.scheduler.ScholarService",
+                return_value=mock_scholar_service_instance,
+            )
+        )
+        stack.enter_context(
+            patch(
+                "app.core.scheduler.SlackService",
+                return_value=mock_slack_service_instance,
+            )
+        )
+        stack.enter_context(
+            patch(
+                "app.core.scheduler.PaperService",
+                return_value=mock_paper_service_instance,
+            )
+        )
+        stack.enter_context(
+            patch(
+                "app.core.scheduler.EnrichmentService",
+                return_value=mock_enrichment_service,
+            )
+        )
+        stack.enter_context(patch("app.core.scheduler.AIService"))
+        stack.enter_context(
+            patch("app.core.scheduler.settings.GEMINI_API_KEY", "workspace-key")
+        )
+        stack.enter_context(
+            patch("app.core.scheduler.SessionLocal", return_value=mock_db_session)
+        )
+        await check_for_new_papers_async()
+
+    mock_enrichment_service.summarize_papers.assert_awaited_once_with([new_paper])
+    notification = mock_slack_service_instance.send_new_paper_notification.call_args
+    assert notification.kwargs["summary"] == "AI summary."
+
+
+@pytest.mark.asyncio
+async def test_check_for_new_papers_async_sends_only_ranked_papers(
+    mock_db_session,
+    mock_scholar_service_instance,
+    mock_slack_service_instance,
+    mock_paper_service_instance,
+):
+    user_keywords = []
+    for name in ("graphs", "diffusion"):
+        user_keyword = MagicMock()
+        user_keyword.user = MagicMock(slack_user_id="U123")
+        user_keyword.keyword.name = name
+        user_keywords.append(user_keyword)
+    mock_db_session.query().all.return_value = user_keywords
+    mock_scholar_service_instance.search_new_papers.side_effect = [
+        [{"title": "Graph Paper", "url": "http://graph.com"}],
+        [{"title": "Diffusion Paper", "url": "http://diffusion.com"}],
+    ]
+    graph_paper = Paper(id=1, title="Graph Paper", url="http://graph.com")
+    diffusion_paper = Paper(id=2, title="Diffusion Paper", url="http://diffusion.com")
+    mock_paper_service_instance.create_paper.side_effect = [
+        graph_paper,
+        diffusion_paper,
+    ]
+    mock_ranking_service = MagicMock()
+    mock_ranking_service.top_papers.return_value = {"U123": [diffusion_paper]}
+
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch(
+                "app.core.scheduler.ScholarService",
+                return_value=mock_scholar_service_instance,
+            )
+        )
+        stack.enter_context(
+            patch(
+                "app.core.scheduler.SlackService",
+                return_value=mock_slack_service_instance,
+            )
+        )
+        stack.enter_context(
+            patch(
+                "app.core.scheduler.PaperService",
+                return_value=mock_paper_service_instance,
+            )
+        )
+        stack.enter_context(
+            patch(
+                "app.core.scheduler.RankingService",
+                return_value=mock_ranking_service,
+            )
+        )
+        stack.enter_context(patch("app.core.scheduler.settings.NOTIFICATION_TOP_K", 1))
+        stack.enter_context(
+            patch("app.core.scheduler.SessionLocal", return_value=mock_db_session)
+        )
+        await check_for_new_papers_async()
+
+    # Candidates from every keyword are ranked together, once.
+    mock_ranking_service.top_papers.assert_called_once_with(
+        {"U123": [graph_paper, diffusion_paper]}, 1
+    )
+    notification = mock_slack_service_instance.send_new_paper_notification.call_args
+    mock_slack_service_instance.send_new_paper_notification.assert_called_once()
+    assert notification.kwargs["paper_title"] == "Diffusion Paper"
+
+
+@pytest.mark.asyncio
+async def test_check_for_new_papers_async_notifies_papers_found_before_a_failure(
+    mock_db_session,
+    mock_scholar_service_instance,
+    mock_slack_service_instance,
+    mock_paper_service_instance,
+):
+    user_keywords = []
+    for name in ("graphs", "diffusion"):
+        user_keyword = MagicMock()
+        user_keyword.user = MagicMock(slack_user_id="U123")
+        user_keyword.keyword.name = name
+        user_keywords.append(user_keyword)
+    mock_db_session.query().all.return_value = user_keywords
+    mock_scholar_service_instance.search_new_papers.side_effect = [
+        [{"title": "Graph Paper", "url": "http://graph.com"}],
+        Exception("Scholar service error"),
+    ]
+    mock_paper_service_instance.create_paper.return_value = Paper(
+        id=1, title="Graph Paper", url="http://graph.com"
+    )
+
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch(
+                "app.core.scheduler.ScholarService",
+                return_value=mock_scholar_service_instance,
+            )
+        )
+        stack.enter_context(
+            patch(
+                "app.core.scheduler.SlackService",
+                return_value=mock_slack_service_instance,
+            )
+        )
+        stack.enter_context(
+            patch(
+                "app.core.scheduler.PaperService",
+                return_value=mock_paper_service_instance,
+            )
+        )
+        stack.enter_context(
+            patch("app.core.scheduler.SessionLocal", return_value=mock_db_session)
+        )
+        stack.enter_context(patch("app.core.scheduler.logger"))
+        with pytest.raises(Exception, match="Scholar service error"):
+            await check_for_new_papers_async()
+
+    # The stored paper is announced now; later runs would see it as existing.
+    notification = mock_slack_service_instance.send_new_paper_notification.call_args
+    assert notification.kwargs["paper_title"] == "Graph Paper"
+    mock_db_session.rollback.assert_called_once()
+    mock_db_session.close.assert_called_once()
@@ -0,0 +1,125 @@
+import threading
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.core.metrics import metrics
+from app.db import database
+from app.db.database import (
+    create_engines,
+    run_in_writer,
+    session_scope,
+    get_db,
+    get_pool_metrics,
+    report_long_held_sessions,
+)
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def testing_session_local():
+    metrics.reset()
+    with patch("app.db.database.SessionLocal", TestingSessionLocal):
+        yield
+
+
+def test_session_scope_closes_session():
+    with session_scope() as db:
+        assert db.execute(text("SELECT 1")).scalar() == 1
+        assert len(database._open_sessions) == 1
+
+    assert len(database._open_sessions) == 0
+    assert not db.in_transaction()
+    timings = metrics.snapshot()["timings"]
+    assert timings["db.session.held_seconds"]["count"] == 1
+    assert timings["db.pool.wait_seconds"]["count"] == 1
+
+
+def test_session_scope_rolls_back_on_error():
+    with pytest.raises(ValueError):
+        with session_scope() as db:
+            db.execute(text("SELECT 1"))
+            raise ValueError("boom")
+
+    assert len(database._open_sessions) == 0
+    assert not db.in_transaction()
+
+
+@pytest.mark.asyncio
+async def test_writer_session_scope_opens_and_closes_on_the_writer_thread():
+    async with database.writer_session_scope() as db:
+        assert len(database._open_sessions) == 1
+        assert await run_in_writer(lambda: db.execute(text("SELECT 1")).scalar()) == 1
+
+    assert len(database._open_sessions) == 0
+    assert not db.in_transaction()
+
+
+def test_get_db_uses_session_scope():
+    gen = get_db()
+    db = next(gen)
+    assert len(database._open_sessions) == 1
+    gen.close()
+    assert len(database._open_sessions) == 0
+    assert not db.in_transaction()
+
+
+def test_long_held_session_logs_call_site():
+    with (
+        patch.object(database.settings, "DB_SESSION_LEAK_THRESHOLD_SECONDS", -1.0),
+        patch("app.db.database.logger.warning") as mock_warning,
+    ):
+        with session_scope():
+            assert report_long_held_sessions() == 1
+
+    # One warning while open, one when the session is finally closed
+    assert mock_warning.call_count == 2
+    assert "test_long_held_session_logs_call_site" in mock_warning.call_args[0][0]
+    assert metrics.snapshot()["counters"]["db.session.long_held"] == 1
+
+
+def test_get_pool_metrics():
+    with session_scope():
+        pool_metrics = get_pool_metrics()
+        assert pool_metrics["open_sessions"] == 1
+
+    pool_metrics = get_pool_metrics()
+    assert pool_metrics["open_sessions"] == 0
+    assert {"checked_out", "overflow", "wait_seconds_total"} <= pool_metrics.keys()
+
+
+def test_create_engines_sqlite_file_profile(tmp_path):
+    writer, reader = create_engines(f"sqlite:///{tmp_path / 'profile.db'}")
+    assert writer is not reader
+
+    with writer.begin() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+        conn.exec_driver_sql("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        conn.exec_driver_sql("INSERT INTO items (id) VALUES (1)")
+
+    with reader.connect() as conn:
+        assert conn.exec_driver_sql("SELECT COUNT(*) FROM items").scalar() == 1
+        with pytest.raises(Exception, match="readonly"):
+            conn.exec_driver_sql("INSERT INTO items (id) VALUES (2)")
+
+    writer.dispose()
+    reader.dispose()
+
+
+def test_create_engines_in_memory_shares_engine():
+    writer, reader = create_engines("sqlite:///:memory:")
+    assert writer is reader
+
+
+@pytest.mark.asyncio
+async def test_run_in_writer_serializes_on_writer_thread():
+    thread_name = await run_in_writer(lambda: threading.current_thread().name)
+    assert thread_name.startswith("db-writer")
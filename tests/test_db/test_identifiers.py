@@ -0,0 +1,27 @@
+from app.db.identifiers import canonical_url, parse_arxiv_id, split_arxiv_version
+
+
+def test_split_arxiv_version():
+    assert split_arxiv_version("2301.00001v12") == ("2301.00001", 12)
+    assert split_arxiv_version("2301.00001") == ("2301.00001", None)
+    assert split_arxiv_version("hep-th/9901001v2") == ("hep-th/9901001", 2)
+
+
+def test_parse_arxiv_id():
+    assert parse_arxiv_id("https://arxiv.org/abs/1706.03762v5") == "1706.03762"
+    assert parse_arxiv_id("http://arxiv.org/pdf/2301.00001.pdf") == "2301.00001"
+    assert parse_arxiv_id("https://export.arxiv.org/abs/2301.00001") == "2301.00001"
+    assert parse_arxiv_id("https://arxiv.org/abs/hep-th/9901001") == "hep-th/9901001"
+    assert parse_arxiv_id("http://example.com/arxiv.org/abs/2301.00001") is None
+    assert parse_arxiv_id("http://example.com/paper.pdf") is None
+
+
+def test_canonical_url():
+    assert (
+        canonical_url("http://arxiv.org/pdf/2301.00001v1.pdf")
+        == canonical_url("https://arxiv.org/abs/2301.00001")
+        == "https://arxiv.org/abs/2301.00001"
+    )
+    assert canonical_url("http://WWW.Example.com/a/?x=1#top") == (
+        "https://example.com/a?x=1"
+    )
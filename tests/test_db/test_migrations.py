@@ -0,0 +1,220 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from app.db.models import Base
+from app.db.migrations import (
+    LATEST_VERSION,
+    get_schema_version,
+    is_schema_current,
+    run_migrations,
+)
+from app.db.migrations.ops import has_covering_index
+from app.db.migrations.versions import v0002_paper_keyset_index
+from app.services.paper_service import PaperService
+
+NEW_INDEXES = [
+    "ix_user_keywords_user_id_keyword_id",
+    "ix_user_authors_user_id_author_id",
+    "ix_papers_published_date_id",
+    "ix_paper_authors_author_id",
+    "ix_paper_keywords_keyword_id",
+]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def legacy_engine(engine):
+    """A database created before the hot-path indexes existed."""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for name in NEW_INDEXES:
+            conn.execute(text(f"DROP INDEX {name}"))
+        conn.execute(text("DROP TABLE summary_cache"))
+        conn.execute(text("ALTER TABLE papers DROP COLUMN summary_model"))
+        conn.execute(text("ALTER TABLE papers DROP COLUMN abstract"))
+        conn.execute(text("ALTER TABLE papers DROP COLUMN full_text"))
+        conn.execute(text("ALTER TABLE papers DROP COLUMN pdf_sha256"))
+        conn.execute(text("ALTER TABLE papers DROP COLUMN full_text_attempts"))
+        conn.execute(text("ALTER TABLE papers DROP COLUMN full_text_retry_at"))
+        conn.execute(text("DROP INDEX ix_papers_canonical_url"))
+        conn.execute(text("ALTER TABLE papers DROP COLUMN canonical_url"))
+        conn.execute(text("ALTER TABLE papers DROP COLUMN arxiv_version"))
+        conn.execute(text("ALTER TABLE papers DROP COLUMN minhash"))
+        conn.execute(text("ALTER TABLE users DROP COLUMN home_seen_paper_id"))
+        conn.execute(text("INSERT INTO users (id, slack_user_id) VALUES (1, 'U1')"))
+        conn.execute(text("INSERT INTO keywords (id, name) VALUES (1, 'PL')"))
+        conn.execute(
+            text(
+                "INSERT INTO user_keywords (id, user_id, keyword_id) "
+                "VALUES (1, 1, 1), (2, 1, 1)"
+            )
+        )
+    return engine
+
+
+def _index_names(engine, table):
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+def test_run_migrations_adds_indexes_to_legacy_database(legacy_engine):
+    assert get_schema_version(legacy_engine) == 0
+
+    assert run_migrations(legacy_engine) == LATEST_VERSION
+
+    assert "ix_user_keywords_user_id_keyword_id" in _index_names(
+        legacy_engine, "user_keywords"
+    )
+    assert "ix_paper_authors_author_id" in _index_names(legacy_engine, "paper_authors")
+    paper_indexes = _index_names(legacy_engine, "papers")
+    assert "ix_papers_published_date_id" in paper_indexes
+    # Superseded by the composite keyset index
+    assert "ix_papers_published_date" not in paper_indexes
+    with legacy_engine.connect() as conn:
+        # Duplicate subscriptions are collapsed before the unique index is built
+        assert conn.execute(text("SELECT COUNT(*) FROM user_keywords")).scalar() == 1
+    assert is_schema_current(legacy_engine)
+    inspector = inspect(legacy_engine)
+    assert inspector.has_table("summary_cache")
+    columns = {c["name"] for c in inspector.get_columns("papers")}
+    assert {
+        "summary_model",
+        "full_text",
+        "pdf_sha256",
+        "minhash",
+        "full_text_attempts",
+        "full_text_retry_at",
+    } <= columns
+    assert "home_seen_paper_id" in {c["name"] for c in inspector.get_columns("users")}
+
+
+def test_run_migrations_merges_duplicate_papers(legacy_engine):
+    with legacy_engine.begin() as conn:
+        conn.execute(text("INSERT INTO authors (id, name) VALUES (1, 'A'), (2, 'B')"))
+        conn.execute(
+            text(
+                "INSERT INTO papers (id, title, url, arxiv_id, published_date) "
+                "VALUES (1, 'P', 'http://arxiv.org/pdf/2301.00001v1', "
+                "'2301.00001v1', '2023-01-01'), "
+                "(2, 'P', 'https://arxiv.org/abs/2301.00001', NULL, '2023-01-01'), "
+                "(3, 'Quantum Error Correction', 'http://www.example.com/q/', NULL, "
+                "'2023-01-01')"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO paper_authors (paper_id, author_id) "
+                "VALUES (1, 1), (2, 1), (2, 2)"
+            )
+        )
+
+    run_migrations(legacy_engine)
+
+    with legacy_engine.connect() as conn:
+        papers = conn.execute(
+            text(
+                "SELECT id, canonical_url, arxiv_id, arxiv_version "
+                "FROM papers ORDER BY id"
+            )
+        ).all()
+        authors = conn.execute(
+            text("SELECT paper_id, author_id FROM paper_authors ORDER BY author_id")
+        ).all()
+    assert [tuple(p) for p in papers] == [
+        (1, "https://arxiv.org/abs/2301.00001", "2301.00001", 1),
+        (3, "https://example.com/q", None, None),
+    ]
+    assert [tuple(a) for a in authors] == [(1, 1), (1, 2)]
+    with legacy_engine.connect() as conn:
+        # Signatures are backfilled for near-duplicate detection, except for
+        # titles too short to tell apart
+        unsigned = conn.execute(text("SELECT id FROM papers WHERE minhash IS NULL"))
+        assert unsigned.scalars().all() == [1]
+    assert "ix_papers_canonical_url" in _index_names(legacy_engine, "papers")
+
+
+def test_backfilled_dates_page_like_any_other(legacy_engine):
+    with legacy_engine.begin() as conn:
+        conn.execute(
+            text(
+                # Dates as an earlier version 2 backfilled them
+                "INSERT INTO papers (id, title, url, published_date) VALUES "
+                "(1, 'A', 'http://example.com/a', '1970-01-01 00:00:00'), "
+                "(2, 'B', 'http://example.com/b', '1970-01-01 00:00:00'), "
+                "(3, 'C', 'http://example.com/c', '1970-01-01 00:00:00'), "
+                "(4, 'D', 'http://example.com/d', '1970-01-01 00:00:00'), "
+                "(5, 'E', 'http://example.com/e', '1970-01-01 00:00:00')"
+            )
+        )
+
+    run_migrations(legacy_engine)
+
+    db = sessionmaker(bind=legacy_engine)()
+    try:
+        service = PaperService(db)
+        paper_ids, cursor = [], None
+        while True:
+            page, cursor = service.get_papers_page(cursor=cursor, limit=2)
+            paper_ids += [paper.id for paper in page]
+            if cursor is None:
+                break
+        assert paper_ids == [1, 2, 3, 4, 5]
+        assert [paper.id for paper in service.iter_papers(batch_size=2)] == [
+            1,
+            2,
+            3,
+            4,
+            5,
+        ]
+    finally:
+        db.close()
+
+
+def test_keyset_index_backfill_binds_a_datetime(engine):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE papers (id INTEGER PRIMARY KEY, published_date DATETIME)"
+            )
+        )
+        conn.execute(text("INSERT INTO papers (id) VALUES (1)"))
+        v0002_paper_keyset_index.upgrade(conn)
+        stored = conn.execute(text("SELECT published_date FROM papers")).scalar()
+    assert stored == "1970-01-01 00:00:00.000000"
+
+
+def test_run_migrations_is_idempotent(legacy_engine):
+    run_migrations(legacy_engine)
+    assert run_migrations(legacy_engine) == LATEST_VERSION
+    with legacy_engine.connect() as conn:
+        assert (
+            conn.execute(text("SELECT COUNT(*) FROM schema_version")).scalar()
+            == LATEST_VERSION
+        )
+
+
+def test_existing_unique_constraint_covers_arxiv_id(engine):
+    with engine.begin() as conn:
+        conn.execute(
+            text("CREATE TABLE papers (id INTEGER PRIMARY KEY, arxiv_id TEXT UNIQUE)")
+        )
+        assert has_covering_index(conn, "papers", ["arxiv_id"])
+        assert has_covering_index(conn, "papers", ["id"], unique=True)
+        assert not has_covering_index(conn, "papers", ["arxiv_id", "id"])
+
+
+def test_init_db_skips_create_all_when_schema_is_current(engine):
+    from app.db.database import init_db
+
+    with patch("app.db.database.engine", engine):
+        init_db()
+        assert is_schema_current(engine)
+        with patch.object(Base.metadata, "create_all") as mock_create_all:
+            init_db()
+        mock_create_all.assert_not_called()
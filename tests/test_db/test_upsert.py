@@ -0,0 +1,79 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.models import Base, Author, Keyword
+from app.db.upsert import get_or_create_id, insert_ignore_returning_id, name_id_cache
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_insert_ignore_returning_id(db_session):
+    table = Keyword.__table__
+    new_id = insert_ignore_returning_id(db_session, table, {"name": "PL"}, ["name"])
+    assert new_id is not None
+    assert (
+        insert_ignore_returning_id(db_session, table, {"name": "PL"}, ["name"]) is None
+    )
+
+
+def test_insert_ignore_returning_id_savepoint_fallback(db_session):
+    table = Keyword.__table__
+    with patch("app.db.upsert._supports_on_conflict", return_value=False):
+        new_id = insert_ignore_returning_id(db_session, table, {"name": "PL"}, ["name"])
+        assert new_id is not None
+        # The lost race is rolled back to the savepoint, not the transaction
+        assert (
+            insert_ignore_returning_id(db_session, table, {"name": "PL"}, ["name"])
+            is None
+        )
+    assert db_session.query(Keyword).count() == 1
+
+
+def test_get_or_create_id_returns_existing_row(db_session):
+    first_id = get_or_create_id(db_session, Author, name="Alice")
+    assert get_or_create_id(db_session, Author, name="Alice") == first_id
+    assert db_session.query(Author).count() == 1
+
+
+def test_get_or_create_id_caches_only_committed_ids(db_session):
+    author_id = get_or_create_id(db_session, Author, name="Alice")
+    assert ("authors", "Alice") not in name_id_cache
+
+    db_session.rollback()
+    assert ("authors", "Alice") not in name_id_cache
+
+    author_id = get_or_create_id(db_session, Author, name="Alice")
+    db_session.commit()
+    assert name_id_cache.get(("authors", "Alice")) == author_id
+
+    # Hot names are served without a database round trip
+    with patch("app.db.upsert.insert_ignore_returning_id") as mock_insert:
+        assert get_or_create_id(db_session, Author, name="Alice") == author_id
+    mock_insert.assert_not_called()
+
+
+def test_cache_cleared_when_tables_dropped(db_session):
+    get_or_create_id(db_session, Author, name="Alice")
+    db_session.commit()
+    assert len(name_id_cache) > 0
+
+    db_session.close()
+    Base.metadata.drop_all(bind=engine)
+    assert len(name_id_cache) == 0
@@ -1,10 +1,29 @@
+import asyncio
 import pytest
+import google.generativeai as genai
+from google.ai import generativelanguage as glm
 from unittest.mock import MagicMock, patch, AsyncMock
-from app.services.ai_service import AIService
+from google.api_core.exceptions import ResourceExhausted
+from app.core.rate_limit import CircuitBreaker, CircuitOpenError
+from app.services.ai_service import (
+    CLIENT_CLOSE_GRACE_SECONDS,
+    AIService,
+    GeminiClientPool,
+    client_pool,
+)
 from tenacity import RetryError
 from contextlib import ExitStack
 
 
+@pytest.fixture(autouse=True)
+def clear_client_pool():
+    # Pooled model instances would otherwise outlive each test's mocks.
+    client_pool.clear()
+    with patch("google.ai.generativelanguage.GenerativeServiceAsyncClient"):
+        yield
+    client_pool.clear()
+
+
 @pytest.fixture
 def ai_service():
     return AIService(api_key="test_api_key")
@@ -53,3 +72,188 @@ async def test_summarize_text_exception(ai_service):
         )  # Default stop_after_attempt is 5
         assert mock_print.call_count == 5  # print is called on each retry attempt
         mock_print.assert_called_with("Error during summarization: Gemini error")
+
+
+@pytest.mark.asyncio
+async def test_summarize_batch_uses_one_structured_request(ai_service):
+    mock_response = MagicMock()
+    mock_response.text = '["First summary.", "Second summary."]'
+
+    with patch("google.generativeai.GenerativeModel") as mock_generative_model:
+        mock_instance = mock_generative_model.return_value
+        mock_instance.generate_content_async = AsyncMock(return_value=mock_response)
+
+        summaries = await ai_service.summarize_batch(["First text.", "Second text."])
+
+        assert summaries == ["First summary.", "Second summary."]
+        mock_instance.generate_content_async.assert_called_once()
+        generation_config = mock_instance.generate_content_async.call_args.kwargs[
+            "generation_config"
+        ]
+        assert generation_config["response_mime_type"] == "application/json"
+        prompt = mock_instance.generate_content_async.call_args.args[0]
+        assert "[1]\nFirst text." in prompt and "[2]\nSecond text." in prompt
+
+
+@pytest.mark.asyncio
+async def test_model_instances_are_reused_per_key():
+    mock_response = MagicMock()
+    mock_response.text = "Summarized text."
+
+    with (
+        patch("google.generativeai.configure") as mock_configure,
+        patch("google.generativeai.GenerativeModel") as mock_generative_model,
+    ):
+        mock_generative_model.return_value.generate_content_async = AsyncMock(
+            return_value=mock_response
+        )
+        await AIService("key-a").summarize_text("First.")
+        await AIService("key-a").summarize_text("Second.")
+
+        mock_generative_model.assert_called_once_with("gemini-1.5-flash")
+        mock_configure.assert_not_called()
+
+
+def test_client_pool_keeps_keys_apart_and_evicts_lru():
+    pool = GeminiClientPool(maxsize=2)
+    with (
+        patch("google.generativeai.GenerativeModel", side_effect=lambda m: MagicMock()),
+        patch(
+            "google.ai.generativelanguage.GenerativeServiceAsyncClient",
+            side_effect=lambda client_options: MagicMock(options=client_options),
+        ),
+    ):
+        model_a = pool.get_model("key-a", "gemini-1.5-flash")
+        model_b = pool.get_model("key-b", "gemini-1.5-flash")
+        assert model_a is not model_b
+        assert model_a._async_client.options == {"api_key": "key-a"}
+        assert model_b._async_client.options == {"api_key": "key-b"}
+        assert pool.get_model("key-a", "gemini-1.5-flash") is model_a
+
+        pool.get_model("key-c", "gemini-1.5-flash")
+        assert len(pool) == 2
+        # key-b was least recently used, so it gets a fresh model
+        assert pool.get_model("key-b", "gemini-1.5-flash") is not model_b
+
+
+async def test_client_pool_closes_evicted_clients():
+    pool = GeminiClientPool(maxsize=1)
+    with patch(
+        "google.ai.generativelanguage.GenerativeServiceAsyncClient",
+        side_effect=lambda client_options: MagicMock(),
+    ):
+        model_a = pool.get_model("key-a", "gemini-1.5-flash")
+        close_a = model_a._async_client.transport.grpc_channel.close = AsyncMock()
+        model_b = pool.get_model("key-b", "gemini-1.5-flash")
+        close_b = model_b._async_client.transport.grpc_channel.close = AsyncMock()
+        await asyncio.sleep(0)
+
+        close_a.assert_awaited_once_with(CLIENT_CLOSE_GRACE_SECONDS)
+        close_b.assert_not_called()
+
+        pool.clear()
+        await asyncio.sleep(0)
+        close_b.assert_awaited_once_with(CLIENT_CLOSE_GRACE_SECONDS)
+
+
+async def test_pooled_client_is_used_by_generative_model():
+    # GeminiClientPool sets the private GenerativeModel._async_client; this
+    # fails if google-generativeai renames it or stops calling through it.
+    assert "_async_client" in vars(genai.GenerativeModel("gemini-1.5-flash"))
+
+    client = MagicMock()
+    client.generate_content = AsyncMock(
+        return_value=glm.GenerateContentResponse(
+            candidates=[
+                glm.Candidate(content=glm.Content(parts=[glm.Part(text="Hi.")]))
+            ]
+        )
+    )
+    with patch(
+        "google.ai.generativelanguage.GenerativeServiceAsyncClient",
+        return_value=client,
+    ):
+        model = GeminiClientPool(maxsize=1).get_model("key-a", "gemini-1.5-flash")
+    response = await model.generate_content_async("Hello.")
+
+    assert response.text == "Hi."
+    client.generate_content.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stream_summary_yields_chunks(ai_service):
+    async def chunks():
+        for text in ("Partial ", "summary."):
+            yield MagicMock(text=text)
+
+    with patch("google.generativeai.GenerativeModel") as mock_generative_model:
+        mock_instance = mock_generative_model.return_value
+        mock_instance.generate_content_async = AsyncMock(return_value=chunks())
+
+        parts = [part async for part in ai_service.stream_summary("Long text.")]
+
+        assert parts == ["Partial ", "summary."]
+        mock_instance.generate_content_async.assert_called_once_with(
+            "Please summarize the following text: \n\nLong text.", stream=True
+        )
+
+
+@pytest.mark.asyncio
+async def test_summarize_text_map_reduces_long_input(ai_service):
+    prompts = []
+
+    async def generate(prompt):
+        prompts.append(prompt)
+        return MagicMock(text=f"summary {len(prompts)}")
+
+    sections = [f"{i} Section\n" + "Body sentence. " * 40 for i in range(1, 4)]
+    with (
+        patch("app.services.ai_service.settings.SUMMARY_MAX_INPUT_TOKENS", 200),
+        patch("app.services.ai_service.settings.SUMMARY_CHUNK_TOKENS", 200),
+        patch("google.generativeai.GenerativeModel") as mock_generative_model,
+    ):
+        mock_generative_model.return_value.generate_content_async = AsyncMock(
+            side_effect=generate
+        )
+        summary = await ai_service.summarize_text("\n".join(sections))
+
+    # One map request per section, then one reduce over the partial summaries
+    assert len(prompts) == 4
+    assert "keeping every key claim" in prompts[0]
+    assert "summary 1\n\nsummary 2\n\nsummary 3" in prompts[-1]
+    assert summary == "summary 4"
+
+
+@pytest.mark.asyncio
+async def test_quota_errors_fail_fast_and_open_the_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=60)
+    ai_service = AIService("shared-key", circuit_breaker=breaker)
+
+    with (
+        patch("google.generativeai.GenerativeModel") as mock_generative_model,
+        patch("builtins.print"),
+    ):
+        mock_instance = mock_generative_model.return_value
+        mock_instance.generate_content_async = AsyncMock(
+            side_effect=ResourceExhausted("quota")
+        )
+
+        with pytest.raises(ResourceExhausted):
+            await ai_service.summarize_text("Some text.")
+        # Not retried
+        assert mock_instance.generate_content_async.call_count == 1
+
+        with pytest.raises(CircuitOpenError):
+            await ai_service.summarize_text("Other text.")
+        assert mock_instance.generate_content_async.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_extractive_model_never_calls_gemini(ai_service):
+    with patch("google.generativeai.GenerativeModel") as mock_generative_model:
+        summary = await ai_service.summarize_text(
+            "One. Two. Three. Four.", model="extractive"
+        )
+
+    assert summary == "One. Two. Three."
+    mock_generative_model.assert_not_called()
@@ -0,0 +1,107 @@
+import arxiv
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from app.services.arxiv_resolver import ArxivResolver
+
+
+def _result(arxiv_id):
+    result = MagicMock()
+    result.title = f"Paper {arxiv_id}"
+    result.pdf_url = f"http://arxiv.org/pdf/{arxiv_id}v1"
+    result.summary = f"Abstract of {arxiv_id}."
+    result.authors = []
+    result.published = datetime(2023, 1, 1)
+    result.entry_id = f"http://arxiv.org/abs/{arxiv_id}v1"
+    result.get_short_id = lambda: arxiv.Result.get_short_id(result)
+    return result
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    # arXiv answers every requested ID except the unknown one
+    client.results.side_effect = lambda search: [
+        _result(i) for i in search.id_list if i != "0000.00000"
+    ]
+    return client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_request(client):
+    resolver = ArxivResolver(client=client, window_seconds=0.01)
+
+    first, again, unknown = await asyncio.gather(
+        resolver.resolve("2301.00001"),
+        resolver.resolve("2301.00001v1"),
+        resolver.resolve("0000.00000"),
+    )
+
+    assert client.results.call_count == 1
+    assert first is again
+    assert first["title"] == "Paper 2301.00001"
+    assert first["arxiv_id"] == "2301.00001v1"
+    assert unknown is None
+
+
+@pytest.mark.asyncio
+async def test_old_style_ids_resolve(client):
+    resolver = ArxivResolver(client=client, window_seconds=0.01)
+
+    paper_data = await resolver.resolve("hep-th/9901001")
+
+    assert paper_data["title"] == "Paper hep-th/9901001"
+
+
+@pytest.mark.asyncio
+async def test_resolve_many_batches_and_caches(client):
+    resolver = ArxivResolver(client=client, window_seconds=0.01, batch_size=200)
+    arxiv_ids = [f"2301.{i:05d}" for i in range(1, 1001)]
+
+    resolved = await resolver.resolve_many(arxiv_ids)
+
+    assert len(resolved) == 1000
+    assert all(paper_data is not None for paper_data in resolved.values())
+    assert client.results.call_count == 5
+    assert all(len(c.args[0].id_list) == 200 for c in client.results.call_args_list)
+
+    # Answered from the cache
+    await resolver.resolve("2301.00042")
+    assert client.results.call_count == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_request_reaches_every_caller(client):
+    client.results.side_effect = Exception("arXiv is down")
+    resolver = ArxivResolver(client=client, window_seconds=0.01)
+
+    results = await asyncio.gather(
+        resolver.resolve("2301.00001"),
+        resolver.resolve("2301.00002"),
+        return_exceptions=True,
+    )
+
+    assert [str(r) for r in results] == ["arXiv is down"] * 2
+    # The batch, then each ID on its own
+    assert client.results.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_bad_id_fails_only_its_own_callers(client):
+    def results(search):
+        if "bad-id" in search.id_list:
+            raise Exception("malformed id")
+        return [_result(i) for i in search.id_list]
+
+    client.results.side_effect = results
+    resolver = ArxivResolver(client=client, window_seconds=0.01)
+
+    good, bad = await asyncio.gather(
+        resolver.resolve("2301.00001"),
+        resolver.resolve("bad-id"),
+        return_exceptions=True,
+    )
+
+    assert good["title"] == "Paper 2301.00001"
+    assert str(bad) == "malformed id"
@@ -0,0 +1,162 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db.models import Base, Paper
+from app.db.schemas import PaperCreate
+from app.services.enrichment_service import EnrichmentService
+from app.services.paper_service import PaperService
+
+# Saves run on the dedicated writer thread, so the in-memory database must be
+# shared across threads.
+engine = create_engine(
+    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def summary_cache():
+    with patch("app.services.enrichment_service.summary_cache") as mock_cache:
+        mock_cache.put = AsyncMock()
+        yield mock_cache
+
+
+def _create_papers(db_session, count, abstract="An abstract."):
+    paper_service = PaperService(db_session)
+    return [
+        paper_service.create_paper(
+            PaperCreate(
+                title=f"Paper {i}",
+                url=f"http://example.com/{i}",
+                summary=abstract,
+            )
+        )
+        for i in range(count)
+    ]
+
+
+def _echo_ai_service():
+    ai_service = MagicMock()
+
+    async def summarize_batch(texts, model, length_instruction):
+        return [f"Summary of {text}" for text in texts]
+
+    ai_service.summarize_batch = AsyncMock(side_effect=summarize_batch)
+    return ai_service
+
+
+def test_plan_batches_respects_size_tokens_and_budget(db_session):
+    papers = _create_papers(db_session, 5, abstract="x" * 396)  # 100 tokens each
+    service = EnrichmentService(
+        db_session,
+        MagicMock(),
+        batch_size=2,
+        batch_max_tokens=1000,
+        token_budget=450,
+    )
+    assert [len(batch) for batch in service._plan_batches(papers)] == [2, 2]
+
+    service = EnrichmentService(
+        db_session, MagicMock(), batch_size=10, batch_max_tokens=150
+    )
+    assert [len(batch) for batch in service._plan_batches(papers)] == [1] * 5
+
+
+@pytest.mark.asyncio
+async def test_summarize_papers_updates_papers(db_session, summary_cache):
+    papers = _create_papers(db_session, 3)
+    ai_service = _echo_ai_service()
+
+    summarized = await EnrichmentService(
+        db_session, ai_service, batch_size=2
+    ).summarize_papers(papers)
+
+    assert summarized == 3
+    assert ai_service.summarize_batch.await_count == 2
+    assert summary_cache.put.await_count == 3
+    assert EnrichmentService(db_session, ai_service).get_pending_papers() == []
+    paper = db_session.query(Paper).first()
+    assert paper.summary == "Summary of An abstract."
+    assert paper.summary_model == "gemini-1.5-flash"
+
+
+@pytest.mark.asyncio
+async def test_summarize_papers_bounds_concurrency(db_session):
+    papers = _create_papers(db_session, 6)
+    running = 0
+    peak = 0
+
+    async def summarize_batch(texts, model, length_instruction):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return ["Summary."] * len(texts)
+
+    ai_service = MagicMock()
+    ai_service.summarize_batch = AsyncMock(side_effect=summarize_batch)
+
+    await EnrichmentService(
+        db_session, ai_service, concurrency=2, batch_size=1
+    ).summarize_papers(papers)
+
+    assert ai_service.summarize_batch.await_count == 6
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_to_extractive_preview(db_session):
+    papers = _create_papers(
+        db_session, 2, abstract="First point. Second point. Third. Fourth."
+    )
+    ai_service = MagicMock()
+    ai_service.summarize_batch = AsyncMock(side_effect=Exception("Gemini error"))
+    service = EnrichmentService(db_session, ai_service)
+
+    assert await service.summarize_papers(papers) == 2
+    assert {paper.summary_model for paper in papers} == {"extractive"}
+    assert all(paper.summary.count(".") == 3 for paper in papers)
+
+
+@pytest.mark.asyncio
+async def test_previewed_papers_keep_their_abstract_for_the_next_run(db_session):
+    abstract = "First point. Second point. Third. Fourth."
+    papers = _create_papers(db_session, 2, abstract=abstract)
+    failing = MagicMock()
+    failing.summarize_batch = AsyncMock(side_effect=Exception("Gemini error"))
+    await EnrichmentService(db_session, failing).summarize_papers(papers)
+
+    service = EnrichmentService(db_session, _echo_ai_service())
+    pending = service.get_pending_papers()
+    assert pending == papers
+    assert await service.summarize_papers(pending) == 2
+
+    assert {paper.summary for paper in papers} == {f"Summary of {abstract}"}
+    assert {paper.summary_model for paper in papers} == {"gemini-1.5-flash"}
+    assert {paper.abstract for paper in papers} == {abstract}
+    assert service.get_pending_papers() == []
+
+
+@pytest.mark.asyncio
+async def test_summarize_papers_without_gemini_previews_everything(db_session):
+    papers = _create_papers(db_session, 3)
+
+    assert await EnrichmentService(db_session, None).summarize_papers(papers) == 3
+    assert EnrichmentService(db_session, None).get_pending_papers() == []
+    assert papers[0].summary == "An abstract."
+    assert papers[0].summary_model == "extractive"
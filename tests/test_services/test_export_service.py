@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.models import Base
+from app.db.schemas import PaperCreate
+from app.services import export_service
+from app.services.export_service import ExportService
+from app.services.paper_service import PaperService
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def export(db_session):
+    paper_service = PaperService(db_session)
+    paper_service.create_paper(
+        PaperCreate(
+            title="Gradual Typing",
+            url="http://example.com/gradual",
+            summary="About types.",
+            published_date=datetime(2023, 1, 1),
+            arxiv_id="2301.00001",
+            author_names=["Jane Smith", "John Doe"],
+            keyword_names=["PL"],
+        )
+    )
+    paper_service.create_paper(
+        PaperCreate(
+            title="Deep Learning",
+            url="http://example.com/dl",
+            published_date=datetime(2024, 1, 1),
+            author_names=["Alice"],
+            keyword_names=["ML"],
+        )
+    )
+    return ExportService(db_session)
+
+
+def test_export_jsonl(export):
+    lines = "".join(export.stream("jsonl")).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [r["title"] for r in records] == ["Gradual Typing", "Deep Learning"]
+    assert records[0]["authors"] == ["Jane Smith", "John Doe"]
+    assert records[0]["summary"] == "About types."
+
+
+def test_export_csv(export):
+    rows = list(csv.reader(io.StringIO("".join(export.stream("csv")))))
+    assert rows[0] == export_service.CSV_COLUMNS
+    assert rows[1][1] == "Gradual Typing"
+    assert rows[1][5] == "Jane Smith; John Doe"
+
+
+def test_export_bibtex(export):
+    bibtex = "".join(export.stream("bibtex"))
+    assert "@article{2301.00001," in bibtex
+    assert "  author = {Jane Smith and John Doe}," in bibtex
+    assert "@article{paper2," in bibtex
+
+
+def test_export_filters(export):
+    by_keyword = "".join(export.stream("jsonl", keyword="ML"))
+    assert "Deep Learning" in by_keyword and "Gradual Typing" not in by_keyword
+
+    by_author = "".join(export.stream("jsonl", author="John Doe"))
+    assert "Gradual Typing" in by_author and "Deep Learning" not in by_author
+
+    by_date = "".join(export.stream("jsonl", since=datetime(2023, 6, 1)))
+    assert "Deep Learning" in by_date and "Gradual Typing" not in by_date
+
+
+def test_export_streams_in_chunks(export, monkeypatch):
+    monkeypatch.setattr(export_service, "EXPORT_CHUNK_SIZE", 1)
+    assert len(list(export.stream("jsonl"))) == 2
+
+
+def test_export_rejects_unknown_format(export):
+    with pytest.raises(ValueError):
+        list(export.stream("xml"))
@@ -0,0 +1,51 @@
+import time
+from app.services.extractive_summarizer import (
+    rank_sentences,
+    sentences_for_instruction,
+    split_sentences,
+    summarize_extractive,
+)
+
+ABSTRACT = (
+    "We propose a new type system for gradual typing. "
+    "The weather was pleasant during the conference. "
+    "Our gradual type system is sound and supports blame tracking. "
+    "We evaluate the gradual type system on ten benchmarks. "
+    "Lunch was served at noon."
+)
+
+
+def test_split_sentences():
+    assert split_sentences("One. Two? Three!") == ["One.", "Two?", "Three!"]
+
+
+def test_central_sentences_win_and_keep_their_order():
+    summary = summarize_extractive(ABSTRACT, max_sentences=3)
+    assert summary == (
+        "We propose a new type system for gradual typing. "
+        "Our gradual type system is sound and supports blame tracking. "
+        "We evaluate the gradual type system on ten benchmarks."
+    )
+
+
+def test_short_text_is_returned_whole():
+    assert summarize_extractive("Only one sentence.") == "Only one sentence."
+
+
+def test_rank_sentences_without_shared_words_is_uniform():
+    scores = rank_sentences(["Alpha.", "Beta.", "Gamma."])
+    assert scores.tolist() == [scores[0]] * 3
+
+
+def test_sentences_for_instruction():
+    assert sentences_for_instruction("in three sentences") == 3
+    assert sentences_for_instruction("in 5 sentences") == 5
+    assert sentences_for_instruction("") == 3
+
+
+def test_summarizes_thousands_of_abstracts_per_second():
+    started = time.perf_counter()
+    for _ in range(1000):
+        summarize_extractive(ABSTRACT)
+    # Generous bound so slow CI machines do not flake
+    assert time.perf_counter() - started < 2.0
@@ -0,0 +1,186 @@
+import os
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.config import settings
+from app.db.models import Base, Paper
+from app.services.full_text_service import FullTextService, pdf_url
+from app.services.pdf_cache import NotAPdfError, PdfCache, PdfTooLargeError
+from app.services.pdf_text import compress_text, decompress_text, extract_pdf_text
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "sample_paper.pdf")
+
+# Writes run on the dedicated writer thread, so the in-memory database must
+# be shared across threads.
+engine = create_engine(
+    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+async def pdf_server():
+    with open(FIXTURE, "rb") as f:
+        sample = f.read()
+
+    async def serve(request):
+        name = request.match_info["name"]
+        if name == "sample.pdf":
+            return web.Response(body=sample, content_type="application/pdf")
+        if name.startswith("padded"):
+            # Distinct content per name, so each has its own digest
+            return web.Response(body=sample + name.encode() * 100)
+        if name == "page.html":
+            return web.Response(text="<html></html>", content_type="text/html")
+        raise web.HTTPNotFound()
+
+    app = web.Application()
+    app.router.add_get("/{name}", serve)
+    async with TestServer(app) as server:
+        yield server
+
+
+def test_extract_pdf_text_from_fixture():
+    text = extract_pdf_text(FIXTURE)
+    assert text.startswith("Attention Is All You Need")
+    assert "28.4 BLEU" in text
+    # Pages are separated by a blank line
+    assert "architecture.\n\nResults" in text
+
+
+def test_compressed_text_round_trips():
+    text = "Transformers " * 1000
+    compressed = compress_text(text)
+    assert len(compressed) < len(text) // 10
+    assert decompress_text(compressed) == text
+
+
+def test_pdf_url_prefers_arxiv_pdf():
+    assert (
+        pdf_url(Paper(url="https://arxiv.org/abs/1706.03762", arxiv_id="1706.03762"))
+        == "https://arxiv.org/pdf/1706.03762.pdf"
+    )
+    assert pdf_url(Paper(url="http://example.com/a.pdf")) == "http://example.com/a.pdf"
+
+
+@pytest.mark.asyncio
+async def test_pdf_cache_is_content_addressed(tmp_path, pdf_server):
+    cache = PdfCache(str(tmp_path))
+    async with ClientSession() as session:
+        first = await cache.download(session, str(pdf_server.make_url("/sample.pdf")))
+        second = await cache.download(session, str(pdf_server.make_url("/sample.pdf")))
+
+    assert first == second
+    assert cache.get(first) == cache.path_for(first)
+    assert os.listdir(tmp_path) == [f"{first}.pdf"]
+    assert cache.get("0" * 64) is None
+
+
+@pytest.mark.asyncio
+async def test_pdf_cache_evicts_least_recently_used(tmp_path, pdf_server):
+    size = os.path.getsize(FIXTURE) + 1000
+    cache = PdfCache(str(tmp_path), max_bytes=size * 2 + 10)
+    async with ClientSession() as session:
+        digests = []
+        for name in ("padded-a", "padded-b"):
+            digests.append(
+                await cache.download(session, str(pdf_server.make_url(f"/{name}")))
+            )
+        # Make the first file the most recently used one
+        os.utime(cache.path_for(digests[1]), (1, 1))
+        assert cache.get(digests[0])
+        digests.append(
+            await cache.download(session, str(pdf_server.make_url("/padded-c")))
+        )
+
+    assert cache.get(digests[1]) is None
+    assert cache.get(digests[0]) and cache.get(digests[2])
+
+
+@pytest.mark.asyncio
+async def test_pdf_cache_rejects_bad_downloads(tmp_path, pdf_server):
+    cache = PdfCache(str(tmp_path), max_file_bytes=100)
+    async with ClientSession() as session:
+        with pytest.raises(NotAPdfError):
+            await cache.download(session, str(pdf_server.make_url("/page.html")))
+        with pytest.raises(PdfTooLargeError):
+            await cache.download(session, str(pdf_server.make_url("/sample.pdf")))
+
+    # Partial downloads are cleaned up
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_fetch_papers_stores_compressed_text(tmp_path, pdf_server, db_session):
+    papers = [
+        Paper(title="Sample", url=str(pdf_server.make_url("/sample.pdf"))),
+        Paper(title="Missing", url=str(pdf_server.make_url("/missing.pdf"))),
+    ]
+    db_session.add_all(papers)
+    db_session.commit()
+    service = FullTextService(db_session, cache=PdfCache(str(tmp_path)))
+
+    assert await service.fetch_papers(service.get_pending_papers()) == 1
+
+    assert "28.4 BLEU" in service.get_full_text(papers[0])
+    assert papers[0].pdf_sha256 is not None
+    assert service.get_full_text(papers[1]) is None
+    # The failed download backs off before it is retried
+    assert papers[1].full_text_attempts == 1
+    assert service.get_pending_papers() == []
+    papers[1].full_text_retry_at = datetime(2000, 1, 1)
+    db_session.commit()
+    assert service.get_pending_papers() == [papers[1]]
+
+
+@pytest.mark.asyncio
+async def test_fetch_papers_gives_up_on_permanent_failures(
+    tmp_path, pdf_server, db_session
+):
+    papers = [
+        Paper(title="Page", url=str(pdf_server.make_url("/page.html"))),
+        Paper(title="Sample", url=str(pdf_server.make_url("/sample.pdf"))),
+    ]
+    db_session.add_all(papers)
+    db_session.commit()
+    service = FullTextService(db_session, cache=PdfCache(str(tmp_path)))
+
+    assert await service.fetch_papers(service.get_pending_papers(limit=1)) == 0
+
+    # A page that is not a PDF no longer blocks the batch
+    assert papers[0].full_text_attempts == settings.FULL_TEXT_MAX_ATTEMPTS
+    assert service.get_pending_papers(limit=1) == [papers[1]]
+
+
+@pytest.mark.asyncio
+async def test_fetch_papers_stops_after_max_attempts(tmp_path, pdf_server, db_session):
+    paper = Paper(title="Missing", url=str(pdf_server.make_url("/missing.pdf")))
+    db_session.add(paper)
+    db_session.commit()
+    service = FullTextService(db_session, cache=PdfCache(str(tmp_path)))
+
+    with patch("app.services.full_text_service.settings.FULL_TEXT_MAX_ATTEMPTS", 2):
+        for _ in range(2):
+            paper.full_text_retry_at = None
+            db_session.commit()
+            await service.fetch_papers(service.get_pending_papers())
+        paper.full_text_retry_at = None
+        db_session.commit()
+        assert service.get_pending_papers() == []
+    assert paper.full_text_attempts == 2
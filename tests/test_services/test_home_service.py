@@ -0,0 +1,150 @@
+import asyncio
+import pytest
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db.models import Base, User
+from app.db.schemas import PaperCreate
+from app.services.home_service import HomeService, HomeViewPublisher
+from app.services.paper_service import PaperService
+from app.services.user_subscription_service import UserSubscriptionService
+
+# Seen markers are written on the dedicated writer thread, so the in-memory
+# database must be shared across threads.
+engine = create_engine(
+    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@contextmanager
+def _session_scope(read_only=False):
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    with patch("app.services.home_service.session_scope", _session_scope):
+        yield db
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def subscribed(db_session):
+    subscriptions = UserSubscriptionService(db_session)
+    subscriptions.subscribe_keyword("U1", "graphs")
+    subscriptions.subscribe_author("U1", "Ada Lovelace")
+    paper_service = PaperService(db_session)
+    for i, (keywords, authors) in enumerate(
+        [(["graphs"], []), (["robots"], ["Ada Lovelace"]), (["robots"], [])]
+    ):
+        paper_service.create_paper(
+            PaperCreate(
+                title=f"Paper {i}",
+                url=f"http://example.com/{i}",
+                keyword_names=keywords,
+                author_names=authors,
+            )
+        )
+
+
+def _home_text(view):
+    return "\n".join(
+        block["text"]["text"] for block in view["blocks"] if "text" in block
+    )
+
+
+def test_build_view_lists_subscriptions_and_matched_papers(db_session, subscribed):
+    view, newest = HomeService(db_session).build_view("U1", 10)
+
+    text = _home_text(view)
+    assert "*구독 키워드:* graphs" in text
+    assert "*구독 저자:* Ada Lovelace" in text
+    assert "새 논문 2편" in text
+    assert text.index("Paper 1") < text.index("Paper 0")
+    assert "Paper 2" not in text
+    assert newest == 2
+
+    HomeService(db_session).mark_seen("U1", newest)
+    view, newest = HomeService(db_session).build_view("U1", 10)
+    assert "새 논문 0편" in _home_text(view)
+    assert newest is None
+
+
+def test_build_view_for_unknown_user_does_not_create_one(db_session):
+    view, newest = HomeService(db_session).build_view("U404", 10)
+
+    assert "아직 구독과 일치하는 논문이 없습니다." in _home_text(view)
+    assert newest is None
+    assert db_session.scalar(select(User)) is None
+
+
+@pytest.mark.asyncio
+async def test_publish_renders_once_until_invalidated(db_session, subscribed):
+    publisher = HomeViewPublisher(debounce_seconds=0)
+    client = MagicMock(views_publish=AsyncMock())
+
+    with patch.object(
+        HomeService,
+        "build_view",
+        autospec=True,
+        side_effect=HomeService.build_view,
+    ) as spy:
+        await publisher.publish(client, "U1")
+        await publisher.publish(client, "U1")
+        assert spy.call_count == 1
+        assert client.views_publish.await_count == 1
+
+        publisher.invalidate("U1")
+        await publisher.publish(client, "U1")
+        assert spy.call_count == 2
+        assert client.views_publish.await_count == 2
+
+    # The first render marked the matched papers seen.
+    user = db_session.scalar(select(User).where(User.slack_user_id == "U1"))
+    db_session.refresh(user)
+    assert user.home_seen_paper_id == 2
+    assert "새 논문 0편" in _home_text(client.views_publish.call_args.kwargs["view"])
+
+
+@pytest.mark.asyncio
+async def test_rapid_opens_share_one_debounced_publish(subscribed):
+    publisher = HomeViewPublisher(debounce_seconds=0.05)
+    client = MagicMock(views_publish=AsyncMock())
+    await publisher.publish(client, "U1")
+
+    publisher.invalidate("U1")
+    await asyncio.gather(*(publisher.publish(client, "U1") for _ in range(5)))
+
+    assert client.views_publish.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_subscription_changes_invalidate_the_cached_view(db_session):
+    with patch("app.services.user_subscription_service.home_views") as mock_home_views:
+        UserSubscriptionService(db_session).subscribe_keyword("U1", "graphs")
+
+    mock_home_views.invalidate.assert_called_once_with("U1")
+
+
+def test_new_papers_invalidate_their_subscribers_homes(db_session, subscribed):
+    publisher = HomeViewPublisher()
+    for user in ("U1", "U2"):
+        publisher._views.put(user, {"type": "home"})
+    paper = PaperService(db_session).create_paper(
+        PaperCreate(title="New", url="http://example.com/new", keyword_names=["graphs"])
+    )
+
+    publisher.invalidate_for_papers(db_session, [paper.id])
+
+    assert "U1" not in publisher._views
+    assert "U2" in publisher._views
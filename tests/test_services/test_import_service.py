@@ -0,0 +1,162 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db.models import Base, Paper
+from app.db.schemas import PaperCreate
+from app.services.bibtex_service import parse_bibtex_chunk, split_bibtex_entries
+from app.services.import_service import BibtexImportService
+from app.services.paper_service import PaperService
+
+# Writes run on the dedicated writer thread, so the in-memory database must
+# be shared across threads.
+engine = create_engine(
+    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+BIBTEX = """@article{first,
+  title = {First Paper},
+  author = {Doe, Jane and Roe, Rick},
+  url = {http://example.com/first},
+  year = {2023},
+  month = {mar},
+  keywords = {PL, Types}
+}
+
+@article{second,
+  title = {Second Paper},
+  author = {Doe, Jane},
+  eprint = {2301.00002},
+  year = {2023}
+}
+
+@article{duplicate,
+  title = {First Paper Again},
+  url = {http://example.com/first}
+}
+
+@article{untitled,
+  author = {Nobody}
+}
+"""
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_split_bibtex_entries_splits_at_entry_starts():
+    chunks = list(split_bibtex_entries(BIBTEX.splitlines(keepends=True), 2))
+    assert len(chunks) == 2
+    assert chunks[0].lstrip().startswith("@article{first")
+    assert chunks[1].lstrip().startswith("@article{duplicate")
+    assert "".join(chunks) == BIBTEX
+
+
+def test_split_bibtex_entries_repeats_macros_in_later_chunks():
+    bibtex = (
+        '@string{pl = "Programming Languages"}\n'
+        "@article{a,\n  title = pl,\n  url = {http://example.com/a}\n}\n"
+        "@article{b,\n  title = pl # { Again},\n  url = {http://example.com/b}\n}\n"
+    )
+    chunks = list(split_bibtex_entries(bibtex.splitlines(keepends=True), 1))
+    assert len(chunks) == 2
+    assert chunks[1].startswith("@string{pl")
+    assert [parse_bibtex_chunk(chunk)[0]["title"] for chunk in chunks] == [
+        "Programming Languages",
+        "Programming Languages Again",
+    ]
+
+
+def test_parse_bibtex_chunk_returns_paper_data():
+    papers_data = parse_bibtex_chunk(BIBTEX)
+    assert papers_data[0]["authors"] == ["Doe, Jane", "Roe, Rick"]
+    assert papers_data[0]["keywords"] == ["PL", "Types"]
+    assert papers_data[0]["published_date"].month == 3
+    assert papers_data[1]["arxiv_id"] == "2301.00002"
+
+
+@pytest.mark.asyncio
+async def test_import_lines_creates_and_dedupes(db_session):
+    PaperService(db_session).create_paper(
+        PaperCreate(
+            title="Existing",
+            url="https://arxiv.org/pdf/2301.00002.pdf",
+            arxiv_id="2301.00002",
+        )
+    )
+
+    result = await BibtexImportService(db_session, chunk_size=2).import_lines(
+        BIBTEX.splitlines(keepends=True)
+    )
+
+    assert (result.created, result.duplicates, result.invalid) == (1, 2, 1)
+    titles = {title for (title,) in db_session.query(Paper.title)}
+    assert titles == {"Existing", "First Paper"}
+    first = db_session.query(Paper).filter(Paper.title == "First Paper").one()
+    assert {a.name for a in first.authors} == {"Doe, Jane", "Roe, Rick"}
+
+
+@pytest.mark.asyncio
+async def test_import_lines_skips_near_duplicates(db_session):
+    abstract = "Residual learning eases the training of very deep networks."
+    PaperService(db_session).create_paper(
+        PaperCreate(
+            title="Deep Residual Learning for Image Recognition",
+            url="https://arxiv.org/abs/1512.03385",
+            summary=abstract,
+        )
+    )
+    bibtex = f"""@inproceedings{{he2016,
+  title = {{Deep residual learning for image recognition}},
+  url = {{https://publisher.example.com/he2016}},
+  abstract = {{{abstract}}}
+}}
+"""
+
+    result = await BibtexImportService(db_session).import_lines(
+        bibtex.splitlines(keepends=True)
+    )
+
+    assert (result.created, result.duplicates) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_import_lines_invalidates_matching_homes(db_session):
+    with patch("app.services.import_service.home_views") as mock_home_views:
+        await BibtexImportService(db_session, chunk_size=10).import_lines(
+            BIBTEX.splitlines(keepends=True)
+        )
+
+    first = db_session.query(Paper).filter(Paper.title == "First Paper").one()
+    paper_ids = [
+        paper_id
+        for call in mock_home_views.invalidate_for_papers.call_args_list
+        for paper_id in call.args[1]
+    ]
+    assert first.id in paper_ids
+
+
+@pytest.mark.asyncio
+async def test_import_lines_keeps_good_entries_of_a_bad_chunk(db_session):
+    bibtex = (
+        "@article{a,\n  title = {Good},\n  url = {http://example.com/a}\n}\n"
+        "@article{b,\n  title = undefined,\n  url = {http://example.com/b}\n}\n"
+        "@article{c,\n  title = missing,\n  url = {http://example.com/c}\n}\n"
+    )
+
+    result = await BibtexImportService(db_session, chunk_size=10).import_lines(
+        bibtex.splitlines(keepends=True)
+    )
+
+    assert (result.created, result.duplicates, result.invalid) == (1, 0, 2)
+    assert [title for (title,) in db_session.query(Paper.title)] == ["Good"]
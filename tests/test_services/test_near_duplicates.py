@@ -0,0 +1,51 @@
+import numpy as np
+from app.services.near_duplicates import (
+    LSHIndex,
+    estimated_similarity,
+    minhash_signature,
+    shingles,
+    signature_from_bytes,
+    signature_to_bytes,
+)
+
+TITLE = "Attention Is All You Need"
+ABSTRACT = (
+    "We propose the Transformer, a model architecture based solely on "
+    "attention mechanisms, dispensing with recurrence and convolutions entirely."
+)
+
+
+def test_shingles_ignore_case_and_punctuation():
+    assert shingles("Hello, World!") == shingles("hello world")
+    assert shingles("abc") == {"abc"}
+    assert shingles("  ") == set()
+
+
+def test_signature_estimates_similarity():
+    original = minhash_signature(TITLE, ABSTRACT)
+    reworded = minhash_signature(
+        "Attention is all you need.", ABSTRACT.replace(" entirely", "")
+    )
+    unrelated = minhash_signature(
+        "Deep Residual Learning", "A residual framework eases network training."
+    )
+
+    assert estimated_similarity(original, reworded) > 0.8
+    assert estimated_similarity(original, unrelated) < 0.2
+    assert np.array_equal(signature_from_bytes(signature_to_bytes(original)), original)
+
+
+def test_placeholder_text_gets_no_signature():
+    assert minhash_signature("", "N/A") is None
+    assert minhash_signature("Untitled", None) is None
+
+
+def test_lsh_index_returns_only_colliding_papers():
+    index = LSHIndex()
+    index.add(1, minhash_signature(TITLE, ABSTRACT))
+    index.add(2, minhash_signature("Deep Residual Learning", "Residual nets."))
+
+    assert index.candidates(minhash_signature(TITLE + ".", ABSTRACT)) == {1}
+
+    index.remove(1, minhash_signature(TITLE, ABSTRACT))
+    assert index.candidates(minhash_signature(TITLE, ABSTRACT)) == set()
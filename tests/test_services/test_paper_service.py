@@ -1,9 +1,13 @@
 import pytest
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import patch, AsyncMock
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.db.models import Base, Paper
+from app.core.rate_limit import CircuitOpenError
+from app.services.near_duplicates import near_duplicate_index
 from app.services.paper_service import PaperService
+from app.services.pdf_text import compress_text
+from app.services.summary_cache import SummaryCache
 from app.services.user_service import UserService
 from app.db.schemas import PaperCreate, PaperUpdate
 from datetime import datetime
@@ -38,11 +42,23 @@ def user_service(db_session):
     return UserService(db_session)
 
 
+@pytest.fixture(autouse=True)
+def summary_cache():
+    """Start every test with an empty cache that never reaches the database."""
+    cache = SummaryCache()
+    with (
+        patch.object(cache, "get", return_value=None),
+        patch.object(cache, "put", AsyncMock()),
+        patch("app.services.paper_service.summary_cache", cache),
+    ):
+        yield cache
+
+
 @pytest.mark.asyncio
-@patch("app.services.paper_service.arxiv.Search")
+@patch("app.services.paper_service.arxiv_resolver.resolve", new_callable=AsyncMock)
 @patch("app.services.paper_service.AIService")
 async def test_summarize_paper(
-    mock_ai_service, mock_arxiv_search, paper_service, user_service, db_session
+    mock_ai_service, mock_resolve, paper_service, user_service, db_session
 ):
     # 1. Setup
     slack_user_id = "U12345"
@@ -61,10 +77,8 @@ async def test_summarize_paper(
         )
     )
 
-    # Mock arxiv search
-    mock_arxiv_result = MagicMock()
-    mock_arxiv_result.summary = original_summary
-    mock_arxiv_search.return_value.results.return_value = iter([mock_arxiv_result])
+    # Mock the arXiv lookup
+    mock_resolve.return_value = {"summary": original_summary}
 
     # Mock AI service
     mock_ai_instance = mock_ai_service.return_value
@@ -84,6 +98,155 @@ async def test_summarize_paper(
     db_session.commit()
     updated_paper = db_session.query(Paper).filter(Paper.id == paper.id).first()
     assert updated_paper.summary == generated_summary
+    assert updated_paper.summary_model == "gemini-1.5-flash"
+
+
+@pytest.mark.asyncio
+@patch("app.services.paper_service.arxiv_resolver.resolve", new_callable=AsyncMock)
+async def test_summarize_paper_reuses_generated_summary(
+    mock_resolve, paper_service, db_session
+):
+    paper = paper_service.create_paper(
+        PaperCreate(
+            title="Already Summarized",
+            url="http://example.com/summarized",
+            summary="Short.",
+            arxiv_id="2301.00009",
+        )
+    )
+    paper.summary_model = "gemini-1.5-flash"
+    db_session.commit()
+
+    assert await paper_service.summarize_paper(paper.id, "U12345") == "Short."
+    mock_resolve.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("app.services.paper_service.arxiv_resolver.resolve", new_callable=AsyncMock)
+async def test_summarize_paper_without_api_key_is_extractive(
+    mock_resolve, paper_service, db_session
+):
+    paper = paper_service.create_paper(
+        PaperCreate(
+            title="No Key",
+            url="http://example.com/no_key",
+            arxiv_id="2301.00010",
+        )
+    )
+    mock_resolve.return_value = {"summary": "First. Second. Third. Fourth."}
+
+    summary = await paper_service.summarize_paper(paper.id, "U_NO_KEY")
+
+    assert summary.count(".") == 3
+    assert paper.summary_model == "extractive"
+
+
+@pytest.mark.asyncio
+@patch("app.services.paper_service.arxiv_resolver.resolve", new_callable=AsyncMock)
+async def test_summarize_paper_reads_extracted_full_text(
+    mock_resolve, paper_service, user_service, db_session
+):
+    user_service.update_api_key("U_FULL", "key")
+    paper = paper_service.create_paper(
+        PaperCreate(title="Full Text", url="http://example.com/full.pdf")
+    )
+    paper.full_text = compress_text("The whole paper.")
+    db_session.commit()
+
+    with patch(
+        "app.services.ai_service.AIService.summarize_text",
+        AsyncMock(return_value="Summary of the whole paper."),
+    ) as mock_summarize:
+        summary = await paper_service.summarize_paper(paper.id, "U_FULL")
+
+    assert summary == "Summary of the whole paper."
+    assert mock_summarize.call_args.args[0] == "The whole paper."
+    mock_resolve.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("app.services.paper_service.arxiv_resolver.resolve", new_callable=AsyncMock)
+async def test_summarize_paper_falls_back_when_gemini_is_down(
+    mock_resolve, paper_service, user_service, db_session
+):
+    user_service.update_api_key("U_DOWN", "key")
+    paper = paper_service.create_paper(
+        PaperCreate(
+            title="Gemini Down",
+            url="http://example.com/down",
+            arxiv_id="2301.00011",
+        )
+    )
+    mock_resolve.return_value = {"summary": "First. Second. Third. Fourth."}
+
+    with patch(
+        "app.services.ai_service.AIService._summarize_once",
+        AsyncMock(side_effect=CircuitOpenError(30)),
+    ):
+        summary = await paper_service.summarize_paper(paper.id, "U_DOWN")
+
+    assert summary == "First. Second. Third."
+    assert paper.summary_model == "extractive"
+
+
+@pytest.mark.asyncio
+@patch("app.services.paper_service.arxiv_resolver.resolve", new_callable=AsyncMock)
+async def test_summarize_paper_reads_stored_abstract_without_arxiv_id(
+    mock_resolve, paper_service, db_session
+):
+    paper = paper_service.create_paper(
+        PaperCreate(
+            title="Imported",
+            url="http://example.com/imported",
+            summary="First. Second. Third. Fourth.",
+        )
+    )
+
+    summary = await paper_service.summarize_paper(paper.id, "U_IMPORTED")
+
+    assert summary == "First. Second. Third."
+    assert paper.summary_model == "extractive"
+    mock_resolve.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_summarize_paper_upgrades_a_preview_from_the_kept_abstract(
+    paper_service, user_service, db_session
+):
+    user_service.update_api_key("U_UPGRADE", "key")
+    paper = paper_service.create_paper(
+        PaperCreate(
+            title="Previewed",
+            url="http://example.com/previewed",
+            summary="The imported abstract.",
+        )
+    )
+    paper_service.save_summary(paper.id, "A preview.", "extractive")
+
+    with patch(
+        "app.services.ai_service.AIService.summarize_text",
+        AsyncMock(return_value="Gemini summary."),
+    ) as mock_summarize:
+        summary = await paper_service.summarize_paper(paper.id, "U_UPGRADE")
+
+    assert summary == "Gemini summary."
+    assert mock_summarize.call_args.args[0] == "The imported abstract."
+    assert paper.abstract == "The imported abstract."
+
+
+@pytest.mark.asyncio
+async def test_summarize_paper_keeps_a_preview_it_cannot_upgrade(
+    paper_service, user_service, db_session
+):
+    user_service.update_api_key("U_LEGACY", "key")
+    paper = paper_service.create_paper(
+        PaperCreate(title="Legacy", url="http://example.com/legacy", summary="Old.")
+    )
+    # Previewed before abstracts were kept
+    paper.summary_model = "extractive"
+    db_session.commit()
+
+    assert await paper_service.summarize_paper(paper.id, "U_LEGACY") == "Old."
 
 
 def test_create_paper(paper_service):
@@ -204,3 +367,163 @@ def test_search_papers(paper_service):
 
     results = paper_service.search_papers("NonExistent")
     assert len(results) == 0
+
+
+def test_get_papers_page_walks_keyset(paper_service):
+    for i, day in enumerate((3, 1, 2, 2)):
+        paper_service.create_paper(
+            PaperCreate(
+                title=f"Paper {day}",
+                url=f"http://example.com/{i}",
+                published_date=datetime(2023, 1, day),
+            )
+        )
+
+    first_page, cursor = paper_service.get_papers_page(limit=2)
+    assert [p.published_date.day for p in first_page] == [1, 2]
+    assert cursor is not None
+
+    second_page, cursor = paper_service.get_papers_page(cursor, limit=2)
+    assert [p.published_date.day for p in second_page] == [2, 3]
+    # Ties on published_date are broken by id, so no row is skipped or repeated
+    assert {p.id for p in first_page}.isdisjoint({p.id for p in second_page})
+
+    last_page, cursor = paper_service.get_papers_page(cursor, limit=2)
+    assert last_page == []
+    assert cursor is None
+
+
+def test_get_papers_page_rejects_invalid_cursor(paper_service):
+    with pytest.raises(ValueError):
+        paper_service.get_papers_page("not-a-cursor")
+
+
+def test_iter_papers_streams_in_order(paper_service, db_session):
+    for day in (2, 1, 3):
+        paper_service.create_paper(
+            PaperCreate(
+                title=f"Paper {day}",
+                url=f"http://example.com/{day}",
+                published_date=datetime(2023, 1, day),
+            )
+        )
+    db_session.expunge_all()
+
+    titles = [paper.title for paper in paper_service.iter_papers(batch_size=2)]
+
+    assert titles == ["Paper 1", "Paper 2", "Paper 3"]
+    # Streamed rows are released from the session as batches complete
+    assert len(db_session.identity_map) <= 2
+
+
+def test_summary_is_deferred_unless_requested(paper_service, db_session):
+    created = paper_service.create_paper(
+        PaperCreate(title="Deferred", url="http://deferred.com", summary="Long text")
+    )
+    db_session.expunge_all()
+
+    lean = paper_service.get_paper(created.id)
+    assert "summary" not in lean.__dict__
+    db_session.expunge_all()
+
+    full = paper_service.get_paper(created.id, with_summary=True)
+    assert full.__dict__["summary"] == "Long text"
+
+
+def test_get_paper_by_url_or_arxiv_id_returns_header(paper_service):
+    paper_service.create_paper(
+        PaperCreate(
+            title="Header Paper",
+            url="http://header.com/paper",
+            summary="Not needed for dedupe",
+            arxiv_id="2301.00003",
+        )
+    )
+
+    header = paper_service.get_paper_by_url_or_arxiv_id(url="http://header.com/paper")
+
+    assert header.title == "Header Paper"
+    assert header.url == "http://header.com/paper"
+    assert "summary" not in header._fields
+
+
+def test_get_paper_by_url_or_arxiv_id_matches_canonical_forms(paper_service):
+    paper = paper_service.create_paper(
+        PaperCreate(
+            title="Versioned",
+            url="http://arxiv.org/pdf/2301.00004v2",
+            arxiv_id="2301.00004v2",
+        )
+    )
+    assert paper.arxiv_id == "2301.00004"
+    assert paper.arxiv_version == 2
+    assert paper.canonical_url == "https://arxiv.org/abs/2301.00004"
+
+    for lookup in (
+        {"url": "https://arxiv.org/abs/2301.00004"},
+        {"url": "https://arxiv.org/pdf/2301.00004v1.pdf"},
+        {"arxiv_id": "2301.00004v1"},
+        {"url": "http://other.com/x", "arxiv_id": "2301.00004"},
+    ):
+        assert paper_service.get_paper_by_url_or_arxiv_id(**lookup).id == paper.id
+    assert paper_service.get_paper_by_url_or_arxiv_id(url="http://other.com/x") is None
+    assert paper_service.get_paper_by_url_or_arxiv_id() is None
+
+
+def test_find_near_duplicate(paper_service):
+    abstract = (
+        "We propose the Transformer, a model architecture based solely on "
+        "attention mechanisms, dispensing with recurrence and convolutions."
+    )
+    paper = paper_service.create_paper(
+        PaperCreate(
+            title="Attention Is All You Need",
+            url="https://arxiv.org/abs/1706.03762",
+            summary=abstract,
+        )
+    )
+    # Rebuilt from the stored signatures, as after a restart
+    near_duplicate_index.clear()
+
+    found = paper_service.find_near_duplicate(
+        "Attention is all you need.", abstract + " Published at NeurIPS."
+    )
+    assert found.id == paper.id
+    assert "minhash" in found._fields
+    assert paper_service.find_near_duplicate("Deep Residual Learning") is None
+    # A shortened abstract is only similar enough for an explicit threshold.
+    shortened = abstract.replace(", dispensing with recurrence and convolutions", "")
+    assert (
+        paper_service.find_near_duplicate("Attention Is All You Need", shortened)
+        is None
+    )
+    assert (
+        paper_service.find_near_duplicate(
+            "Attention Is All You Need", shortened, threshold=0.0
+        ).id
+        == paper.id
+    )
+
+
+def test_find_near_duplicate_ignores_placeholder_papers(paper_service):
+    for url in ("https://example.com/a", "https://example.com/b"):
+        paper_service.create_paper(PaperCreate(title="N/A", url=url, summary="N/A"))
+
+    assert paper_service.find_near_duplicate("N/A", "N/A") is None
+
+
+def test_get_paper_headers_page(paper_service):
+    for day in (1, 2, 3):
+        paper_service.create_paper(
+            PaperCreate(
+                title=f"Paper {day}",
+                url=f"http://example.com/{day}",
+                published_date=datetime(2023, 1, day),
+            )
+        )
+
+    rows, cursor = paper_service.get_paper_headers_page(limit=2)
+    assert [row.title for row in rows] == ["Paper 1", "Paper 2"]
+    rows, cursor = paper_service.get_paper_headers_page(cursor, limit=2)
+    assert [row.title for row in rows] == ["Paper 3"]
+    assert cursor is None
@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.metrics import metrics
+from app.db.models import Base
+from app.db.schemas import PaperCreate
+from app.services.paper_service import PaperService
+from app.services.ranking_service import RankingService
+from app.services.user_subscription_service import UserSubscriptionService
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+PAPERS = [
+    ("Graph Neural Networks for Molecules", "Message passing on molecular graphs."),
+    ("Diffusion Models for Images", "Denoising diffusion generates images."),
+    ("Reinforcement Learning for Robots", "Policies learned from robot rewards."),
+    ("Scalable Graph Neural Networks", "Sampling neighbours of large graphs."),
+]
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def papers(db_session):
+    paper_service = PaperService(db_session)
+    return [
+        paper_service.create_paper(
+            PaperCreate(
+                title=title,
+                url=f"http://example.com/{i}",
+                summary=summary,
+                author_names=["Ada Lovelace"] if i == 2 else [],
+            )
+        )
+        for i, (title, summary) in enumerate(PAPERS)
+    ]
+
+
+def test_users_under_the_limit_keep_every_paper_unscored(db_session, papers):
+    candidates = {"U1": [papers[1], papers[0], papers[1]]}
+    # No subscriptions exist, so scoring would have nothing to go on.
+    assert RankingService(db_session).top_papers(candidates, 5) == {
+        "U1": [papers[1], papers[0]]
+    }
+
+
+def test_top_papers_follow_each_users_subscriptions(db_session, papers):
+    subscriptions = UserSubscriptionService(db_session)
+    subscriptions.subscribe_keyword("U1", "graph neural networks")
+    subscriptions.subscribe_keyword("U2", "diffusion")
+    subscriptions.subscribe_author("U3", "Ada Lovelace")
+    before = metrics.snapshot()["counters"].get("ranking.notifications_skipped", 0)
+
+    ranked = RankingService(db_session).top_papers(
+        {"U1": papers, "U2": papers, "U3": papers[1:]}, 2
+    )
+
+    assert set(ranked["U1"]) == {papers[0], papers[3]}
+    assert ranked["U2"][0] is papers[1]
+    assert ranked["U3"][0] is papers[2]
+    assert all(len(delivered) == 2 for delivered in ranked.values())
+    after = metrics.snapshot()["counters"]["ranking.notifications_skipped"]
+    assert after - before == 5
+
+
+def test_only_a_users_own_candidates_are_delivered(db_session, papers):
+    UserSubscriptionService(db_session).subscribe_keyword("U1", "diffusion")
+
+    ranked = RankingService(db_session).top_papers(
+        {"U1": [papers[0], papers[2], papers[3]], "U2": papers[1:2]}, 2
+    )
+
+    assert papers[1] not in ranked["U1"]
+    assert len(ranked["U1"]) == 2
+    assert ranked["U2"] == [papers[1]]
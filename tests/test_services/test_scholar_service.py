@@ -1,6 +1,7 @@
+import arxiv
 import pytest
 from unittest.mock import MagicMock, patch
-from app.services.scholar_service import ScholarService
+from app.services.scholar_service import ScholarService, result_to_paper_data
 
 
 @pytest.fixture
@@ -21,6 +22,7 @@ def test_search_new_papers_success(scholar_service):
     mock_result.authors = [mock_author_one, mock_author_two]
     mock_result.published = "2023-01-01"
     mock_result.entry_id = "http://arxiv.org/abs/2301.00001v1"
+    mock_result.get_short_id = lambda: arxiv.Result.get_short_id(mock_result)
 
     with patch(
         "arxiv.Client.results", return_value=[mock_result]
@@ -37,6 +39,17 @@ def test_search_new_papers_success(scholar_service):
         mock_arxiv_results.assert_called_once()
 
 
+def test_result_to_paper_data_keeps_old_style_archive():
+    result = arxiv.Result(
+        entry_id="http://arxiv.org/abs/hep-th/9901001v1",
+        title="Old Style",
+        authors=[arxiv.Result.Author("Author One")],
+        summary="An abstract.",
+    )
+
+    assert result_to_paper_data(result)["arxiv_id"] == "hep-th/9901001v1"
+
+
 def test_search_new_papers_exception(scholar_service):
     with patch(
         "arxiv.Client.results", side_effect=Exception("ArXiv error")
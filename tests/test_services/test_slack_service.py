@@ -0,0 +1,121 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from slack_sdk.errors import SlackApiError
+from app.services import slack_service
+from app.services.slack_service import (
+    SlackService,
+    close_slack_client,
+    get_slack_client,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    slack_service._dm_channels.clear()
+    slack_service._user_info.clear()
+    yield
+    slack_service._dm_channels.clear()
+    slack_service._user_info.clear()
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.conversations_open = AsyncMock(return_value={"channel": {"id": "D1"}})
+    client.users_info = AsyncMock(return_value={"user": {"id": "U1"}})
+    client.chat_postMessage = AsyncMock()
+    return client
+
+
+async def _notify(service, user_id="U1"):
+    await service.send_new_paper_notification(
+        user_id=user_id,
+        paper_title="Paper",
+        paper_url="http://example.com",
+        summary="Summary",
+        authors="Ada",
+        keywords="graphs",
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_slack_client_is_shared_and_pooled():
+    try:
+        first = get_slack_client()
+        assert get_slack_client() is first
+        assert SlackService().client is first
+        assert (
+            first.session.connector.limit == slack_service.settings.SLACK_HTTP_POOL_SIZE
+        )
+    finally:
+        await close_slack_client()
+    assert first.session.closed
+
+
+@pytest.mark.asyncio
+async def test_fan_out_opens_each_dm_once(client):
+    for _ in range(3):
+        await _notify(SlackService(client))
+
+    client.conversations_open.assert_awaited_once_with(users="U1")
+    # Successful posts need no users.info lookup.
+    client.users_info.assert_not_called()
+    assert client.chat_postMessage.await_count == 3
+    assert client.chat_postMessage.call_args.kwargs["channel"] == "D1"
+
+
+@pytest.mark.asyncio
+async def test_user_info_expires_after_ttl(client):
+    service = SlackService(client)
+    with patch("app.services.slack_service.time.monotonic", return_value=0.0):
+        await service.get_user_info("U1")
+        await service.get_user_info("U1")
+    with patch("app.services.slack_service.time.monotonic", return_value=3601.0):
+        await service.get_user_info("U1")
+
+    assert client.users_info.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_deactivated_user_is_skipped_after_a_failed_post(client):
+    client.chat_postMessage.side_effect = SlackApiError(
+        "failed", {"error": "user_disabled"}
+    )
+    client.users_info.return_value = {"user": {"id": "U1", "deleted": True}}
+
+    for _ in range(3):
+        await _notify(SlackService(client))
+
+    client.chat_postMessage.assert_awaited_once()
+    client.users_info.assert_awaited_once_with(user="U1")
+
+
+@pytest.mark.asyncio
+async def test_failed_lookups_are_cached(client):
+    missing_scope = SlackApiError("failed", {"error": "missing_scope"})
+    client.conversations_open.side_effect = missing_scope
+    client.users_info.side_effect = missing_scope
+    client.chat_postMessage.side_effect = SlackApiError(
+        "failed", {"error": "channel_not_found"}
+    )
+
+    for _ in range(3):
+        await _notify(SlackService(client))
+
+    assert client.chat_postMessage.call_args.kwargs["channel"] == "U1"
+    client.conversations_open.assert_awaited_once()
+    client.users_info.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_dm_open_is_retried_after_the_negative_ttl(client):
+    client.conversations_open.side_effect = [
+        SlackApiError("failed", {"error": "ratelimited"}),
+        {"channel": {"id": "D1"}},
+    ]
+    service = SlackService(client)
+    with patch("app.services.slack_service.time.monotonic", return_value=0.0):
+        assert await service.open_dm("U1") == "U1"
+        assert await service.open_dm("U1") == "U1"
+    with patch("app.services.slack_service.time.monotonic", return_value=601.0):
+        assert await service.open_dm("U1") == "D1"
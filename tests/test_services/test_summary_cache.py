@@ -0,0 +1,157 @@
+import asyncio
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timedelta, UTC
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db.models import Base, SummaryCacheEntry
+from app.services.summary_cache import SummaryCache, summary_cache_key
+
+# The cache writes on the dedicated writer thread, so the in-memory database
+# must be shared across threads.
+engine = create_engine(
+    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@contextmanager
+def _session_scope(read_only=False):
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def db_tables():
+    Base.metadata.create_all(bind=engine)
+    with patch("app.services.summary_cache.session_scope", _session_scope):
+        yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_summary_cache_key_depends_on_every_input():
+    key = summary_cache_key("text", "model-a", "short")
+    assert key == summary_cache_key("text", "model-a", "short")
+    assert key != summary_cache_key("text", "model-b", "short")
+    assert key != summary_cache_key("text", "model-a", "long")
+    assert key != summary_cache_key("other", "model-a", "short")
+
+
+@pytest.mark.asyncio
+async def test_get_or_generate_persists_across_instances():
+    generate = AsyncMock(return_value="Summary.")
+
+    first = await SummaryCache().get_or_generate("text", generate, model="m")
+    # A fresh instance has an empty memory tier and must read the table.
+    second = await SummaryCache().get_or_generate("text", generate, model="m")
+
+    assert first == second == "Summary."
+    generate.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_generation():
+    started = asyncio.Event()
+    release = asyncio.Event()
+    calls = 0
+
+    async def generate():
+        nonlocal calls
+        calls += 1
+        started.set()
+        await release.wait()
+        return "Shared."
+
+    cache = SummaryCache()
+    tasks = [
+        asyncio.create_task(cache.get_or_generate("text", generate, model="m"))
+        for _ in range(5)
+    ]
+    await started.wait()
+    release.set()
+
+    assert await asyncio.gather(*tasks) == ["Shared."] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_generation_error_reaches_every_waiter_and_is_not_cached():
+    generate = AsyncMock(side_effect=RuntimeError("Gemini error"))
+    cache = SummaryCache()
+
+    results = await asyncio.gather(
+        cache.get_or_generate("text", generate, model="m"),
+        cache.get_or_generate("text", generate, model="m"),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await cache.get(summary_cache_key("text", "m")) is None
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_regenerated():
+    cache = SummaryCache(ttl_seconds=60)
+    key = summary_cache_key("text", "m")
+    with _session_scope() as db:
+        db.add(
+            SummaryCacheEntry(
+                key=key,
+                model="m",
+                summary="Stale.",
+                created_at=datetime.now(UTC).replace(tzinfo=None)
+                - timedelta(minutes=5),
+            )
+        )
+        db.commit()
+
+    summary = await cache.get_or_generate(
+        "text", AsyncMock(return_value="Fresh."), model="m"
+    )
+
+    assert summary == "Fresh."
+
+
+@pytest.mark.asyncio
+async def test_table_is_bounded_to_max_entries():
+    cache = SummaryCache(max_entries=10)
+    for i in range(11):
+        await cache.get_or_generate(
+            str(i), AsyncMock(return_value=f"Summary {i}."), model="m"
+        )
+
+    # The overflow prunes the table to PRUNE_TO of its bound, oldest first.
+    with _session_scope() as db:
+        assert db.query(SummaryCacheEntry).count() == 9
+        assert db.get(SummaryCacheEntry, summary_cache_key("0", "m")) is None
+        assert db.get(SummaryCacheEntry, summary_cache_key("10", "m")) is not None
+
+
+@pytest.mark.asyncio
+async def test_puts_count_rows_once():
+    cache = SummaryCache(max_entries=10)
+    with patch("app.services.summary_cache.func.count", wraps=func.count) as mock_count:
+        for text in ("a", "b", "c"):
+            await cache.put(summary_cache_key(text, "m"), "m", text.upper())
+
+    assert mock_count.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_database_reads_run_off_the_event_loop():
+    cache = SummaryCache()
+    key = summary_cache_key("text", "m")
+    await cache.put(key, "m", "Stored.")
+    cache.clear_memory()
+
+    with patch(
+        "app.services.summary_cache.asyncio.to_thread", wraps=asyncio.to_thread
+    ) as mock_to_thread:
+        assert await cache.get(key) == "Stored."
+
+    mock_to_thread.assert_called_once_with(cache._load, key)
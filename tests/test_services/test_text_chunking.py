@@ -0,0 +1,30 @@
+from app.services.text_chunking import estimate_tokens, split_text
+
+
+def test_short_text_is_one_chunk():
+    assert split_text("  A short note.  ", max_tokens=100) == ["A short note."]
+
+
+def test_split_prefers_section_boundaries():
+    intro = "1 Introduction\n" + "Intro sentence. " * 20
+    method = "2 Method\n" + "Method sentence. " * 20
+    chunks = split_text(f"{intro}\n{method}", max_tokens=120)
+
+    assert len(chunks) == 2
+    assert chunks[0].startswith("1 Introduction")
+    assert chunks[1].startswith("2 Method")
+
+
+def test_split_falls_back_to_paragraphs_and_sentences():
+    paragraph = "Sentence number one is here. " * 30
+    text = "\n\n".join([paragraph] * 3)
+    chunks = split_text(text, max_tokens=100)
+
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    assert all(chunk.endswith(".") for chunk in chunks)
+
+
+def test_unbroken_text_is_cut_hard():
+    chunks = split_text("x" * 1000, max_tokens=50)
+    assert all(estimate_tokens(chunk) <= 51 for chunk in chunks)
+    assert "".join(chunks) == "x" * 1000
@@ -42,6 +42,26 @@ def test_get_or_create_user(db_session):
     assert user2.id == user1.id
 
 
+def test_get_or_create_user_leaves_no_write_lock(tmp_path):
+    url = f"sqlite:///{tmp_path / 'users.db'}"
+    file_engine = create_engine(url)
+    Base.metadata.create_all(bind=file_engine)
+    db = sessionmaker(bind=file_engine)()
+    other = create_engine(url, connect_args={"timeout": 0})
+    try:
+        user_service = UserService(db)
+        user_service.get_or_create_user("U_NEW")
+        user_service.get_or_create_user("U_NEW")
+
+        # Another writer is not blocked while this session stays open.
+        with other.begin() as conn:
+            conn.execute(User.__table__.insert().values(slack_user_id="U_OTHER"))
+    finally:
+        db.close()
+        other.dispose()
+        file_engine.dispose()
+
+
 def test_update_api_key(db_session):
     user_service = UserService(db_session)
     slack_user_id = "U12345"
@@ -1,10 +1,18 @@
 import pytest
 from unittest.mock import MagicMock
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.db.database import Base
 from app.services.user_subscription_service import UserSubscriptionService
 from app.db.models import User, Keyword, UserKeyword, Author, UserAuthor
 from app.services.user_service import UserService
 
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
 
 @pytest.fixture
 def mock_db_session():
@@ -34,58 +42,6 @@ def user_subscription_service(mock_db_session, mock_user_service):
     return service
 
 
-def test_subscribe_keyword_new_keyword(user_subscription_service, mock_db_session):
-    # Mock for Keyword.first() and UserKeyword.first()
-    mock_db_session.query.return_value.filter.return_value.first.side_effect = [
-        None,
-        None,
-    ]
-
-    result = user_subscription_service.subscribe_keyword("U123", "new_keyword")
-
-    assert result is not None
-    assert isinstance(result, UserKeyword)
-    mock_db_session.add.assert_called()
-    mock_db_session.commit.assert_called_once()
-    mock_db_session.refresh.assert_called_once()
-
-
-def test_subscribe_keyword_existing_keyword(user_subscription_service, mock_db_session):
-    existing_keyword = Keyword(id=1, name="existing_keyword")
-    # Mock for Keyword.first() and UserKeyword.first()
-    mock_db_session.query.return_value.filter.return_value.first.side_effect = [
-        existing_keyword,
-        None,
-    ]
-
-    result = user_subscription_service.subscribe_keyword("U123", "existing_keyword")
-
-    assert result is not None
-    assert isinstance(result, UserKeyword)
-    mock_db_session.add.assert_called()
-    mock_db_session.commit.assert_called_once()
-    mock_db_session.refresh.assert_called_once()
-
-
-def test_subscribe_keyword_already_subscribed(
-    user_subscription_service, mock_db_session
-):
-    existing_keyword = Keyword(id=1, name="existing_keyword")
-    existing_user_keyword = UserKeyword(user_id=1, keyword_id=1)
-    # Mock for Keyword.first() and UserKeyword.first()
-    mock_db_session.query.return_value.filter.return_value.first.side_effect = [
-        existing_keyword,
-        existing_user_keyword,
-    ]
-
-    result = user_subscription_service.subscribe_keyword("U123", "existing_keyword")
-
-    assert result is None
-    mock_db_session.add.assert_not_called()
-    mock_db_session.commit.assert_not_called()
-    mock_db_session.refresh.assert_not_called()
-
-
 def test_unsubscribe_keyword_success(user_subscription_service, mock_db_session):
     existing_keyword = Keyword(id=1, name="existing_keyword")
     existing_user_keyword = UserKeyword(user_id=1, keyword_id=1)
@@ -142,58 +98,6 @@ def test_get_user_keywords(user_subscription_service, mock_db_session):
     assert result[0] == mock_user_keyword
 
 
-def test_subscribe_author_new_author(user_subscription_service, mock_db_session):
-    # Mock for Author.first() and UserAuthor.first()
-    mock_db_session.query.return_value.filter.return_value.first.side_effect = [
-        None,
-        None,
-    ]
-
-    result = user_subscription_service.subscribe_author("U123", "new_author")
-
-    assert result is not None
-    assert isinstance(result, UserAuthor)
-    mock_db_session.add.assert_called()
-    mock_db_session.commit.assert_called_once()
-    mock_db_session.refresh.assert_called_once()
-
-
-def test_subscribe_author_existing_author(user_subscription_service, mock_db_session):
-    existing_author = Author(id=1, name="existing_author")
-    # Mock for Author.first() and UserAuthor.first()
-    mock_db_session.query.return_value.filter.return_value.first.side_effect = [
-        existing_author,
-        None,
-    ]
-
-    result = user_subscription_service.subscribe_author("U123", "existing_author")
-
-    assert result is not None
-    assert isinstance(result, UserAuthor)
-    mock_db_session.add.assert_called()
-    mock_db_session.commit.assert_called_once()
-    mock_db_session.refresh.assert_called_once()
-
-
-def test_subscribe_author_already_subscribed(
-    user_subscription_service, mock_db_session
-):
-    existing_author = Author(id=1, name="existing_author")
-    existing_user_author = UserAuthor(user_id=1, author_id=1)
-    # Mock for Author.first() and UserAuthor.first()
-    mock_db_session.query.return_value.filter.return_value.first.side_effect = [
-        existing_author,
-        existing_user_author,
-    ]
-
-    result = user_subscription_service.subscribe_author("U123", "existing_author")
-
-    assert result is None
-    mock_db_session.add.assert_not_called()
-    mock_db_session.commit.assert_not_called()
-    mock_db_session.refresh.assert_not_called()
-
-
 def test_unsubscribe_author_success(user_subscription_service, mock_db_session):
     existing_author = Author(id=1, name="existing_author")
     existing_user_author = UserAuthor(user_id=1, author_id=1)
@@ -246,3 +150,75 @@ def test_get_user_authors(user_subscription_service, mock_db_session):
 
     assert len(result) == 1
     assert result[0] == mock_user_author
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def test_subscribe_keyword_new_keyword(db_session):
+    service = UserSubscriptionService(db_session)
+
+    result = service.subscribe_keyword("U123", "new_keyword")
+
+    assert isinstance(result, UserKeyword)
+    assert result.keyword.name == "new_keyword"
+    assert result.user.slack_user_id == "U123"
+
+
+def test_subscribe_keyword_existing_keyword(db_session):
+    db_session.add(Keyword(name="existing_keyword"))
+    db_session.commit()
+    service = UserSubscriptionService(db_session)
+
+    result = service.subscribe_keyword("U123", "existing_keyword")
+
+    assert isinstance(result, UserKeyword)
+    assert db_session.query(Keyword).count() == 1
+
+
+def test_subscribe_keyword_already_subscribed(db_session):
+    service = UserSubscriptionService(db_session)
+    service.subscribe_keyword("U123", "existing_keyword")
+
+    result = service.subscribe_keyword("U123", "existing_keyword")
+
+    assert result is None
+    assert db_session.query(UserKeyword).count() == 1
+
+
+def test_subscribe_author_new_author(db_session):
+    service = UserSubscriptionService(db_session)
+
+    result = service.subscribe_author("U123", "new_author")
+
+    assert isinstance(result, UserAuthor)
+    assert result.author.name == "new_author"
+
+
+def test_subscribe_author_existing_author(db_session):
+    db_session.add(Author(name="existing_author"))
+    db_session.commit()
+    service = UserSubscriptionService(db_session)
+
+    result = service.subscribe_author("U123", "existing_author")
+
+    assert isinstance(result, UserAuthor)
+    assert db_session.query(Author).count() == 1
+
+
+def test_subscribe_author_already_subscribed(db_session):
+    service = UserSubscriptionService(db_session)
+    service.subscribe_author("U123", "existing_author")
+
+    result = service.subscribe_author("U123", "existing_author")
+
+    assert result is None
+    assert db_session.query(UserAuthor).count() == 1
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.models import Base
+from app.db.schemas import PaperCreate
+from app.services.paper_service import PaperService
+from app.services.similar_paper_service import SimilarPaperService
+from app.services.vector_index import VectorIndex, embed_text
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+PAPERS = [
+    ("Attention Is All You Need", "The Transformer relies on self attention."),
+    ("Deep Residual Learning", "Residual networks ease training of deep models."),
+    ("Transformers for Language", "Self attention models scale to language tasks."),
+]
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return VectorIndex(str(tmp_path), dim=64)
+
+
+def _vectors(index):
+    return np.stack([embed_text(t, a, index.dim) for t, a in PAPERS])
+
+
+def test_embed_text_is_unit_length_and_topical():
+    a, b, c = (embed_text(t, a, 128) for t, a in PAPERS)
+    assert np.linalg.norm(a) == pytest.approx(1.0)
+    assert a @ c > a @ b
+    assert not np.any(embed_text("", None, 128))
+
+
+def test_search_returns_top_k_by_cosine(index):
+    index.append([1, 2, 3], _vectors(index))
+
+    hits = index.search(embed_text(*PAPERS[0], index.dim), k=2, exclude=1)
+
+    assert hits[0][0] == 3
+    # Unrelated papers are left out rather than padded in
+    assert all(score > 0 for _, score in hits)
+    assert [paper_id for paper_id, _ in index.search(_vectors(index)[1], k=3)][0] == 2
+
+
+def test_index_reopens_without_rebuild(index, tmp_path):
+    index.append([1, 2], _vectors(index)[:2])
+    index.append([3], _vectors(index)[2:])
+
+    reopened = VectorIndex(str(tmp_path), dim=64)
+    assert len(reopened) == 3
+    assert reopened.max_id == 3
+    assert np.allclose(reopened.vector_for(2), _vectors(index)[1])
+    assert reopened.vector_for(4) is None
+
+
+def test_interrupted_append_is_discarded(index, tmp_path):
+    index.append([1, 2], _vectors(index)[:2])
+    # A vector row written without its id, as if the process died mid-append
+    with open(tmp_path / "vectors.f32", "ab") as f:
+        f.write(_vectors(index)[2].tobytes())
+
+    reopened = VectorIndex(str(tmp_path), dim=64)
+    assert len(reopened) == 2
+    reopened.append([3], _vectors(index)[2:])
+    assert np.allclose(reopened.vector_for(3), _vectors(index)[2])
+
+
+def test_similar_paper_service_indexes_new_papers(db_session, index):
+    paper_service = PaperService(db_session)
+    service = SimilarPaperService(db_session, index)
+    ids = [
+        paper_service.create_paper(
+            PaperCreate(title=title, url=f"http://example.com/{i}", summary=abstract)
+        ).id
+        for i, (title, abstract) in enumerate(PAPERS)
+    ]
+
+    results = service.similar_to_paper(ids[0], limit=1)
+    assert [(row.title, round(score, 2) > 0) for row, score in results] == [
+        ("Transformers for Language", True)
+    ]
+    assert service.sync() == 0
+
+    new = paper_service.create_paper(
+        PaperCreate(
+            title="Attention in Vision",
+            url="http://example.com/vision",
+            summary="Self attention for images.",
+        )
+    )
+    assert service.similar_to_text("self attention")[0][0].id in {new.id, ids[2]}
+    assert len(index) == 4
+    assert service.similar_to_paper(999) is None